@@ -0,0 +1,5 @@
+"""Бенчмарки системы интервью на офлайн ScriptedChatModel (без сети)."""
+import os
+
+# src.config читает LLM_BACKEND один раз при импорте, поэтому бэкенд выставляем до любых импортов src
+os.environ.setdefault("LLM_BACKEND", "fake")
@@ -0,0 +1,56 @@
+"""Mentor + VibeMaster: два параллельных запроса против одного совмещённого.
+
+Сравнивает латентность узла user_input, число запросов к LLM на ход и
+токены промпта/ответа на ход. С --no-fast-path VibeMaster всегда идёт в LLM,
+как до локального классификатора.
+
+    python -m benchmarks.bench_analysis --sessions 20 --latency 0.2 --token-latency 0.005
+"""
+import argparse
+import asyncio
+
+from benchmarks.common import make_fake_llm, make_session, print_table, summarize, timed_interview
+from src.graph.graph import build_interview_graph, get_agents
+
+ANALYSIS_KINDS = ("mentor", "vibe", "combined")
+
+
+async def run_mode(args: argparse.Namespace, combined: bool) -> dict:
+    llm = make_fake_llm(latency=args.latency, token_latency=args.token_latency)
+    app = build_interview_graph().compile()
+    sessions = [make_session(f"bench-{i}", combined=combined) for i in range(args.sessions)]
+    runs = await asyncio.gather(*[timed_interview(app, session) for session in sessions])
+
+    user_input = [value for durations in runs for value in durations["user_input"]]
+    turns = max(1, len(user_input))
+    analysis_stats = [llm.stats[kind] for kind in ANALYSIS_KINDS if kind in llm.stats]
+    return {
+        **{f"user_input_{key}": value for key, value in summarize(user_input).items() if key != "count"},
+        "requests_per_turn": sum(stats["calls"] for stats in analysis_stats) / turns,
+        # та же оценка ~4 символа на токен, что в ScriptedChatModel
+        "prompt_tokens_per_turn": sum(stats["prompt_chars"] for stats in analysis_stats) / 4 / turns,
+        "output_tokens_per_turn": sum(stats["output_chars"] for stats in analysis_stats) / 4 / turns,
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    get_agents().vibe_dealer.fast_path = not args.no_fast_path
+    rows = {
+        "parallel": await run_mode(args, combined=False),
+        "combined": await run_mode(args, combined=True),
+    }
+    print_table("Анализ ответа кандидата", rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="задержка до первого токена, сек")
+    parser.add_argument("--token-latency", type=float, default=0.005, help="задержка на токен ответа, сек")
+    parser.add_argument("--no-fast-path", action="store_true", help="отключить локальный классификатор VibeMaster")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
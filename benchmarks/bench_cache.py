@@ -0,0 +1,93 @@
+"""Кэш разбора Mentor: вызовы LLM и латентность хода на холодном и прогретом кэше.
+
+Прогоняет одинаковые интервью (фиксированные вопросы Interviewer'а и ответы
+кандидата) без кэша и дважды поверх одного файла кэша: в первом проходе кэш
+пустой и наполняется по ходу, во втором уже прогрет. Затем проверяет,
+что при маленьком max_entries размер кэша не выходит за предел.
+
+    python -m benchmarks.bench_cache --sessions 10 --latency 0.02
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.common import make_fake_llm, make_session, print_table, summarize, timed_interview
+from src.cache import CacheStats, PersistentCache, make_key
+from src.graph.graph import build_interview_graph, get_agents
+
+QUESTIONS = [
+    "Что такое GIL и как он влияет на многопоточность?",
+    "Чем генератор отличается от списка?",
+    "Как работает asyncio?",
+    "Что такое декоратор?",
+    "Как устроен event loop?",
+    "Чем список отличается от кортежа?",
+    "Что такое контекстный менеджер?",
+    "Как работает сборщик мусора?",
+    "Как устроен dict?",
+    "Что такое метакласс?",
+]
+
+
+async def run_pass(app, llm, sessions: int, name: str) -> dict:
+    mentor = get_agents().mentor
+    llm.reset_stats()
+    cache_stats = mentor.cache.stats if mentor.cache is not None else CacheStats()
+    stats_before = dict(vars(cache_stats))
+    user_input = []
+    started = time.perf_counter()
+    # по одной сессии: вопросы сценария идут по кругу и совпадают от сессии к сессии
+    for i in range(sessions):
+        durations = await timed_interview(app, make_session(f"{name}-{i}"))
+        user_input.extend(durations["user_input"])
+    stats = {key: value - stats_before[key] for key, value in vars(cache_stats).items()}
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        "wall_s": time.perf_counter() - started,
+        "mentor_calls": llm.stats.get("mentor", {}).get("calls", 0) / sessions,
+        "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+        "user_input_p50_ms": summarize(user_input)["p50_ms"],
+    }
+
+
+def check_eviction(path: str, max_entries: int) -> dict:
+    cache = PersistentCache(path, "eviction", max_entries=max_entries)
+    for i in range(max_entries * 3):
+        cache.set(make_key("answer", i), {"i": i})
+    started = time.perf_counter()
+    for i in range(max_entries * 3):
+        cache.get(make_key("answer", i))
+    lookup_us = (time.perf_counter() - started) / (max_entries * 3) * 1e6
+    return {"max_entries": max_entries, "size": len(cache), "evictions": cache.stats.evictions, "lookup_us": lookup_us}
+
+
+async def run(args: argparse.Namespace) -> None:
+    mentor = get_agents().mentor
+    llm = make_fake_llm(latency=args.latency)
+    llm.script = {"interviewer": [{"thinking": "следующий вопрос", "response": q} for q in QUESTIONS]}
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_cache_"), "cache.sqlite")
+    app = build_interview_graph().compile()
+
+    mentor.cache = None
+    rows = {"no_cache": await run_pass(app, llm, args.sessions, "plain")}
+    mentor.cache = PersistentCache(path, "mentor")
+    rows["cold"] = await run_pass(app, llm, args.sessions, "cold")
+    rows["warm"] = await run_pass(app, llm, args.sessions, "warm")
+    print_table(f"Кэш разбора Mentor ({args.sessions} интервью на проход)", rows)
+    print(f"\nЗаписей в кэше: {len(mentor.cache)}, статистика: {mentor.cache.stats.as_dict()}")
+    print(f"Вытеснение: {check_eviction(path, args.max_entries)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.02, help="задержка LLM на вызов, сек")
+    parser.add_argument("--max-entries", type=int, default=500, help="размер кэша для проверки вытеснения")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
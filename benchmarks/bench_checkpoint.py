@@ -0,0 +1,113 @@
+"""Запись чекпоинтов SQLite: стоимость на ход и возобновление прерванного интервью.
+
+Прогоняет одни и те же интервью без чекпоинтера и с SqliteCheckpointSaver,
+показывает время записи одного чекпоинта (в потоке SQLite), байты на ход,
+долю каналов, записанных ссылкой на прошлую версию, число каналов в чекпоинте
+и разницу wall time.
+Затем обрывает интервью на середине, продолжает его из чекпоинта и
+сравнивает число вызовов LLM с непрерывным прогоном.
+
+    python -m benchmarks.bench_checkpoint --sessions 20 --latency 0.01
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.common import DEFAULT_ANSWERS, make_fake_llm, make_session, make_state, print_table, summarize
+from src.checkpoint import SqliteCheckpointSaver
+from src.graph.graph import build_interview_graph
+from src.session import make_config
+
+
+class TimedSaver(SqliteCheckpointSaver):
+    """Запоминает длительность каждой записи чекпоинта."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.put_seconds: list[float] = []
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        started = time.perf_counter()
+        try:
+            return super().put(config, checkpoint, metadata, new_versions)
+        finally:
+            self.put_seconds.append(time.perf_counter() - started)
+
+
+async def run_interviews(app, sessions: int, logs_dir: str) -> tuple[float, int]:
+    batch = [make_session(f"ckpt-{i}", logs_dir=logs_dir) for i in range(sessions)]
+    started = time.perf_counter()
+    states = await asyncio.gather(*[app.ainvoke(make_state(), config=make_config(s)) for s in batch])
+    return time.perf_counter() - started, sum(state["questions_asked"] for state in states)
+
+
+async def run_resume(saver: SqliteCheckpointSaver, llm, logs_dir: str, cut: int) -> dict:
+    app = build_interview_graph().compile(checkpointer=saver)
+
+    llm.reset_stats()
+    await app.ainvoke(make_state(), config=make_config(make_session("full", logs_dir=logs_dir)))
+    uninterrupted_calls = llm.total_calls()
+
+    llm.reset_stats()
+    session = make_session("resume", answers=DEFAULT_ANSWERS[:cut], logs_dir=logs_dir)
+    session.transport.feed(None)  # кандидат отключился после cut ответов
+    try:
+        await app.ainvoke(make_state(), config=make_config(session))
+    except EOFError:
+        pass
+    resumed = make_session("resume", answers=DEFAULT_ANSWERS[cut:], logs_dir=logs_dir)
+    snapshot = await app.aget_state(make_config(resumed))
+    resumed.memory.restore(snapshot.values)
+    final_state = await app.ainvoke(None, config=make_config(resumed))
+    return {
+        "resumed_from": " -> ".join(snapshot.next),
+        "questions_asked": final_state["questions_asked"],
+        "llm_calls_uninterrupted": uninterrupted_calls,
+        "llm_calls_with_resume": llm.total_calls(),
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    llm = make_fake_llm(latency=args.latency)
+    work_dir = tempfile.mkdtemp(prefix="bench_checkpoint_")
+    logs_dir = os.path.join(work_dir, "logs")
+
+    plain_seconds, _ = await run_interviews(build_interview_graph().compile(), args.sessions, logs_dir)
+
+    saver = TimedSaver(os.path.join(work_dir, "checkpoints.sqlite"))
+    app = build_interview_graph().compile(checkpointer=saver)
+    checkpoint_seconds, turns = await run_interviews(app, args.sessions, logs_dir)
+
+    stats = saver.stats
+    print(f"Сессий: {args.sessions}, ходов: {turns}, wall без чекпоинтов: {plain_seconds:.2f}s, "
+          f"с чекпоинтами: {checkpoint_seconds:.2f}s")
+    print_table("Запись чекпоинта (поток SQLite)", {"put": summarize(saver.put_seconds)})
+    print_table("Объём записи", {
+        "checkpoints": {
+            "kb_per_turn": stats.bytes / 1024 / max(1, turns),
+            "puts_per_turn": stats.puts / max(1, turns),
+            "reused_share": stats.channels_reused / max(1, stats.channels_written + stats.channels_reused),
+            "channels_per_put": (stats.channels_written + stats.channels_reused) / max(1, stats.puts),
+            "writes_per_turn": stats.writes / max(1, turns),
+        }
+    })
+    print(f"\nФайл: {os.path.getsize(saver.path) / 1024:.0f} KB")
+
+    resume = await run_resume(saver, llm, logs_dir, cut=args.cut)
+    print(f"\nВозобновление после {args.cut} ответов: {resume}")
+    saver.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.01, help="задержка LLM на вызов, сек")
+    parser.add_argument("--cut", type=int, default=4, help="после скольких ответов оборвать интервью")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Время до первого вопроса: проверка роли и приветствие для частых ролей.
+
+Прогоняет начало интервью (кандидат отключается после приветствия) и меряет узел start:
+роль, которую решает LLM, роль из allowlist без кэша и с кэшем приветствий
+(холодный и прогретый проход) и роль из denylist.
+
+    python -m benchmarks.bench_greeting --sessions 20 --latency 0.3
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+
+from benchmarks.common import make_fake_llm, make_session, make_state, print_table, summarize
+from src.cache import PersistentCache
+from src.graph.graph import build_interview_graph, get_agents
+from src.session import make_config
+from src.transport import QueueTransport
+
+
+async def run_pass(app, llm, sessions: int, name: str, position: str) -> dict:
+    llm.reset_stats()
+    start = []
+    for i in range(sessions):
+        state = make_state(f"Кандидат {i}")
+        state["position"] = position
+        session = make_session(f"{name}-{i}")
+        session.transport = QueueTransport()
+        session.transport.feed(None)  # кандидат отключается сразу после приветствия
+        try:
+            await app.ainvoke(state, config=make_config(session))
+        except EOFError:
+            pass
+        start.append(session.metrics.nodes["start"][0])
+    return {
+        "greeting_calls": llm.stats.get("greeting", {}).get("calls", 0) / sessions,
+        **{key: value for key, value in summarize(start).items() if key != "count"},
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    interviewer = get_agents().interviewer
+    llm = make_fake_llm(latency=args.latency)
+    app = build_interview_graph().compile()
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_greeting_"), "cache.sqlite")
+
+    interviewer.greeting_cache = None
+    rows = {
+        "llm_role": await run_pass(app, llm, args.sessions, "llm", "React Ninja"),
+        "allowlist": await run_pass(app, llm, args.sessions, "allow", "Python Developer"),
+    }
+    interviewer.greeting_cache = PersistentCache(path, "greeting")
+    rows["cache_cold"] = await run_pass(app, llm, args.sessions, "cold", "Python Developer")
+    rows["cache_warm"] = await run_pass(app, llm, args.sessions, "warm", "Python Developer")
+    rows["denylist"] = await run_pass(app, llm, args.sessions, "deny", "Бухгалтер")
+    print_table(f"Узел start ({args.sessions} интервью на проход, LLM {args.latency * 1000:.0f} мс)", rows)
+    print(f"\nКэш приветствий: {interviewer.greeting_cache.stats.as_dict()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.3, help="задержка LLM на вызов, сек")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Локальный классификатор намерения: время на сообщение, доля эскалаций в LLM и точность.
+
+Размеченные примеры взяты из промпта VibeMaster и ответов бенчмарка интервью.
+
+    python -m benchmarks.bench_intent --threshold 0.85
+"""
+import argparse
+import time
+
+from benchmarks.common import DEFAULT_ANSWERS
+from src.agents.intent import FastPathStats, classify_intent
+from src.config import VIBE_FAST_PATH_THRESHOLD
+
+# (сообщение, хочет ли закончить); None — спорный случай, его должен решать LLM
+LABELED = [
+    ("Знаете, я устал, давайте закончим на сегодня", True),
+    ("Не знаю ответа на этот вопрос, но могу рассказать про другой подход", False),
+    ("Ой, это сложно... Дайте подумать. Попробую ответить", False),
+    ("Я не готов к такому интервью, давайте перенесём", True),
+    ("а какие у вас технологии?", False),
+    ("не расслышал, можете повторить?", False),
+    ("что вы имеете в виду?", False),
+    ("Это не знаю, с этим не работал", False),
+    ("если ты не задашь вопрос проще, то я ухожу", None),
+    ("Хочу закончить, мне нужно идти", True),
+    ("Спасибо, на этом всё", None),
+    # прощания без явного "хочу закончить": локально их не отпускаем как продолжение
+    ("Давай закончим", True),
+    ("До свидания", True),
+    ("мне пора", True),
+    ("I'm done, bye", True),
+    ("Извините, мне надо идти", True),
+    ("Я сдаюсь, всего доброго", True),
+] + [(answer, False) for answer in DEFAULT_ANSWERS if "на этом всё" not in answer]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threshold", type=float, default=VIBE_FAST_PATH_THRESHOLD)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        for message, _ in LABELED:
+            classify_intent(message)
+    per_message = (time.perf_counter() - started) / (args.iterations * len(LABELED))
+
+    stats = FastPathStats()
+    wrong = []
+    for message, expected in LABELED:
+        guess = classify_intent(message)
+        escalated = guess.confidence < args.threshold
+        stats.record(guess, escalated)
+        if not escalated and expected is not None and guess.wants_to_stop != expected:
+            wrong.append(message)
+        if not escalated and expected is None:
+            wrong.append(message)
+
+    print(f"сообщений: {len(LABELED)}, {per_message * 1e6:.1f} мкс на сообщение")
+    print(f"быстрый путь: {stats.as_dict()}")
+    print(f"ошибок локального решения: {len(wrong)}")
+    for message in wrong:
+        print(f"  - {message}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""End-to-end бенчмарк интервью на ScriptedChatModel.
+
+Показывает накладные расходы графа на ход, латентность узлов, размеры
+промптов и число вызовов LLM на интервью. С --max-overhead-ms годится
+как регрессионная проверка в CI (код возврата 1 при превышении).
+
+    python -m benchmarks.bench_interview --sessions 50 --latency 0.05
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks.common import make_fake_llm, make_session, print_table, summarize, timed_interview
+from src.agents.intent import FastPathStats
+from src.graph.graph import build_interview_graph
+from src.promts.prefix import prefix_cache_stats, prompt_stats, reset_prompt_stats
+from src.speculation import SpeculationStats
+
+
+async def run(args: argparse.Namespace) -> dict:
+    llm = make_fake_llm(latency=args.latency, token_latency=args.token_latency)
+    app = build_interview_graph().compile()
+    reset_prompt_stats()
+
+    sessions = [make_session(f"bench-{i}", speculative=args.speculative) for i in range(args.sessions)]
+    started = time.perf_counter()
+    runs = await asyncio.gather(*[timed_interview(app, session) for session in sessions])
+    wall = time.perf_counter() - started
+
+    speculation = SpeculationStats()
+    intent = FastPathStats()
+    for session in sessions:
+        for key, value in vars(session.speculation_stats).items():
+            setattr(speculation, key, getattr(speculation, key) + value)
+        intent.local += session.intent_stats.local
+        intent.escalated += session.intent_stats.escalated
+        intent.local_stops += session.intent_stats.local_stops
+
+    node_durations = defaultdict(list)
+    for durations in runs:
+        for node, values in durations.items():
+            node_durations[node].extend(values)
+
+    # на каждом узле ровно один последовательный "прыжок" в LLM (Mentor и VibeMaster идут параллельно)
+    overhead = defaultdict(list)
+    for node, values in node_durations.items():
+        overhead[node] = [max(0.0, value - args.latency) for value in values]
+    turn_overhead = [
+        user_input + interviewer
+        for user_input, interviewer in zip(overhead["user_input"], overhead["interviewer"])
+    ]
+
+    calls = {
+        kind: {
+            "calls_per_interview": kind_stats["calls"] / args.sessions,
+            "avg_prompt_chars": kind_stats["prompt_chars"] / max(1, kind_stats["calls"]),
+            "avg_output_chars": kind_stats["output_chars"] / max(1, kind_stats["calls"]),
+        }
+        for kind, kind_stats in llm.stats.items()
+    }
+
+    return {
+        "sessions": args.sessions,
+        "wall_seconds": wall,
+        "interviews_per_second": args.sessions / wall,
+        "llm_calls_per_interview": llm.total_calls() / args.sessions,
+        "node_latency": {node: summarize(values) for node, values in node_durations.items()},
+        "node_overhead": {node: summarize(values) for node, values in overhead.items()},
+        "turn_overhead": summarize(turn_overhead),
+        "llm_calls": calls,
+        "speculation": speculation.as_dict(),
+        "vibe_fast_path": intent.as_dict(),
+        "prompts": prompt_stats(),
+        "prefix_cache": prefix_cache_stats(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="задержка LLM на вызов, сек")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="задержка LLM на токен, сек")
+    parser.add_argument("--speculative", action="store_true", help="спекулятивная генерация вопросов Interviewer'а")
+    parser.add_argument("--json", action="store_true", help="вывести результат в JSON")
+    parser.add_argument("--max-overhead-ms", type=float, default=None, help="порог p95 накладных расходов на ход")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print(f"Сессий: {result['sessions']}, wall: {result['wall_seconds']:.2f}s, "
+              f"{result['interviews_per_second']:.1f} интервью/с, "
+              f"вызовов LLM на интервью: {result['llm_calls_per_interview']:.1f}")
+        print_table("Латентность узлов", result["node_latency"])
+        print_table("Накладные расходы узлов (без LLM)", result["node_overhead"])
+        print_table("Накладные расходы на ход", {"turn": result["turn_overhead"]})
+        print_table("Вызовы LLM", result["llm_calls"])
+        print_table("Промпты агентов (байты, доля префикса/переиспользования)", result["prompts"])
+        print_table("Кэш статических префиксов", result["prefix_cache"])
+        if args.speculative:
+            print(f"\nСпекуляция: {result['speculation']}")
+        print(f"\nЛокальный классификатор VibeMaster: {result['vibe_fast_path']}")
+
+    if args.max_overhead_ms is not None and result["turn_overhead"]["p95_ms"] > args.max_overhead_ms:
+        print(f"\nРЕГРЕССИЯ: p95 накладных расходов на ход {result['turn_overhead']['p95_ms']:.2f}ms "
+              f"> {args.max_overhead_ms}ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Финальный фидбэк Manager'а: полная история против краткого содержания + последних ходов.
+
+Для интервью длиной 10, 30 и 100 ходов сравнивает латентность generate_feedback
+(вместе с ожиданием незавершённого фонового сжатия) и размер промптов Manager
+и Mentor в токенах. Задержка на токен промпта моделирует prefill у провайдера.
+
+    python -m benchmarks.bench_memory --turns 10 30 100 --prompt-token-latency 0.0002
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import make_fake_llm, make_state, print_table
+from src.fake_llm import ScriptedChatModel
+from src.graph.graph import get_agents
+from src.memory import SummaryMemory
+from src.structs.structs import Turn
+
+QUESTION = "Расскажите, как устроен {topic} в Python и где вы применяли это на практике? "
+ANSWER = "Я использовал {topic} в продакшене: разбирался с производительностью, писал тесты и документацию. "
+
+
+def make_turns(count: int) -> list[Turn]:
+    return [
+        Turn(
+            turn_id=i,
+            agent_visible_message=QUESTION.format(topic=f"тема {i}") * 3,
+            user_message=ANSWER.format(topic=f"тема {i}") * 3,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def prompt_tokens(llm: ScriptedChatModel, kind: str) -> float:
+    kind_stats = llm.stats.get(kind, {})
+    return kind_stats.get("prompt_chars", 0) / 4 / max(1, kind_stats.get("calls", 0))
+
+
+async def measure(llm: ScriptedChatModel, turns: list[Turn], use_memory: bool, think_time: float) -> dict:
+    state = make_state()
+    memory = SummaryMemory()
+    if use_memory:
+        # ходы приходят по одному, сжатие идёт в фоне пока кандидат думает над ответом
+        for i in range(1, len(turns) + 1):
+            state["turns"] = turns[:i]
+            memory.schedule(get_agents().summarizer, state)
+            await asyncio.sleep(think_time)
+    state["turns"] = turns
+    state["current_user_message"] = turns[-1].user_message
+
+    llm.reset_stats()
+    started = time.perf_counter()
+    if use_memory:
+        await memory.flush()
+        state.update(memory.state_update(state))
+    await get_agents().manager.generate_feedback(state)
+    feedback_seconds = time.perf_counter() - started
+
+    await get_agents().mentor.analyze_and_calibrate(state)
+    return {
+        "feedback_ms": feedback_seconds * 1000,
+        "manager_tokens": prompt_tokens(llm, "feedback"),
+        "mentor_tokens": prompt_tokens(llm, "mentor"),
+        "summary_chars": len(memory.summary),
+        "summarizer_calls": memory.updates,
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    llm = make_fake_llm(
+        latency=args.latency,
+        token_latency=args.token_latency,
+        prompt_token_latency=args.prompt_token_latency,
+    )
+    for count in args.turns:
+        turns = make_turns(count)
+        rows = {
+            "full_history": await measure(llm, turns, use_memory=False, think_time=args.think_time),
+            "summary": await measure(llm, turns, use_memory=True, think_time=args.think_time),
+        }
+        print_table(f"Ходов: {count}", rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 30, 100])
+    parser.add_argument("--latency", type=float, default=0.05, help="задержка до первого токена, сек")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="задержка на токен ответа, сек")
+    parser.add_argument("--prompt-token-latency", type=float, default=0.0002, help="задержка на токен промпта, сек")
+    parser.add_argument("--think-time", type=float, default=0.06, help="время ответа кандидата между ходами, сек")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
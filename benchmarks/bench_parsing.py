@@ -0,0 +1,112 @@
+"""Запасной разбор сырых ответов LLM: сколько испорченных ответов спасается без повторного запроса.
+
+Корпус — типичные ошибки моделей: markdown-обёртка, текст вокруг объекта, два
+объекта подряд, висячие запятые, одинарные кавычки, переводы строк внутри строк,
+\\d из регулярок, True/None, thinking-словарь, оборванный ответ. Для прежнего
+парсера (две чистки re.sub + жадный поиск {...}) и для extract_json печатает
+долю спасённых ответов и время разбора, затем прогоняет корпус через
+BaseAgent._call_structured на ScriptedChatModel и считает запросы к провайдеру:
+каждый неспасённый ответ стоит ещё двух платных попыток.
+
+    python -m benchmarks.bench_parsing --repeat 200
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+from collections import Counter
+
+from langchain_core.messages import HumanMessage
+
+import src.agents.agents as agents_module
+from benchmarks.common import print_table
+from src.agents.agents import BaseAgent
+from src.agents.parsing import normalize_thinking, parse_raw_response
+from src.agents.retry import RetryPolicy, StructuredOutputError
+from src.fake_llm import ScriptedChatModel
+from src.structs.schemas import InterviewerResponseSchema
+
+THINKING = "Кандидат ответил верно; спрошу про asyncio."
+RESPONSE = "Хорошо. Как работает event loop?"
+
+CORPUS = {
+    "clean": f'{{"thinking": "{THINKING}", "response": "{RESPONSE}"}}',
+    "fenced": f'```json\n{{"thinking": "{THINKING}", "response": "{RESPONSE}"}}\n```',
+    "prose": f'Вот мой ответ: {{"thinking": "{THINKING}", "response": "{RESPONSE}"}} Надеюсь, {{помог}}.',
+    "two_objects": f'{{"thinking": "{THINKING}", "response": "{RESPONSE}"}}\n{{"thinking": "второй", "response": "x"}}',
+    "trailing_comma": f'{{"thinking": "{THINKING}", "response": "{RESPONSE}",}}',
+    "single_quotes": f"{{'thinking': '{THINKING}', 'response': '{RESPONSE}'}}",
+    "newlines": f'{{"thinking": "{THINKING}\nшаг 2:\tпроверить", "response": "{RESPONSE}"}}',
+    "invalid_escape": f'{{"thinking": "ищу \\d+ в ответе", "response": "{RESPONSE}"}}',
+    "python_literals": f'{{"thinking": "{THINKING}", "response": "{RESPONSE}", "done": True, "topic": None}}',
+    "thinking_dict": f'{{"thinking": {{"1": "верно", "2": "дальше"}}, "response": "{RESPONSE}"}}',
+    "truncated_string": f'{{"thinking": "{THINKING}", "response": "{RESPONSE[:20]}',
+    "truncated_value": f'{{"thinking": "{THINKING}", "response": "{RESPONSE}", "difficulty": 3, "topi',
+}
+
+
+def legacy_parse(schema, content: str):
+    """Прежний parse_raw_response."""
+    content = re.sub(r'```json\s*', '', content)
+    content = re.sub(r'```\s*$', '', content)
+    try:
+        parsed = json.loads(content)
+    except json.JSONDecodeError:
+        json_match = re.search(r'\{[\s\S]*\}', content)
+        if not json_match:
+            raise
+        parsed = json.loads(json_match.group())
+    return schema(**normalize_thinking(parsed)), ()
+
+
+def measure_parser(parse, repeat: int) -> tuple[dict, Counter]:
+    saved, repairs = 0, Counter()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for content in CORPUS.values():
+            try:
+                _, applied = parse(InterviewerResponseSchema, content)
+                saved += 1
+                repairs.update(applied)
+            except Exception:
+                pass
+    seconds = time.perf_counter() - started
+    total = repeat * len(CORPUS)
+    return {"saved": saved / repeat, "of": len(CORPUS), "saved_rate": saved / total, "parse_us": seconds / total * 1e6}, repairs
+
+
+async def count_requests(parse) -> dict:
+    """Запросы к провайдеру на весь корпус, когда модель каждый раз отвечает одинаково испорченно."""
+    original = agents_module.parse_raw_response
+    agents_module.parse_raw_response = parse
+    requests = failures = 0
+    try:
+        for content in CORPUS.values():
+            llm = ScriptedChatModel(script={"unknown": [content]})
+            agent = BaseAgent("Bench", llm=llm, retry_policy=RetryPolicy(base_delay=0.0))
+            try:
+                await agent._call_structured(InterviewerResponseSchema, [HumanMessage(content="вопрос")], "bench")
+            except StructuredOutputError:
+                failures += 1
+            requests += llm.total_calls()
+    finally:
+        agents_module.parse_raw_response = original
+    return {"llm_requests": requests, "failed_calls": failures}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows, repairs = {}, None
+    for name, parse in (("legacy", legacy_parse), ("extract_json", parse_raw_response)):
+        rows[name], repairs = measure_parser(parse, args.repeat)
+        rows[name].update(asyncio.run(count_requests(parse)))
+    print_table(f"Корпус из {len(CORPUS)} ответов LLM", rows)
+    print(f"\nПочинки extract_json на корпус: {dict((k, v // args.repeat) for k, v in repairs.items())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Банк вопросов: доля ходов без полной генерации и размер промпта Interviewer'а.
+
+Прогоняет одинаковые интервью (фиксированные рекомендации Mentor по темам
+и ответы кандидата) без банка и дважды поверх одного файла банка: в первом
+проходе банк пустой и наполняется сгенерированными вопросами, во втором уже
+прогрет. Затем меряет lookup в банке на много вопросов.
+
+    python -m benchmarks.bench_question_bank --sessions 10 --latency 0.02
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.common import make_fake_llm, make_session, print_table, summarize, timed_interview
+from src.question_bank import QuestionBank, QuestionBankStats
+from src.graph.graph import build_interview_graph, get_agents
+
+TOPICS = ["GIL", "генераторы", "asyncio", "декораторы", "event loop", "контекстные менеджеры", "сборка мусора"]
+
+
+def mentor_payload(i: int, topic: str) -> dict:
+    return {
+        "thinking": f"ответ верный, дальше {topic}",
+        "answer_type": "correct",
+        "factual_errors": [],
+        "correct_info": "",
+        "confidence_score": 85,
+        "instruction_to_interviewer": "Похвали и задай следующий вопрос",
+        "difficulty_level": 1 + i % 3,
+        "topic_recommendation": topic,
+        "should_give_hint": False,
+    }
+
+
+async def run_pass(app, llm, sessions: int, name: str) -> dict:
+    llm.reset_stats()
+    stats = QuestionBankStats()
+    interviewer_turns = []
+    started = time.perf_counter()
+    for i in range(sessions):
+        session = make_session(f"{name}-{i}")
+        durations = await timed_interview(app, session)
+        interviewer_turns.extend(durations["interviewer"])
+        for key, value in vars(session.bank_stats).items():
+            setattr(stats, key, getattr(stats, key) + value)
+    calls = llm.stats.get("interviewer", {})
+    return {
+        "wall_s": time.perf_counter() - started,
+        "avoided_rate": stats.avoided_rate,
+        "prompt_chars": calls.get("prompt_chars", 0) / max(1, calls.get("calls", 0)),
+        "turn_p50_ms": summarize(interviewer_turns)["p50_ms"],
+    }
+
+
+def check_lookup(path: str, questions: int) -> dict:
+    bank = QuestionBank(path)
+    for i in range(questions):
+        bank.add("Python Developer", "Middle", f"тема {i % 500}", 1 + i % 5, f"Вопрос номер {i} про тему {i % 500}?")
+    started = time.perf_counter()
+    for i in range(questions):
+        bank.pick("Python Developer", "Middle", f"тема {i % 500}", 1 + i % 5)
+    lookup_us = (time.perf_counter() - started) / questions * 1e6
+    return {"questions": len(bank), "keys": len(bank._index), "pick_us": round(lookup_us, 1)}
+
+
+async def run(args: argparse.Namespace) -> None:
+    interviewer = get_agents().interviewer
+    llm = make_fake_llm(latency=args.latency, prompt_token_latency=args.prompt_token_latency)
+    llm.script = {
+        "mentor": [mentor_payload(i, topic) for i, topic in enumerate(TOPICS)],
+        "interviewer": [
+            {"thinking": "следующий вопрос", "response": f"Хорошо. Расскажите подробнее, как устроены {topic.lower()}?"}
+            for topic in TOPICS
+        ],
+    }
+    work_dir = tempfile.mkdtemp(prefix="bench_bank_")
+    app = build_interview_graph().compile()
+
+    interviewer.question_bank = None
+    rows = {"no_bank": await run_pass(app, llm, args.sessions, "plain")}
+    interviewer.question_bank = QuestionBank(os.path.join(work_dir, "questions.jsonl"))
+    rows["cold"] = await run_pass(app, llm, args.sessions, "cold")
+    rows["warm"] = await run_pass(app, llm, args.sessions, "warm")
+    print_table(f"Банк вопросов ({args.sessions} интервью на проход)", rows)
+    print(f"\n{interviewer.question_bank!r}, статистика: {interviewer.question_bank.stats.as_dict()}")
+    print(f"Lookup: {check_lookup(os.path.join(work_dir, 'lookup.jsonl'), args.questions)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.02, help="задержка LLM на вызов, сек")
+    parser.add_argument("--prompt-token-latency", type=float, default=0.00002, help="задержка на токен промпта, сек")
+    parser.add_argument("--questions", type=int, default=20000, help="размер банка для замера lookup")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Сериализация логов на длинных стенограммах: orjson против stdlib json.
+
+Собирает стенограмму из N ходов (длинные мысли трёх агентов) и событий агентов
+и на каждом бэкенде src.serialization меряет запись журнала TurnJournal,
+чтение журнала, сохранение итогового лога save_session и разбор сырых ответов
+LLM запасным парсером parse_raw_response (ответ в markdown-обёртке и с текстом
+вокруг JSON).
+
+    python -m benchmarks.bench_serialization --turns 500 --repeat 5
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.common import print_table
+from src import serialization
+from src.agents.parsing import parse_raw_response
+from src.logs import InterviewLogger
+from src.structs.schemas import InterviewerResponseSchema
+from src.structs.structs import LogUnit, Turn
+
+THOUGHT = "Кандидат уверенно объяснил GIL, но путает процессы и потоки; спросить про multiprocessing. " * 8
+QUESTION = "Расскажите, как устроен event loop в asyncio и что происходит при await на корутине? " * 2
+
+
+def build_transcript(turns: int) -> list:
+    """Записи журнала в том порядке, в каком их пишет InterviewLogger."""
+    records = [{"kind": "session", "ts": datetime.now().isoformat(), "participant_name": "Бенчмарк",
+                "position": "Python Developer", "grade": "Middle"}]
+    for i in range(1, turns + 1):
+        turn = Turn(turn_id=i, agent_visible_message=QUESTION, user_message=f"Ответ {i}: " + THOUGHT)
+        for agent in ("Interviewer", "VibeMaster", "Mentor"):
+            turn.add_thought(agent, THOUGHT)
+            records.append({"kind": "event", "ts": datetime.now(), "role": agent, "event": "Анализ завершён",
+                            "info": {"thinking": THOUGHT, "answer_type": "partial", "difficulty": i % 5 + 1}})
+        records.append({"kind": "turn", **turn.as_dict()})
+    return records
+
+
+def raw_response(i: int) -> str:
+    body = serialization.dumps_str({"thinking": THOUGHT, "response": f"{i}. {QUESTION}"}, indent=True)
+    return f"Вот мой ответ:\n```json\n{body}\n```\nНадеюсь, помог."
+
+
+def measure(records: list, responses: list, logs_dir: str, repeat: int) -> dict:
+    logger = InterviewLogger(os.path.join(logs_dir, "bench.json"))
+    write = read = save = parse = 0.0
+    for _ in range(repeat):
+        logger.journal._truncate = True
+        started = time.perf_counter()
+        logger.journal._write(records)
+        write += time.perf_counter() - started
+
+        started = time.perf_counter()
+        turns = [record for record in logger.journal.read() if record.get("kind") == "turn"]
+        read += time.perf_counter() - started
+
+        started = time.perf_counter()
+        logger.save_session(LogUnit(participant_name="Бенчмарк", turns=turns, final_feedback=None))
+        save += time.perf_counter() - started
+
+        started = time.perf_counter()
+        for content in responses:
+            parse_raw_response(InterviewerResponseSchema, content)
+        parse += time.perf_counter() - started
+
+    journal_mb = os.path.getsize(logger.journal.path) / 2**20
+    return {
+        "journal_mb": journal_mb,
+        "write_ms": write / repeat * 1000,
+        "write_mb_s": journal_mb * repeat / write,
+        "read_ms": read / repeat * 1000,
+        "save_ms": save / repeat * 1000,
+        "parse_us": parse / repeat / len(responses) * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--responses", type=int, default=1000, help="сырых ответов LLM для parse_raw_response")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    records = build_transcript(args.turns)
+    responses = [raw_response(i) for i in range(args.responses)]
+    rows = {}
+    orjson_module = serialization._orjson
+    with tempfile.TemporaryDirectory() as logs_dir:
+        try:
+            serialization._orjson = None
+            rows["json"] = measure(records, responses, logs_dir, args.repeat)
+        finally:
+            serialization._orjson = orjson_module
+        if orjson_module is not None:
+            rows["orjson"] = measure(records, responses, logs_dir, args.repeat)
+    print_table(f"Стенограмма {args.turns} ходов, {len(records)} записей журнала", rows)
+
+
+if __name__ == "__main__":
+    main()
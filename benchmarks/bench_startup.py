@@ -0,0 +1,111 @@
+"""Холодный старт CLI: время импорта main.py и время до первого вопроса кандидату.
+
+Каждый замер — новый процесс в пустом рабочем каталоге:
+- import: `python -X importtime -c "import main"`, суммарное время импорта main;
+- graph: импорт графа с агентами и компиляция (то, что раньше оплачивалось до первого вопроса,
+  а теперь идёт в фоне, пока кандидат вводит профиль);
+- first_prompt: от запуска `python main.py` до вывода приглашения "Имя:".
+
+Регрессионная проверка: код возврата 1, если p50 импорта больше --max-import-ms, если `import main`
+тянет тяжёлые модули (langchain, langgraph, httpx) или создаёт файлы в рабочем каталоге.
+
+    python -m benchmarks.bench_startup --runs 5 --max-import-ms 400
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import print_table, summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("langchain_core", "langchain_mistralai", "langgraph", "langsmith", "httpx")
+GRAPH_CODE = "from src.graph.graph import get_compiled_graph; get_compiled_graph()"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def run_python(args: list, cwd: str, **kwargs) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": ROOT, "LLM_BACKEND": "fake", "PYTHONDONTWRITEBYTECODE": "1"}
+    return subprocess.run([sys.executable, *args], cwd=cwd, env=env, capture_output=True, text=True, **kwargs)
+
+
+def measure_imports(code: str, cwd: str) -> tuple[float, set]:
+    """Суммарное время импорта (с) и множество импортированных модулей верхнего уровня."""
+    result = run_python(["-X", "importtime", "-c", code], cwd)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    total_us, modules = 0, set()
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        cumulative, indent, name = match.groups()
+        modules.add(name.split(".")[0])
+        if not indent:
+            total_us += int(cumulative)
+    return total_us / 1e6, modules
+
+
+def measure_first_prompt(cwd: str, timeout: float = 30.0) -> float:
+    env = {**os.environ, "PYTHONPATH": ROOT, "LLM_BACKEND": "fake", "PYTHONUNBUFFERED": "1"}
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "main.py")],
+        cwd=cwd, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    output = b""
+    try:
+        while "Имя:".encode("utf-8") not in output:
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError("CLI не показал приглашение")
+            chunk = os.read(process.stdout.fileno(), 4096)
+            if not chunk:
+                raise RuntimeError(f"CLI завершился до приглашения: {output.decode(errors='ignore')}")
+            output += chunk
+        return time.perf_counter() - started
+    finally:
+        process.kill()
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=None, help="порог p50 импорта main для CI")
+    args = parser.parse_args()
+
+    imports, graphs, first_prompts = [], [], []
+    problems = []
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory(prefix="bench_startup_") as cwd:
+            seconds, modules = measure_imports("import main", cwd)
+            imports.append(seconds)
+            heavy = sorted(set(HEAVY_MODULES) & modules)
+            if heavy:
+                problems.append(f"import main тянет {', '.join(heavy)}")
+            if os.listdir(cwd):
+                problems.append(f"import main создаёт файлы: {', '.join(os.listdir(cwd))}")
+            graphs.append(measure_imports(GRAPH_CODE, cwd)[0])
+            first_prompts.append(measure_first_prompt(cwd))
+
+    rows = {
+        "import": summarize(imports),
+        "graph": summarize(graphs),
+        "first_prompt": summarize(first_prompts),
+    }
+    print_table(f"Холодный старт, {args.runs} запусков", rows)
+
+    p50 = rows["import"]["p50_ms"]
+    if args.max_import_ms is not None and p50 > args.max_import_ms:
+        problems.append(f"import main {p50:.0f} мс > {args.max_import_ms:.0f} мс")
+    for problem in sorted(set(problems)):
+        print(f"РЕГРЕССИЯ: {problem}")
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Память состояния интервью: 1000 одновременных сессий в одном процессе.
+
+Собирает в памяти состояния N сессий (ходы с мыслями трёх агентов, результаты
+вопросов, темы) на текущих structs (dataclass со slots) и на прежней модели
+(обычные dataclass с __dict__ на каждый экземпляр) и сравнивает память по
+tracemalloc.
+
+    python -m benchmarks.bench_state --sessions 1000 --turns 10
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from benchmarks.common import make_state, print_table
+from src.structs.structs import QuestionResult, Turn
+
+THOUGHT = "Кандидат ответил верно, но без деталей реализации; стоит спросить про практику. " * 3
+TOPICS = ["GIL", "генераторы", "asyncio", "декораторы", "event loop", "dict", "метаклассы"]
+
+
+@dataclass
+class LegacyTurn:
+    turn_id: int
+    agent_visible_message: str
+    user_message: str = ""
+    internal_thoughts: str = ""
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def add_thought(self, agent_name: str, thought: str) -> None:
+        if self.internal_thoughts:
+            self.internal_thoughts += f"\n[{agent_name}]: {thought}"
+        else:
+            self.internal_thoughts = f"[{agent_name}]: {thought}"
+
+
+@dataclass
+class LegacyQuestionResult:
+    topic: str
+    question: str
+    user_answer: str
+    is_correct: bool
+    correct_answer: Optional[str] = None
+    confidence: float = 0.0
+
+
+def build_session(session_no: int, turns: int, legacy: bool) -> dict:
+    """Состояние сессии так, как его собирают узлы графа."""
+    state = make_state(f"Кандидат {session_no}")
+    turn_cls, result_cls = (LegacyTurn, LegacyQuestionResult) if legacy else (Turn, QuestionResult)
+    for i in range(1, turns + 1):
+        question = f"Вопрос {i}: расскажите про {TOPICS[i % len(TOPICS)]} подробнее?"
+        turn = turn_cls(turn_id=i, agent_visible_message=question, internal_thoughts=f"[Interviewer]: {THOUGHT}\n")
+        turn.user_message = f"Ответ кандидата {session_no} на вопрос {i}"
+        turn.add_thought("VibeMaster", f"{THOUGHT}\n")
+        turn.add_thought("Mentor", f"{THOUGHT}\n")
+        state["turns"].append(turn)
+        topic = TOPICS[(i + 1) % len(TOPICS)]
+        if topic not in state["topics_covered"]:
+            state["topics_covered"].append(topic)
+        state["question_results"].append(result_cls(
+            topic=topic, question=question, user_answer=turn.user_message, is_correct=i % 2 == 0, confidence=0.8
+        ))
+    return state
+
+
+def measure_sessions(sessions: int, turns: int, legacy: bool) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    states = [build_session(i, turns, legacy) for i in range(sessions)]
+    build_seconds = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del states
+    return {"total_mb": current / 2**20, "kb_per_session": current / 1024 / sessions, "build_ms": build_seconds * 1000}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--turns", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = {
+        "legacy": measure_sessions(args.sessions, args.turns, legacy=True),
+        "compact": measure_sessions(args.sessions, args.turns, legacy=False),
+    }
+    print_table(f"Состояние {args.sessions} сессий по {args.turns} ходов", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Время до первого видимого токена: стриминг реплики Interviewer'а против ожидания всего JSON.
+
+    python -m benchmarks.bench_streaming --token-latency 0.01 --thinking-words 60
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import make_fake_llm, make_session, make_state
+from src.graph.graph import get_agents
+from src.streaming import TranscriptStream
+from src.structs.structs import CalibrationResult, MentorAnalysis
+
+ANALYSIS = MentorAnalysis(answer_type="correct", instruction_to_interviewer="Задай следующий вопрос")
+CALIBRATION = CalibrationResult(difficulty_level=3, topic_recommendation="asyncio")
+
+
+async def run(args: argparse.Namespace) -> None:
+    make_fake_llm(latency=args.latency, token_latency=args.token_latency, thinking_words=args.thinking_words)
+    state = make_state()
+
+    full = []
+    for _ in range(args.iterations):
+        started = time.perf_counter()
+        await get_agents().interviewer.generate_response(state, ANALYSIS, CALIBRATION)
+        full.append(time.perf_counter() - started)
+
+    first_token = []
+    for _ in range(args.iterations):
+        session = make_session("bench-stream")
+        async with TranscriptStream(session) as stream:
+            await get_agents().interviewer.stream_response(state, ANALYSIS, CALIBRATION, stream)
+        first_token.append(stream.first_token_seconds or 0.0)
+
+    print(f"без стриминга, до реплики:   {sum(full) / len(full) * 1000:8.1f} ms")
+    print(f"стриминг, первый токен:       {sum(first_token) / len(first_token) * 1000:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2, help="задержка до первого токена, сек")
+    parser.add_argument("--token-latency", type=float, default=0.01, help="задержка на токен, сек")
+    parser.add_argument("--thinking-words", type=int, default=60)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
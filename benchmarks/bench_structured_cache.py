@@ -0,0 +1,71 @@
+"""Микро-бенчмарк: пересборка with_structured_output на каждый вызов против кэша в BaseAgent.
+
+    python -m benchmarks.bench_structured_cache --iterations 2000
+"""
+import argparse
+import asyncio
+import time
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from src.agents.agents import BaseAgent
+from src.fake_llm import ScriptedChatModel
+from src.promts.interviewer import get_response_prompt, get_response_system_prompt
+from src.structs.schemas import InterviewerResponseSchema
+
+MESSAGES = [
+    SystemMessage(content=get_response_system_prompt("Python Developer", "Middle")),
+    HumanMessage(content=get_response_prompt("Тип ответа: correct", ["GIL"])),
+]
+
+
+async def per_call(llm: ScriptedChatModel, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        structured_llm = llm.with_structured_output(InterviewerResponseSchema, method="json_mode")
+        await structured_llm.ainvoke(MESSAGES)
+    return time.perf_counter() - started
+
+
+async def cached(agent: BaseAgent, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await agent._structured(InterviewerResponseSchema).ainvoke(MESSAGES)
+    return time.perf_counter() - started
+
+
+def build_only(llm: ScriptedChatModel, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        llm.with_structured_output(InterviewerResponseSchema, method="json_mode")
+    return time.perf_counter() - started
+
+
+async def run(iterations: int) -> None:
+    llm = ScriptedChatModel(thinking_words=5)
+    agent = BaseAgent("Bench", llm=llm)
+
+    # прогрев
+    await per_call(llm, 10)
+    await cached(agent, 10)
+
+    build = build_only(llm, iterations)
+    uncached = await per_call(llm, iterations)
+    hot = await cached(agent, iterations)
+
+    print(f"Итераций: {iterations}")
+    print(f"сборка runnable:          {build / iterations * 1e6:9.1f} мкс/вызов")
+    print(f"пересборка + ainvoke:     {uncached / iterations * 1e6:9.1f} мкс/вызов")
+    print(f"кэш + ainvoke:            {hot / iterations * 1e6:9.1f} мкс/вызов")
+    print(f"экономия:                 {(uncached - hot) / iterations * 1e6:9.1f} мкс/вызов")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Общие помощники бенчмарков: подмена LLM, прогон интервью, статистика."""
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from src.fake_llm import ScriptedChatModel
+from src.graph.graph import create_initial_state, get_agents
+from src.logs import InterviewLogger
+from src.session import InterviewSession, make_config
+from src.transport import QueueTransport
+
+DEFAULT_ANSWERS = [
+    "GIL — глобальная блокировка интерпретатора, мешает потокам параллельно исполнять байткод",
+    "Генератор возвращает значения лениво через yield",
+    "Не знаю",
+    "Декоратор — функция, которая оборачивает другую функцию",
+    "asyncio использует event loop и корутины",
+    "Список изменяемый, кортеж нет",
+    "Контекстный менеджер реализует __enter__ и __exit__",
+    "Сборщик мусора считает ссылки и ищет циклы",
+    "dict реализован как хеш-таблица",
+    "Метаклассы создают классы",
+    "Спасибо, на этом всё",
+    "Спасибо, на этом всё",
+]
+
+
+def install_llm(llm) -> None:
+    """Подменяет LLM у общих агентов графа."""
+    for agent in get_agents().all():
+        agent.llm = llm
+
+
+def make_fake_llm(
+    latency: float = 0.0,
+    token_latency: float = 0.0,
+    thinking_words: int = 20,
+    prompt_token_latency: float = 0.0,
+) -> ScriptedChatModel:
+    llm = ScriptedChatModel(
+        latency=latency,
+        token_latency=token_latency,
+        thinking_words=thinking_words,
+        prompt_token_latency=prompt_token_latency,
+    )
+    install_llm(llm)
+    return llm
+
+
+def make_session(
+    session_id: str,
+    answers: Optional[List[str]] = None,
+    logs_dir: Optional[str] = None,
+    speculative: bool = False,
+    combined: bool = False,
+) -> InterviewSession:
+    logs_dir = logs_dir or tempfile.mkdtemp(prefix="bench_logs_")
+    return InterviewSession(
+        session_id=session_id,
+        logger=InterviewLogger(output_path=f"{logs_dir}/{session_id}.json"),
+        transport=QueueTransport(list(answers or DEFAULT_ANSWERS)),
+        speculative=speculative,
+        combined_analysis=combined,
+    )
+
+
+def make_state(name: str = "Бенчмарк"):
+    return create_initial_state(
+        participant_name=name,
+        position="Python Developer",
+        grade="Middle",
+        experience="3 года",
+    )
+
+
+async def timed_interview(app, session: InterviewSession, state=None) -> Dict[str, List[float]]:
+    """Прогоняет интервью через astream и возвращает длительности узлов в секундах."""
+    durations: Dict[str, List[float]] = defaultdict(list)
+    started = time.perf_counter()
+    async for update in app.astream(state or make_state(), config=make_config(session), stream_mode="updates"):
+        now = time.perf_counter()
+        for node in update:
+            durations[node].append(now - started)
+        started = now
+    return durations
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean_ms": statistics.fmean(values) * 1000 if values else 0.0,
+        "p50_ms": percentile(values, 0.5) * 1000,
+        "p95_ms": percentile(values, 0.95) * 1000,
+    }
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n{title}")
+    if not rows:
+        return
+    columns = list(next(iter(rows.values())).keys())
+    print(f"{'':<16}" + "".join(f"{column:>14}" for column in columns))
+    for name, row in rows.items():
+        print(f"{name:<16}" + "".join(f"{row[column]:>14.2f}" for column in columns))
@@ -1,38 +1,97 @@
 import sys
+import argparse
 import asyncio
-from src.graph.graph import build_interview_graph, create_initial_state
-import logging 
+# граф, агенты, langchain и langgraph импортируются лениво (load_app): без них CLI стартует в разы быстрее
+from src.clients import get_client_registry
+from src.config import CHECKPOINT_DB
+from src.session import InterviewSession, ask_candidate_profile, make_config
+from src.transport import StdioTransport
+import logging
 
 logger = logging.getLogger(__name__)
 
-async def main():
-    print("Interview Multi-Agent System\n")
-    
-    print("Введите данные кандидата:")
-    participant_name = input("Имя: ").strip()
-    position = input("Позиция (например: Python Developer): ").strip()
-    grade = input("Грейд (Junior/Middle/Senior): ").strip()
-    experience = input("Опыт работы: ").strip()
-    
-    initial_state = create_initial_state(
-        participant_name=participant_name,
-        position=position,
-        grade=grade,
-        experience=experience
-    )
-    
-    workflow = build_interview_graph()
-    app = workflow.compile()
-    mermaid_code = app.get_graph().draw_mermaid()
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Interview Multi-Agent System")
+    parser.add_argument("--serve", action="store_true", help="серверный режим: много интервью в одном процессе")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-sessions", type=int, default=500)
+    parser.add_argument("--metrics-port", type=int, default=None, help="порт HTTP-эндпоинта /metrics (Prometheus)")
+    parser.add_argument("--resume", metavar="SESSION_ID", default=None,
+                        help="продолжить прерванное интервью с последнего чекпоинта")
+    parser.add_argument("--replay", metavar="TRANSCRIPTS", default=None,
+                        help="batch-прогон сценариев интервью из JSONL (см. src/replay.py)")
+    parser.add_argument("--replay-out", default="logs/replay/results.jsonl", help="куда писать результаты прогона")
+    parser.add_argument("--concurrency", type=int, default=20, help="сколько сценариев прогонять одновременно")
+    parser.add_argument("--import-questions", metavar="JOURNAL", nargs="+", default=None,
+                        help="пополнить банк вопросов из журналов logs/*.jsonl (см. src/question_bank.py)")
+    parser.add_argument("--draw-graph", metavar="PATH", nargs="?", const="-", default=None,
+                        help="вывести граф интервью в формате Mermaid (в PATH или в stdout) и выйти")
+    return parser.parse_args()
+
+
+def load_app():
+    """Импортирует граф с агентами и компилирует его — самая долгая часть старта."""
+    from src.checkpoint import get_checkpointer
+    from src.graph.graph import get_compiled_graph
+
+    return get_compiled_graph(get_checkpointer())
+
+
+async def resume_state(app, session: InterviewSession) -> bool:
+    """Готовит сессию к продолжению из чекпоинта; False, если продолжать нечего."""
+    snapshot = await app.aget_state(make_config(session))
+    if not snapshot.values:
+        logger.info(f"Чекпоинт сессии {session.session_id} не найден")
+        return False
+    if not snapshot.next:
+        logger.info(f"Интервью {session.session_id} уже завершено")
+        return False
+    state = snapshot.values
+    session.memory.restore(state)
+    await session.send(f"Продолжаем интервью с кандидатом {state['participant_name']}\n")
+    if snapshot.next == ("user_input",) and state["turns"]:
+        # следующий шаг — ответ кандидата, а последний вопрос он мог не увидеть до падения
+        await session.send(f"🤖 Interviewer: {state['turns'][-1].agent_visible_message}\n")
+    return True
+
+
+async def main(args: argparse.Namespace):
+    if args.resume and not CHECKPOINT_DB:
+        logger.info("Возобновление недоступно: чекпоинты выключены (CHECKPOINT_DB пустой)")
+        sys.exit(1)
+    session = InterviewSession.create(StdioTransport(), session_id=args.resume, resume=bool(args.resume))
+    # пока кандидат вводит профиль, граф грузится в отдельном потоке
+    app_loading = asyncio.ensure_future(asyncio.to_thread(load_app))
+
+    await session.send("Interview Multi-Agent System\n")
+    if args.resume:
+        app = await app_loading
+        if not await resume_state(app, session):
+            sys.exit(1)
+        # None: граф продолжает с узла после последнего чекпоинта
+        graph_input = None
+    else:
+        profile = await ask_candidate_profile(session)
+        app = await app_loading
+        from src.graph.graph import create_initial_state
+        graph_input = create_initial_state(**profile)
+        if app.checkpointer is not None:
+            await session.send(f"Сессия {session.session_id} (продолжить после сбоя: python main.py --resume {session.session_id})\n")
+
     try:
-        final_state = await app.ainvoke(initial_state)
-        
+        final_state = await app.ainvoke(graph_input, config=make_config(session))
+        if app.checkpointer is not None:
+            # интервью завершено, журнал и лог уже на диске
+            await app.checkpointer.adelete_thread(session.session_id)
+
         logger.info("\nИнтервью завершено!")
         logger.info(f"Причина: {final_state['stop_reason']}")
         logger.info(f"Задано вопросов: {final_state['questions_asked']}")
-        logger.info(f"Лог сохранён в: logs/interview_log.json")
-        
-    except KeyboardInterrupt:
+        logger.info(f"Лог сохранён в: {session.logger.output_path}")
+
+    except (KeyboardInterrupt, EOFError):
         logger.info("\n\nИнтервью прервано пользователем")
         sys.exit(0)
     except Exception as e:
@@ -40,8 +99,71 @@ async def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        trace_path = await session.export_trace()
+        if trace_path:
+            logger.info(f"Трасса сохранена в: {trace_path}")
+        await session.transport.close()
+        await get_client_registry().aclose()
 
 
-if __name__ == "__main__":
-    asyncio.run(main())
+async def serve(args: argparse.Namespace):
+    from src.server import InterviewServer
 
+    server = InterviewServer(
+        host=args.host,
+        port=args.port,
+        max_sessions=args.max_sessions,
+        metrics_port=args.metrics_port,
+    )
+    await server.serve_forever()
+
+
+async def run_replay(args: argparse.Namespace):
+    from src.replay import replay
+
+    try:
+        summary = await replay(args.replay, args.replay_out, concurrency=args.concurrency)
+    finally:
+        await get_client_registry().aclose()
+    logger.info(f"Результаты прогона: {args.replay_out}")
+    logger.info(f"Итог: {summary}")
+
+
+def import_questions(args: argparse.Namespace):
+    from src.question_bank import get_question_bank
+
+    bank = get_question_bank()
+    if bank is None:
+        sys.exit("Банк вопросов выключен: задайте QUESTION_BANK_PATH")
+    for path in args.import_questions:
+        logger.info(f"{path}: добавлено вопросов {bank.import_journal(path)}")
+    logger.info(f"Итог: {bank!r}")
+
+
+def draw_graph(args: argparse.Namespace):
+    from src.graph.graph import get_compiled_graph
+
+    mermaid_code = get_compiled_graph().get_graph().draw_mermaid()
+    if args.draw_graph == "-":
+        print(mermaid_code)
+    else:
+        with open(args.draw_graph, "w", encoding="utf-8") as f:
+            f.write(mermaid_code)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.draw_graph:
+        draw_graph(args)
+    elif args.serve:
+        logging.basicConfig(level=logging.INFO)
+        asyncio.run(serve(args))
+    elif args.import_questions:
+        logging.basicConfig(level=logging.INFO)
+        import_questions(args)
+    elif args.replay:
+        logging.basicConfig(level=logging.INFO)
+        asyncio.run(run_replay(args))
+    else:
+        asyncio.run(main(args))
@@ -1,40 +1,256 @@
-from typing import TYPE_CHECKING
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Generic, Optional, Tuple, TypeVar
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel
 
-from src.promts.mentor import get_mentor_persona, get_analyze_prompt
-from src.promts.interviewer import get_interviewer_persona, get_greeting_prompt, get_response_prompt
-from src.promts.manager import get_manager_persona, get_feedback_prompt
-from src.promts.vibemaster import get_vibemaster_persona, get_vibe_analysis_prompt
+from src.promts.mentor import get_mentor_persona, get_mentor_system_prompt, get_analyze_prompt
+from src.promts.combined import get_combined_system_prompt
+from src.promts.interviewer import (
+    get_greeting_system_prompt,
+    get_response_system_prompt,
+    get_bank_system_prompt,
+    get_greeting_prompt,
+    get_response_prompt,
+    get_bank_question_prompt,
+)
+from src.promts.manager import get_manager_system_prompt, get_feedback_prompt
+from src.promts.vibemaster import get_vibemaster_system_prompt, get_vibe_analysis_prompt
+from src.promts.summarizer import get_summarizer_system_prompt, get_summary_update_prompt, get_summary_context
+from src.promts.prefix import record_prompt
+from src.metrics import record_llm_call
+from src.tracing import span, traced
 from src.utils import get_openrouter_llm, clean_surrogate_characters
-from src.structs.structs import MentorAnalysis, CalibrationResult, FinalFeedback
+from src.clients import get_client_registry
+from src.streaming import STREAM_INTERRUPTED, ResponseFieldStreamer
+from src.agents.parsing import parse_raw_response
+from src.agents.intent import FastPathStats, classify_intent
+from src.agents.roles import classify_role, rejection_message
+from src.question_bank import QuestionBank, QuestionBankStats, extract_question, get_question_bank
+from src.cache import PersistentCache, get_agent_cache, make_key, normalize_text
+from src.config import (
+    GREETING_CACHE_VARIANTS,
+    MENTOR_CACHE_MAX_ANSWER_CHARS,
+    VIBE_FAST_PATH,
+    VIBE_FAST_PATH_THRESHOLD,
+)
+from src.agents.retry import (
+    DEFAULT_RETRY_POLICY,
+    RetryPolicy,
+    StructuredOutputError,
+    is_retryable_error,
+)
+from src.structs.structs import MentorAnalysis, CalibrationResult, FinalFeedback, Turn
 from src.structs.schemas import (
     MentorAnalysisSchema, 
+    MentorVibeSchema,
     InterviewerGreetingSchema,
     InterviewerResponseSchema, 
     FinalFeedbackSchema, 
-    UserIntentSchema
+    UserIntentSchema,
+    ConversationSummarySchema
 )
-import re
-import json
 import logging 
-import asyncio
 
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
     from src.graph.state import InterviewState
 
-MAX_RETRIES = 3
-RETRY_DELAY = 1  # секунды между попытками
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+@dataclass
+class StructuredCall(Generic[SchemaT]):
+    """Результат structured-вызова вместе с тем, чего он стоил."""
+    result: SchemaT
+    attempts: int  # сколько запросов к провайдеру понадобилось
+    recovered: bool = False  # результат восстановлен из сырого ответа, а не штатным парсером
+    usage: Optional[Dict[str, Any]] = None  # usage_metadata последнего ответа провайдера
+    streamed: bool = False  # поле response уже целиком отправлено кандидату по мере генерации
+    repairs: Tuple[str, ...] = ()  # что пришлось починить в сыром JSON (src/agents/parsing.py)
+    cached: bool = False  # результат взят из кэша, провайдер не вызывался
+    
+    @property
+    def total_tokens(self) -> int:
+        return (self.usage or {}).get("total_tokens", 0)
 
 
 class BaseAgent:
     """Базовый класс для всех агентов."""
     
-    def __init__(self, name: str, llm: BaseChatModel = None):
-        self.llm = llm or get_openrouter_llm()
+    def __init__(self, name: str, llm: BaseChatModel = None, retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY):
+        self._llm = llm  # None: общий клиент берётся при первом вызове LLM, а не при создании агента
         self.name = name
+        self.retry_policy = retry_policy
+        # (схема, метод, include_raw) -> готовый runnable со structured output, общий для всех ходов и сессий
+        self._structured_cache: dict[tuple[type[BaseModel], str, bool], Runnable] = {}
+        self._json_llm: Optional[Runnable] = None
+    
+    @property
+    def llm(self) -> BaseChatModel:
+        if self._llm is None:
+            self._llm = get_openrouter_llm()
+        return self._llm
+    
+    @llm.setter
+    def llm(self, llm: BaseChatModel) -> None:
+        self._llm = llm
+        self._structured_cache.clear()
+        self._json_llm = None
+    
+    def _structured(self, schema: type[BaseModel], method: str = "json_mode", include_raw: bool = False) -> Runnable:
+        """Возвращает закэшированный llm.with_structured_output(schema, method)."""
+        key = (schema, method, include_raw)
+        runnable = self._structured_cache.get(key)
+        if runnable is None:
+            runnable = self.llm.with_structured_output(schema, method=method, include_raw=include_raw)
+            self._structured_cache[key] = runnable
+        return runnable
+    
+    def _summary_messages(self, state: "InterviewState") -> list:
+        """Краткое содержание старых ходов (см. src/memory.py), если оно уже есть."""
+        summary = state.get("conversation_summary")
+        return [HumanMessage(content=get_summary_context(summary))] if summary else []
+    
+    async def _call_structured(self, schema: type[SchemaT], messages: list, operation: str) -> StructuredCall[SchemaT]:
+        """Единый цикл повторов для всех агентов.
+        
+        Если штатный парсер не справился, чиним уже полученный сырой ответ вместо
+        повторного платного запроса. Временные ошибки провайдера повторяем
+        с экспоненциальной задержкой, постоянные сразу пробрасываем.
+        """
+        runnable = self._structured(schema, include_raw=True)
+        policy = self.retry_policy
+        record_prompt(self.name, messages)
+        last_error: Exception | None = None
+        started = time.perf_counter()
+        
+        for attempt in range(1, policy.max_attempts + 1):
+            try:
+                with span("llm.attempt", agent=self.name, operation=operation, attempt=attempt) as attempt_span:
+                    async with get_client_registry().slot():
+                        output = await runnable.ainvoke(messages)
+                    if attempt_span is not None:
+                        attempt_span.set(parsed=output["parsed"] is not None)
+            except Exception as e:
+                error_msg = clean_surrogate_characters(str(e))
+                if not is_retryable_error(e):
+                    logger.error(f"{operation}: неустранимая ошибка провайдера: {error_msg}")
+                    record_llm_call(self.name, operation, time.perf_counter() - started, attempt, outcome="error")
+                    raise
+                logger.warning(f"{operation} попытка {attempt}/{policy.max_attempts} провалилась: {error_msg}")
+                last_error = e
+            else:
+                usage = getattr(output["raw"], "usage_metadata", None)
+                if output["parsed"] is not None:
+                    logger.info(f"{operation} успешен с попытки {attempt}")
+                    record_llm_call(self.name, operation, time.perf_counter() - started, attempt, usage)
+                    return StructuredCall(result=output["parsed"], attempts=attempt, usage=usage)
+                
+                # Fallback: ручной парсинг уже полученного ответа, без нового запроса
+                try:
+                    with span("parse.fallback", agent=self.name, attempt=attempt) as parse_span:
+                        result, repairs = parse_raw_response(schema, output["raw"].content)
+                        if parse_span is not None:
+                            parse_span.set(repairs=",".join(repairs))
+                    logger.info(
+                        f"{operation}: fallback парсинг успешен на попытке {attempt}, починки: {', '.join(repairs) or 'нет'}"
+                    )
+                    record_llm_call(
+                        self.name, operation, time.perf_counter() - started, attempt, usage, recovered=True, repairs=repairs
+                    )
+                    return StructuredCall(result=result, attempts=attempt, recovered=True, usage=usage, repairs=repairs)
+                except Exception as parse_error:
+                    # Безопасное логирование с очисткой суррогатных символов
+                    error_msg = clean_surrogate_characters(str(parse_error))
+                    logger.warning(f"{operation} попытка {attempt}/{policy.max_attempts}: fallback провалился: {error_msg}")
+                    last_error = parse_error
+            
+            if attempt < policy.max_attempts:
+                await policy.sleep(attempt)
+        
+        logger.error(f"{operation}: все {policy.max_attempts} попытки провалились")
+        record_llm_call(self.name, operation, time.perf_counter() - started, policy.max_attempts, outcome="error")
+        raise StructuredOutputError(f"{operation}: failed after {policy.max_attempts} attempts") from last_error
+    
+    async def _stream_structured(
+        self,
+        schema: type[SchemaT],
+        messages: list,
+        operation: str,
+        on_text: Callable[[str], Awaitable[None]],
+        field: str = "response",
+    ) -> StructuredCall[SchemaT]:
+        """Стримит ответ в json_mode и отдаёт значение поля field в on_text по мере генерации.
+        
+        Итоговый объект парсится из того же потока. Если стрим или парсинг не удались,
+        уходим в обычный _call_structured; тогда streamed=False и текст нужно отправить целиком,
+        а уже выведенный кусок реплики помечается как оборванный.
+        """
+        if self._json_llm is None:
+            self._json_llm = self.llm.bind(response_format={"type": "json_object"})
+        
+        streamer = ResponseFieldStreamer(field)
+        chunks: list[str] = []
+        usage = None
+        record_prompt(self.name, messages)
+        started = time.perf_counter()
+        try:
+            with span("llm.stream", agent=self.name, operation=operation):
+                async with get_client_registry().slot():
+                    async for chunk in self._json_llm.astream(messages):
+                        content = chunk.content if isinstance(chunk.content, str) else ""
+                        chunks.append(content)
+                        usage = getattr(chunk, "usage_metadata", None) or usage
+                        delta = streamer.feed(content)
+                        if delta:
+                            await on_text(delta)
+        except Exception as e:
+            error_msg = clean_surrogate_characters(str(e))
+            logger.warning(f"{operation}: стриминг прервался ({error_msg}), повторяем без стриминга")
+            record_llm_call(self.name, operation, time.perf_counter() - started, 1, usage, outcome="stream_error")
+            await self._interrupt_stream(streamer, on_text)
+            return await self._call_structured(schema, messages, operation)
+        
+        seconds = time.perf_counter() - started
+        content = "".join(chunks)
+        try:
+            with span("parse.stream", agent=self.name) as parse_span:
+                result, repairs = parse_raw_response(schema, content)
+                if parse_span is not None and repairs:
+                    parse_span.set(repairs=",".join(repairs))
+            record_llm_call(self.name, operation, seconds, 1, usage, recovered=bool(repairs), repairs=repairs)
+            if not streamer.done:
+                await self._interrupt_stream(streamer, on_text)
+            return StructuredCall(
+                result=result, attempts=1, recovered=bool(repairs), usage=usage, streamed=streamer.done, repairs=repairs
+            )
+        except Exception as parse_error:
+            error_msg = clean_surrogate_characters(str(parse_error))
+            logger.warning(f"{operation}: не удалось распарсить стрим: {error_msg}")
+        
+        # кандидат уже увидел реплику целиком — теряем только thinking
+        if streamer.done:
+            try:
+                result = schema(thinking="", **{field: streamer.text})
+                record_llm_call(self.name, operation, seconds, 1, usage, recovered=True)
+                return StructuredCall(result=result, attempts=1, recovered=True, usage=usage, streamed=True)
+            except Exception:
+                pass
+        record_llm_call(self.name, operation, seconds, 1, usage, outcome="parse_error")
+        await self._interrupt_stream(streamer, on_text)
+        return await self._call_structured(schema, messages, operation)
+
+    @staticmethod
+    async def _interrupt_stream(streamer: ResponseFieldStreamer, on_text: Callable[[str], Awaitable[None]]) -> None:
+        """Помечает оборванную реплику, если кандидат уже увидел её часть: дальше она придёт целиком."""
+        if streamer.text:
+            await on_text(STREAM_INTERRUPTED)
 
 
 class Mentor(BaseAgent):
@@ -46,8 +262,22 @@ class Mentor(BaseAgent):
     - Выявляет фактические ошибки
     - Калибрует сложность следующего вопроса
     - Даёт инструкции Interviewer'у
+    
+    Разбор коротких ответов кэшируется между сессиями (src/cache.py), если задан AGENT_CACHE_DB.
     """
 
+    def __init__(
+        self,
+        name: str,
+        llm: BaseChatModel = None,
+        retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+        cache: Optional[PersistentCache] = None,
+        cache_max_answer_chars: int = MENTOR_CACHE_MAX_ANSWER_CHARS,
+    ):
+        super().__init__(name, llm, retry_policy)
+        self.cache = cache if cache is not None else get_agent_cache("mentor")
+        self.cache_max_answer_chars = cache_max_answer_chars
+
     def initialize_analyzer(self, state: "InterviewState"): 
         # персонализирует анализатор, задает первый
         system_prompt = get_mentor_persona(state['position'], state['grade'])
@@ -55,19 +285,11 @@ class Mentor(BaseAgent):
         messages.append(HumanMessage(content=self._get_context(state['participant_name'], state['experience'])))
         return messages
 
-    async def analyze_and_calibrate(
-        self, 
-        state: "InterviewState"
-    ) -> tuple[MentorAnalysis, CalibrationResult, str]:
-        """Анализирует ответ и калибрует сложность через LangChain messages + structured output.
-        
-        Returns:
-            tuple: (MentorAnalysis, CalibrationResult, thinking)
-        """
-        messages = [] 
-        persona_prompt = get_mentor_persona(state['position'], state['grade'])
-        messages.append(SystemMessage(persona_prompt))
-        
+    def build_analysis_messages(self, state: "InterviewState", system_prompt: str) -> list:
+        # Статический префикс (персона + инструкции) одинаков на всех ходах,
+        # всё, что меняется от хода к ходу, идёт после него
+        messages = [SystemMessage(system_prompt)]
+        messages.extend(self._summary_messages(state))
         
         # История диалога (последние 3 хода)
         recent_turns = state["turns"][-3:] if state["turns"] else []
@@ -87,58 +309,23 @@ class Mentor(BaseAgent):
             topics_covered=state["topics_covered"]
         )
         messages.append(HumanMessage(content=analyze_request))
+        return messages
     
-        try:
-            structured_llm = self.llm.with_structured_output(
-                MentorAnalysisSchema,
-                method="json_mode"
-            )
-            result = await structured_llm.ainvoke(messages)
-        except Exception as e:
-            # Fallback: обычный вызов и ручной парсинг
-            response = await self.llm.ainvoke(messages)
-            
-            content = response.content
-            content = clean_surrogate_characters(content)  # Очищаем от суррогатных символов
-            content = re.sub(r'```json\s*', '', content)
-            content = re.sub(r'```\s*$', '', content)
-            
-            # Парсим JSON
-            try:
-                parsed = json.loads(content)
-                
-                # Конвертация thinking из dict в string если LLM вернул словарь
-                if isinstance(parsed.get('thinking'), dict):
-                    thinking_dict = parsed['thinking']
-                    parsed['thinking'] = '\n'.join([f"{k}: {v}" for k, v in thinking_dict.items()])
-                
-                result = MentorAnalysisSchema(**parsed)
-            except json.JSONDecodeError:
-                # Если JSON невалидный, пытаемся найти JSON объект в тексте
-                json_match = re.search(r'\{[\s\S]*\}', content)
-                if json_match:
-                    parsed = json.loads(json_match.group())
-                    
-                    # Конвертация thinking из dict в string если LLM вернул словарь
-                    if isinstance(parsed.get('thinking'), dict):
-                        thinking_dict = parsed['thinking']
-                        parsed['thinking'] = '\n'.join([f"{k}: {v}" for k, v in thinking_dict.items()])
-                    
-                    result = MentorAnalysisSchema(**parsed)
-                else:
-                    # даем челу на интервьюере базовые рекомендации
-                    result = MentorAnalysisSchema(
-                        thinking="Не удалось распарсить ответ",
-                        answer_type="partial",
-                        factual_errors=[],
-                        correct_info="",
-                        confidence_score=50,
-                        instruction_to_interviewer="Продолжай интервью",
-                        difficulty_level=state["current_difficulty"],
-                        topic_recommendation="общие вопросы",
-                        should_give_hint=False
-                    )
-        
+    def _default_result(self, state: "InterviewState", schema: type[SchemaT]) -> SchemaT:
+        # даем челу на интервьюере базовые рекомендации
+        return schema(
+            thinking="Не удалось распарсить ответ",
+            answer_type="partial",
+            factual_errors=[],
+            correct_info="",
+            confidence_score=50,
+            instruction_to_interviewer="Продолжай интервью",
+            difficulty_level=state["current_difficulty"],
+            topic_recommendation="общие вопросы",
+            should_give_hint=False
+        )
+    
+    def _split_result(self, result: MentorAnalysisSchema) -> tuple[MentorAnalysis, CalibrationResult, str]:
         # Формируем MentorAnalysis из схемы
         analysis = MentorAnalysis(
             answer_type=result.answer_type,
@@ -157,8 +344,131 @@ class Mentor(BaseAgent):
         
         return analysis, calibration, result.thinking
 
+    def _cache_key(self, state: "InterviewState", system_prompt: str) -> Optional[str]:
+        """Ключ кэша разбора или None, если ответ не кэшируется (кэш выключен, ответ длинный)."""
+        answer = state.get("current_user_message", "")
+        if self.cache is None or not answer or len(answer) > self.cache_max_answer_chars:
+            return None
+        question = state["turns"][-1].agent_visible_message if state["turns"] else ""
+        model = getattr(self.llm, "model", None) or self.llm._llm_type
+        return make_key(
+            normalize_text(state["position"]),
+            normalize_text(state["grade"]),
+            normalize_text(question),
+            normalize_text(answer),
+            state["current_difficulty"],
+            # правка промпта или смена модели не должны отдавать старые разборы
+            system_prompt,
+            model,
+        )
+
+    async def _cached_result(self, state: "InterviewState", key: str) -> Optional[MentorAnalysisSchema]:
+        # рекомендованная в кэше тема уже пройдена в этом интервью — такой разбор не годится
+        covered = set(state["topics_covered"])
+        value = await self.cache.aget(key, accept=lambda value: value.get("topic_recommendation") not in covered)
+        if value is None:
+            return None
+        try:
+            result = MentorAnalysisSchema(**value)
+        except ValueError:
+            return None
+        result.thinking = f"[из кэша] {result.thinking}"
+        return result
+
+    @traced("Mentor.analyze_and_calibrate")
+    async def analyze_and_calibrate(
+        self, 
+        state: "InterviewState"
+    ) -> tuple[MentorAnalysis, CalibrationResult, str]:
+        """Анализирует ответ и калибрует сложность через LangChain messages + structured output.
+        
+        Returns:
+            tuple: (MentorAnalysis, CalibrationResult, thinking)
+        """
+        system_prompt = get_mentor_system_prompt(state['position'], state['grade'])
+        cache_key = self._cache_key(state, system_prompt)
+        if cache_key is not None:
+            with span("Mentor.cache") as cache_span:
+                cached = await self._cached_result(state, cache_key)
+                if cache_span is not None:
+                    cache_span.set(hit=cached is not None)
+            if cached is not None:
+                logger.info("Mentor.analyze_and_calibrate: разбор из кэша")
+                return self._split_result(cached)
+        
+        messages = self.build_analysis_messages(state, system_prompt)
+        try:
+            call = await self._call_structured(MentorAnalysisSchema, messages, "Mentor.analyze_and_calibrate")
+            result = call.result
+        except StructuredOutputError:
+            # запасной разбор не кэшируем
+            return self._split_result(self._default_result(state, MentorAnalysisSchema))
+        
+        if cache_key is not None:
+            await self.cache.aset(cache_key, result.model_dump())
+        return self._split_result(result)
+    
+    @traced("Mentor.analyze_with_vibe")
+    async def analyze_with_vibe(
+        self, 
+        state: "InterviewState"
+    ) -> tuple[MentorAnalysis, CalibrationResult, str, UserIntentSchema]:
+        """Анализ ответа и намерение кандидата одним запросом вместо Mentor + VibeMaster.
+        
+        Returns:
+            tuple: (MentorAnalysis, CalibrationResult, thinking, UserIntentSchema)
+        """
+        system_prompt = get_combined_system_prompt(state['position'], state['grade'])
+        messages = self.build_analysis_messages(state, system_prompt)
+        
+        try:
+            call = await self._call_structured(MentorVibeSchema, messages, "Mentor.analyze_with_vibe")
+            result = call.result
+        except StructuredOutputError:
+            # как и у VibeMaster: не смогли определить намерение - продолжаем интервью
+            result = self._default_result(state, MentorVibeSchema)
+            result.vibe_thinking = "Не удалось определить намерение, продолжаем интервью по умолчанию"
+            result.emotional_state = "neutral"
+            result.confidence_level = 0
+        
+        analysis, calibration, thinking = self._split_result(result)
+        intent = result.to_intent()
+        logger.info(f"Mentor+VibeMaster: wants_to_stop={intent.wants_to_stop}, state={intent.emotional_state}")
+        return analysis, calibration, thinking, intent
+
 
 class Interviewer(BaseAgent):
+    """Агент, который ведёт диалог с кандидатом.
+    
+    Если задан банк вопросов (src/question_bank.py) и ответ кандидата не требует особой
+    реакции, следующий вопрос берётся из банка, а LLM только коротко реагирует на ответ
+    и подаёт вопрос. Сгенерированные целиком вопросы пополняют банк.
+    
+    Роль из известных списков (src/agents/roles.py) не проверяется в LLM, а приветствие
+    для неё кэшируется по (позиция, грейд) без имени кандидата: имя подставляется локально.
+    """
+    
+    # в шаблоне приветствия вместо имени; заменяется на имя кандидата при выдаче
+    NAME_PLACEHOLDER = "[ИМЯ]"
+    
+    # на эти ответы достаточно короткой реакции; уточнения, подсказки, встречные
+    # вопросы и галлюцинации требуют полной генерации с историей диалога
+    BANK_ANSWER_TYPES = ("correct", "incorrect")
+    
+    def __init__(
+        self,
+        name: str,
+        llm: BaseChatModel = None,
+        retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+        question_bank: Optional[QuestionBank] = None,
+        greeting_cache: Optional[PersistentCache] = None,
+        greeting_variants: int = GREETING_CACHE_VARIANTS,
+    ):
+        super().__init__(name, llm, retry_policy)
+        self.question_bank = question_bank if question_bank is not None else get_question_bank()
+        self.greeting_cache = greeting_cache if greeting_cache is not None else get_agent_cache("greeting")
+        self.greeting_variants = greeting_variants
+    
     def _get_user_info(self, state: "InterviewState") -> str:
         return f"""## ИНФОРМАЦИЯ О КАНДИДАТЕ
                 Имя: {state["participant_name"]}
@@ -166,59 +476,87 @@ class Interviewer(BaseAgent):
                 Уровень: {state["grade"]}
                 Опыт: {state["experience"]}"""
 
-    async def generate_greeting(self, state: "InterviewState") -> InterviewerGreetingSchema:
-        system_prompt = get_interviewer_persona(state["position"], state["grade"])
+    def _get_template_user_info(self, state: "InterviewState") -> str:
+        """Данные кандидата для шаблона приветствия: только то, что входит в ключ кэша."""
+        return f"""## ИНФОРМАЦИЯ О КАНДИДАТЕ
+                Имя: {self.NAME_PLACEHOLDER} (оставь как есть, имя подставится позже)
+                Позиция: {state["position"]}
+                Уровень: {state["grade"]}"""
+
+    def build_greeting_messages(self, state: "InterviewState", template: bool = False) -> list:
+        system_prompt = get_greeting_system_prompt(state["position"], state["grade"])
         messages = [SystemMessage(content=system_prompt)]
         
-        context = self._get_user_info(state)
-        messages.append(SystemMessage(content=context))
-        
-        greeting_request = get_greeting_prompt(state["position"], state["grade"])
+        user_info = self._get_template_user_info(state) if template else self._get_user_info(state)
+        greeting_request = get_greeting_prompt(user_info)
         messages.append(HumanMessage(content=greeting_request))
+        return messages
+
+    def _greeting_cache_key(self, state: "InterviewState") -> str:
+        model = getattr(self.llm, "model", None) or self.llm._llm_type
+        return make_key(
+            normalize_text(state["position"]),
+            normalize_text(state["grade"]),
+            # правка промпта или смена модели не должны отдавать старые приветствия
+            get_greeting_system_prompt(state["position"], state["grade"]),
+            self._get_template_user_info(state),
+            model,
+        )
+
+    @traced("Interviewer.known_role_greeting")
+    async def known_role_greeting(self, state: "InterviewState") -> Optional[StructuredCall[InterviewerGreetingSchema]]:
+        """Приветствие для роли из известных списков или None, если нужна обычная генерация.
         
-        # Используем retry логику
-        for attempt in range(MAX_RETRIES):
-            try:
-                structured_llm = self.llm.with_structured_output(
-                    InterviewerGreetingSchema,  # ← Используем схему с is_role_exists
-                    method="json_mode"
-                )
-                result = await structured_llm.ainvoke(messages)
-                return result  # Успех
-                
-            except Exception as e:
-                # Безопасное логирование с очисткой суррогатных символов
-                error_msg = clean_surrogate_characters(str(e))
-                logger.warning(f"Interviewer.generate_greeting попытка {attempt + 1}/{MAX_RETRIES} провалилась: {error_msg}")
-                
-                # Пробуем fallback
-                if attempt < MAX_RETRIES - 1:
-                    try:
-                        response = await self.llm.ainvoke(messages)
-                        content = response.content
-                        content = clean_surrogate_characters(content)  # Очищаем от суррогатных символов
-                        content = re.sub(r'```json\s*', '', content)
-                        content = re.sub(r'```\s*$', '', content)
-                        
-                        parsed = json.loads(content)
-                        
-                        # Конвертация thinking из dict в string если LLM вернул словарь
-                        if isinstance(parsed.get('thinking'), dict):
-                            thinking_dict = parsed['thinking']
-                            parsed['thinking'] = '\n'.join([f"{k}: {v}" for k, v in thinking_dict.items()])
-                        
-                        result = InterviewerGreetingSchema(**parsed)
-                        logger.info(f"Fallback парсинг успешен на попытке {attempt + 1}")
-                        return result
-                    except Exception as fallback_error:
-                        # Безопасное логирование с очисткой суррогатных символов
-                        error_msg = clean_surrogate_characters(str(fallback_error))
-                        logger.warning(f"Fallback провалился: {error_msg}")
-                        await asyncio.sleep(RETRY_DELAY)
-                        continue
-        
-        logger.error(f"Interviewer.generate_greeting: все {MAX_RETRIES} попытки провалились")
-        raise Exception(f"Failed to generate greeting after {MAX_RETRIES} attempts")
+        Роль не из IT — локальный отказ без LLM. IT-роль при включённом кэше — приветствие
+        из кэша (cached=True), а пока вариантов меньше greeting_variants, новый вариант по шаблону.
+        В кэше лежит шаблон с NAME_PLACEHOLDER, имя подставляется перед отправкой.
+        """
+        is_it_role = classify_role(state["position"])
+        if is_it_role is False:
+            greeting = InterviewerGreetingSchema(
+                thinking="Роль из списка не-IT профессий, проверка в LLM не нужна",
+                response=rejection_message(state["position"]),
+                is_role_exists=False,
+            )
+            return StructuredCall(result=greeting, attempts=0)
+        if is_it_role is None or self.greeting_cache is None:
+            return None
+        
+        key = self._greeting_cache_key(state)
+        variants = await self.greeting_cache.aget(key) or []
+        if len(variants) >= self.greeting_variants:
+            call = StructuredCall(result=InterviewerGreetingSchema(**random.choice(variants)), attempts=0, cached=True)
+        else:
+            messages = self.build_greeting_messages(state, template=True)
+            call = await self._call_structured(InterviewerGreetingSchema, messages, "Interviewer.known_role_greeting")
+            call.result.is_role_exists = True  # роль уже проверена по списку
+            # модель вписала имя вместо заглушки — шаблон уже не общий
+            name = state["participant_name"]
+            if not name or name not in call.result.response:
+                await self.greeting_cache.aset(key, variants + [call.result.model_dump()])
+        call.result.response = self._fill_name(call.result.response, state["participant_name"])
+        return call
+
+    def _fill_name(self, response: str, name: str) -> str:
+        """Подставляет имя в шаблон приветствия; без имени убирает заглушку вместе с обращением."""
+        if name:
+            return response.replace(self.NAME_PLACEHOLDER, name)
+        placeholder = re.escape(self.NAME_PLACEHOLDER)
+        return re.sub(rf"^{placeholder},?\s*|,?\s*{placeholder}", "", response).strip()
+
+    @traced("Interviewer.generate_greeting")
+    async def generate_greeting(self, state: "InterviewState") -> InterviewerGreetingSchema:
+        messages = self.build_greeting_messages(state)
+        call = await self._call_structured(InterviewerGreetingSchema, messages, "Interviewer.generate_greeting")
+        return call.result
+    
+    @traced("Interviewer.stream_greeting")
+    async def stream_greeting(
+        self, state: "InterviewState", on_text: Callable[[str], Awaitable[None]]
+    ) -> StructuredCall[InterviewerGreetingSchema]:
+        """Приветствие со стримингом поля response кандидату."""
+        messages = self.build_greeting_messages(state)
+        return await self._stream_structured(InterviewerGreetingSchema, messages, "Interviewer.stream_greeting", on_text)
 
     def _get_mentor_instructions(self, mentor_analysis: MentorAnalysis, calibration: CalibrationResult) -> str: 
         return f"""Тип ответа: {mentor_analysis.answer_type}
@@ -230,15 +568,15 @@ class Interviewer(BaseAgent):
                 Рекомендуемая тема: {calibration.topic_recommendation}
                 Нужна подсказка: {"да" if calibration.should_give_hint else "нет"}"""
         
-    async def generate_response(
+    def build_response_messages(
         self, 
         state: "InterviewState", 
         mentor_analysis: MentorAnalysis, 
         calibration: CalibrationResult
-    ) -> InterviewerResponseSchema:
-        """Генерирует ответ на основе анализа Mentor (БЕЗ валидации роли)."""
-        persona_prompt = get_interviewer_persona(state["position"], state["grade"])
-        messages = [SystemMessage(content=persona_prompt)]
+    ) -> list:
+        system_prompt = get_response_system_prompt(state["position"], state["grade"])
+        messages = [SystemMessage(content=system_prompt)]
+        messages.extend(self._summary_messages(state))
         
         recent_turns = state["turns"][-3:] if state["turns"] else []
         for turn in recent_turns:
@@ -252,54 +590,106 @@ class Interviewer(BaseAgent):
             topics_covered=state["topics_covered"]
         )
         messages.append(HumanMessage(content=response_request))
+        return messages
+    
+    @traced("Interviewer.generate_response")
+    async def generate_response_call(self, messages: list) -> StructuredCall[InterviewerResponseSchema]:
+        return await self._call_structured(InterviewerResponseSchema, messages, "Interviewer.generate_response")
         
-        # Используем retry логику
-        for attempt in range(MAX_RETRIES):
-            try:
-                structured_llm = self.llm.with_structured_output(
-                    InterviewerResponseSchema,  # ← Схема БЕЗ is_role_exists
-                    method="json_mode"
-                )
-                result = await structured_llm.ainvoke(messages)
-                logger.info(f"Interviewer.generate_response успешен")
-                return result  # Успех
-                
-            except Exception as e:
-                # Безопасное логирование с очисткой суррогатных символов
-                error_msg = clean_surrogate_characters(str(e))
-                logger.warning(f"Interviewer.generate_response попытка {attempt + 1}/{MAX_RETRIES} провалилась: {error_msg}")
-                
-                # Пробуем fallback
-                if attempt < MAX_RETRIES - 1:
-                    try:
-                        response = await self.llm.ainvoke(messages)
-                        content = response.content
-                        content = clean_surrogate_characters(content)  # Очищаем от суррогатных символов
-                        content = re.sub(r'```json\s*', '', content)
-                        content = re.sub(r'```\s*$', '', content)
-                        
-                        parsed = json.loads(content)
-                        
-                        # Конвертация thinking из dict в string если LLM вернул словарь
-                        if isinstance(parsed.get('thinking'), dict):
-                            thinking_dict = parsed['thinking']
-                            parsed['thinking'] = '\n'.join([f"{k}: {v}" for k, v in thinking_dict.items()])
-                        
-                        result = InterviewerResponseSchema(**parsed)
-                        logger.info(f"Fallback парсинг успешен на попытке {attempt + 1}")
-                        return result
-                    except Exception as fallback_error:
-                        # Безопасное логирование с очисткой суррогатных символов
-                        error_msg = clean_surrogate_characters(str(fallback_error))
-                        logger.warning(f"Fallback провалился: {error_msg}")
-                        await asyncio.sleep(RETRY_DELAY)
-                        continue
-        
-        # Все попытки провалились
-        logger.error(f"Interviewer.generate_response: все {MAX_RETRIES} попытки провалились")
-        raise Exception(f"Failed to generate response after {MAX_RETRIES} attempts")
-
-
+    async def generate_response(
+        self, 
+        state: "InterviewState", 
+        mentor_analysis: MentorAnalysis, 
+        calibration: CalibrationResult
+    ) -> InterviewerResponseSchema:
+        """Генерирует ответ на основе анализа Mentor (БЕЗ валидации роли)."""
+        messages = self.build_response_messages(state, mentor_analysis, calibration)
+        call = await self.generate_response_call(messages)
+        return call.result
+    
+    def bank_question(
+        self,
+        state: "InterviewState",
+        mentor_analysis: MentorAnalysis,
+        calibration: CalibrationResult,
+        stats: Optional[QuestionBankStats] = None,
+    ) -> Optional[str]:
+        """Вопрос из банка по теме и сложности от Mentor или None, если нужна полная генерация."""
+        if (
+            self.question_bank is None
+            or mentor_analysis.answer_type not in self.BANK_ANSWER_TYPES
+            or calibration.should_give_hint
+            or not calibration.topic_recommendation
+        ):
+            return None
+        question = self.question_bank.pick(
+            state["position"],
+            state["grade"],
+            calibration.topic_recommendation,
+            calibration.difficulty_level,
+            asked=[turn.agent_visible_message for turn in state["turns"]],
+        )
+        for counter in (self.question_bank.stats, stats):
+            if counter is not None:
+                counter.lookups += 1
+                counter.hits += int(question is not None)
+        return question
+    
+    @traced("Interviewer.ask_bank_question")
+    async def ask_bank_question(
+        self,
+        state: "InterviewState",
+        mentor_analysis: MentorAnalysis,
+        calibration: CalibrationResult,
+        question: str,
+    ) -> InterviewerResponseSchema:
+        """Короткий запрос без истории диалога: реакция на ответ + вопрос из банка."""
+        messages = [
+            SystemMessage(content=get_bank_system_prompt(state["position"], state["grade"])),
+            HumanMessage(content=get_bank_question_prompt(
+                user_message=state["current_user_message"],
+                mentor_instructions=self._get_mentor_instructions(mentor_analysis, calibration),
+                question=question,
+            )),
+        ]
+        try:
+            call = await self._call_structured(InterviewerResponseSchema, messages, "Interviewer.ask_bank_question")
+            return call.result
+        except StructuredOutputError:
+            # вопрос уже есть, задаём его как есть
+            return InterviewerResponseSchema(thinking="Вопрос из банка без перефразирования", response=question)
+    
+    async def remember_question(
+        self,
+        state: "InterviewState",
+        calibration: CalibrationResult,
+        response: str,
+        stats: Optional[QuestionBankStats] = None,
+    ) -> None:
+        """Записывает сгенерированный вопрос в банк под темой и сложностью, по которым он задан."""
+        for counter in (self.question_bank.stats, stats) if self.question_bank is not None else ():
+            if counter is not None:
+                counter.generated += 1
+        question = extract_question(response)
+        if self.question_bank is None or question is None or not calibration.topic_recommendation:
+            return
+        added = await self.question_bank.aadd(
+            state["position"], state["grade"], calibration.topic_recommendation, calibration.difficulty_level, question
+        )
+        if added and stats is not None:
+            stats.added += 1
+    
+    @traced("Interviewer.stream_response")
+    async def stream_response(
+        self, 
+        state: "InterviewState", 
+        mentor_analysis: MentorAnalysis, 
+        calibration: CalibrationResult,
+        on_text: Callable[[str], Awaitable[None]]
+    ) -> StructuredCall[InterviewerResponseSchema]:
+        """То же, что generate_response, но реплика уходит кандидату по мере генерации."""
+        messages = self.build_response_messages(state, mentor_analysis, calibration)
+        return await self._stream_structured(InterviewerResponseSchema, messages, "Interviewer.stream_response", on_text)
 
 
 class Manager(BaseAgent):
@@ -325,12 +715,22 @@ class Manager(BaseAgent):
             - Off-topic: {off_top}"""
 
 
+    @traced("Manager.generate_feedback")
     async def generate_feedback(self, state: "InterviewState") -> FinalFeedback:
-        """Генерирует фидбэк на основе полной истории с повторными попытками."""
-        system_prompt = get_manager_persona(state['position'], state['grade'])
+        """Генерирует фидбэк: краткое содержание старых ходов + дословно те, что в него не вошли."""
+        system_prompt = get_manager_system_prompt(state['position'], state['grade'])
         messages = [SystemMessage(content=system_prompt)]
+        messages.extend(self._summary_messages(state))
+        
+        summarized_turn_id = state.get("summarized_turn_id", 0)
+        for turn in state["turns"]:
+            if turn.turn_id <= summarized_turn_id:
+                continue
+            messages.append(AIMessage(content=turn.agent_visible_message))
+            if turn.user_message:
+                messages.append(HumanMessage(content=turn.user_message))
         
-        # Контекст о кандидате
+        # Контекст о кандидате меняется по ходу интервью, поэтому идёт в конце
         candidate_context = self._get_user_context(
             name=state['participant_name'],
             position=state['position'],
@@ -341,159 +741,132 @@ class Manager(BaseAgent):
             hallucinations=state['detected_hallucinations'],
             off_top=state['off_topic_attempts']
         )
-        messages.append(SystemMessage(content=candidate_context))
-        
-        for turn in state["turns"]:
-            messages.append(AIMessage(content=turn.agent_visible_message))
-            if turn.user_message:
-                messages.append(HumanMessage(content=turn.user_message))
+        messages.append(HumanMessage(content=f"{candidate_context}\n\n{get_feedback_prompt()}"))
         
-        feedback_request = get_feedback_prompt()
-        messages.append(HumanMessage(content=feedback_request))
+        call = await self._call_structured(FinalFeedbackSchema, messages, "Manager.generate_feedback")
+        result = call.result
+        logger.debug(f"Manager thinking: {result.thinking[:200]}...")
         
-        for attempt in range(MAX_RETRIES):
-            try:
-                structured_llm = self.llm.with_structured_output(
-                    FinalFeedbackSchema,
-                    method="json_mode"
-                )
-                result = await structured_llm.ainvoke(messages)
-                
-                feedback = FinalFeedback(
-                    grade=result.grade,
-                    hiring_recommendation=result.hiring_recommendation,
-                    confidence_score=result.confidence_score,
-                    confirmed_skills=result.confirmed_skills,
-                    knowledge_gaps=[
-                        {"topic": gap.topic, "question": gap.question, "correct_answer": gap.correct_answer}
-                        for gap in result.knowledge_gaps
-                    ],
-                    clarity=result.clarity,
-                    honesty=result.honesty,
-                    engagement=result.engagement,
-                    roadmap=result.roadmap
-                )
-                
-                logger.info(f"Manager.generate_feedback успешно завершён")
-                logger.debug(f"Manager thinking: {result.thinking[:200]}...")
-                return feedback
-                
-            except Exception as e:
-                # Безопасное логирование с очисткой суррогатных символов
-                error_msg = clean_surrogate_characters(str(e))
-                logger.warning(f"Manager.generate_feedback попытка {attempt + 1}/{MAX_RETRIES} провалилась: {error_msg}")
-                
-                if attempt < MAX_RETRIES - 1:
-                    try:
-                        response = await self.llm.ainvoke(messages)
-                        content = response.content
-                        content = clean_surrogate_characters(content)  # Очищаем от суррогатных символов
-                        content = re.sub(r'```json\s*', '', content)
-                        content = re.sub(r'```\s*$', '', content)
-                        
-                        parsed = json.loads(content)
-                        
-                        # Конвертация thinking из dict в string если LLM вернул словарь
-                        if isinstance(parsed.get('thinking'), dict):
-                            thinking_dict = parsed['thinking']
-                            parsed['thinking'] = '\n'.join([f"{k}: {v}" for k, v in thinking_dict.items()])
-                        
-                        result = FinalFeedbackSchema(**parsed)
-                        
-                        feedback = FinalFeedback(
-                            grade=result.grade,
-                            hiring_recommendation=result.hiring_recommendation,
-                            confidence_score=result.confidence_score,
-                            confirmed_skills=result.confirmed_skills,
-                            knowledge_gaps=[
-                                {"topic": gap.topic, "question": gap.question, "correct_answer": gap.correct_answer}
-                                for gap in result.knowledge_gaps
-                            ],
-                            clarity=result.clarity,
-                            honesty=result.honesty,
-                            engagement=result.engagement,
-                            roadmap=result.roadmap
-                        )
-                        
-                        logger.info(f"Fallback парсинг успешен на попытке {attempt + 1}")
-                        return feedback
-                    except Exception as fallback_error:
-                        # Безопасное логирование с очисткой суррогатных символов
-                        error_msg = clean_surrogate_characters(str(fallback_error))
-                        logger.warning(f"Fallback провалился: {error_msg}")
-                        await asyncio.sleep(RETRY_DELAY)
-                        continue
-        
-        logger.error(f"Manager.generate_feedback: все {MAX_RETRIES} попытки провалились")
-        raise Exception(f"Failed to generate feedback after {MAX_RETRIES} attempts")
+        return FinalFeedback(
+            grade=result.grade,
+            hiring_recommendation=result.hiring_recommendation,
+            confidence_score=result.confidence_score,
+            confirmed_skills=result.confirmed_skills,
+            knowledge_gaps=[
+                {"topic": gap.topic, "question": gap.question, "correct_answer": gap.correct_answer}
+                for gap in result.knowledge_gaps
+            ],
+            clarity=result.clarity,
+            honesty=result.honesty,
+            engagement=result.engagement,
+            roadmap=result.roadmap
+        )
 
 
 class VibeMaster(BaseAgent): # он же вайбдиллер
-    """Агент-анализатор настроения и намерений кандидата."""
+    """Агент-анализатор настроения и намерений кандидата.
     
+    Очевидные случаи решает локальный классификатор (src/agents/intent.py),
+    в LLM уходят только те, где его уверенность ниже fast_path_threshold.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        llm: BaseChatModel = None,
+        retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+        fast_path: bool = VIBE_FAST_PATH,
+        fast_path_threshold: float = VIBE_FAST_PATH_THRESHOLD,
+    ):
+        super().__init__(name, llm, retry_policy)
+        self.fast_path = fast_path
+        self.fast_path_threshold = fast_path_threshold
+        self.fast_path_stats = FastPathStats()
+    
+    def fast_intent(self, user_message: str, stats: Optional[FastPathStats] = None) -> Optional[UserIntentSchema]:
+        """Решение локального классификатора или None, если случай спорный и нужен LLM.
+        
+        stats — дополнительный счётчик быстрого пути (например, на сессию), кроме общего на агента.
+        """
+        if not self.fast_path:
+            return None
+        guess = classify_intent(user_message)
+        escalated = guess.confidence < self.fast_path_threshold
+        self.fast_path_stats.record(guess, escalated)
+        if stats is not None:
+            stats.record(guess, escalated)
+        if escalated:
+            return None
+        logger.info(f"VibeMaster (локально): wants_to_stop={guess.wants_to_stop}, signals={guess.signals}")
+        return UserIntentSchema(
+            thinking=f"Локальный классификатор: сигналы {', '.join(guess.signals)}",
+            wants_to_stop=guess.wants_to_stop,
+            stop_reason=guess.stop_reason,
+            emotional_state=guess.emotional_state,
+            confidence_level=int(guess.confidence * 100)
+        )
+    
+    @traced("VibeMaster.analyze_vibe")
     async def analyze_vibe(
         self, 
         user_message: str, 
-        conversation_context: str = ""
+        conversation_context: str = "",
+        stats: Optional[FastPathStats] = None
     ) -> UserIntentSchema:
+        with span("VibeMaster.fast_path") as fast_span:
+            local = self.fast_intent(user_message, stats)
+            if fast_span is not None:
+                fast_span.set(local=local is not None)
+        if local is not None:
+            return local
     
-        persona_prompt = get_vibemaster_persona()
-        messages = [SystemMessage(content=persona_prompt)]
+        messages = [SystemMessage(content=get_vibemaster_system_prompt())]
         
         if conversation_context:
             messages.append(AIMessage(content=conversation_context))
         
-        analysis_request = get_vibe_analysis_prompt()
-        messages.append(HumanMessage(content=f"{analysis_request}\n\nОтвет кандидата: \"{user_message}\""))
+        messages.append(HumanMessage(content=get_vibe_analysis_prompt(user_message)))
         
-        for attempt in range(MAX_RETRIES):
-            try:
-                structured_llm = self.llm.with_structured_output(
-                    UserIntentSchema,
-                    method="json_mode"
-                )
-                result = await structured_llm.ainvoke(messages)
-                
-                logger.info(f"VibeMaster: wants_to_stop={result.wants_to_stop}, state={result.emotional_state}")
-                return result
-                
-            except Exception as e:
-                # Безопасное логирование с очисткой суррогатных символов
-                error_msg = clean_surrogate_characters(str(e))
-                logger.warning(f"VibeMaster.analyze_vibe попытка {attempt + 1}/{MAX_RETRIES} провалилась: {error_msg}")
-                
-                if attempt < MAX_RETRIES - 1:
-                    try:
-                        # Fallback парсинг
-                        response = await self.llm.ainvoke(messages)
-                        content = response.content
-                        content = clean_surrogate_characters(content)  # Очищаем от суррогатных символов
-                        content = re.sub(r'```json\s*', '', content)
-                        content = re.sub(r'```\s*$', '', content)
-                        
-                        parsed = json.loads(content)
-                        
-                        # Конвертация thinking из dict в string если LLM вернул словарь
-                        if isinstance(parsed.get('thinking'), dict):
-                            thinking_dict = parsed['thinking']
-                            parsed['thinking'] = '\n'.join([f"{k}: {v}" for k, v in thinking_dict.items()])
-                        
-                        result = UserIntentSchema(**parsed)
-                        logger.info(f"Fallback успешен на попытке {attempt + 1}")
-                        return result
-                    except Exception as fallback_error:
-                        # Безопасное логирование с очисткой суррогатных символов
-                        error_msg = clean_surrogate_characters(str(fallback_error))
-                        logger.warning(f"Fallback провалился: {error_msg}")
-                        await asyncio.sleep(RETRY_DELAY)
-                        continue
-        
-        # Все попытки провалились - возвращаем дефолт (продолжаем интервью)
-        logger.error("VibeMaster: все попытки провалились, предполагаем что кандидат хочет продолжить")
-        return UserIntentSchema(
-            thinking="Не удалось определить намерение, продолжаем интервью по умолчанию",
-            wants_to_stop=False,
-            stop_reason=None,
-            emotional_state="neutral",
-            confidence_level=0
+        try:
+            call = await self._call_structured(UserIntentSchema, messages, "VibeMaster.analyze_vibe")
+        except StructuredOutputError:
+            # Все попытки провалились - возвращаем дефолт (продолжаем интервью)
+            logger.error("VibeMaster: все попытки провалились, предполагаем что кандидат хочет продолжить")
+            return UserIntentSchema(
+                thinking="Не удалось определить намерение, продолжаем интервью по умолчанию",
+                wants_to_stop=False,
+                stop_reason=None,
+                emotional_state="neutral",
+                confidence_level=0
+            )
+        
+        result = call.result
+        logger.info(f"VibeMaster: wants_to_stop={result.wants_to_stop}, state={result.emotional_state}")
+        return result
+
+
+class Summarizer(BaseAgent):
+    """Сворачивает старые ходы в краткое содержание интервью (скрыт от пользователя)."""
+    
+    def _format_turns(self, turns: list[Turn]) -> str:
+        return "\n\n".join(
+            f"Вопрос {turn.turn_id}: {turn.agent_visible_message}\nОтвет кандидата: {turn.user_message}"
+            for turn in turns
         )
+    
+    @traced("Summarizer.update_summary")
+    async def update_summary(
+        self,
+        position: str,
+        grade: str,
+        summary: str,
+        turns: list[Turn],
+        max_chars: int
+    ) -> StructuredCall[ConversationSummarySchema]:
+        messages = [
+            SystemMessage(content=get_summarizer_system_prompt(position, grade, max_chars)),
+            HumanMessage(content=get_summary_update_prompt(summary, self._format_turns(turns))),
+        ]
+        call = await self._call_structured(ConversationSummarySchema, messages, "Summarizer.update_summary")
+        logger.info(f"Summarizer: свёрнуто ходов {len(turns)}, длина {len(call.result.summary)}")
+        return call
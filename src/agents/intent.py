@@ -0,0 +1,142 @@
+"""Локальный быстрый классификатор намерения кандидата перед VibeMaster.
+
+Правила взяты из промпта VibeMaster (src/promts/vibemaster.py): прямые сигналы
+завершения, то, что НЕ является желанием завершить, и правило "2+ прямых
+сигнала -> остановка". Очевидные случаи (развёрнутый ответ по теме, "не знаю",
+"дайте подумать", явное "устал, давайте закончим") решаются за микросекунды,
+спорные уходят в LLM.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+# прямые сигналы завершения: фраза -> причина (stop_reason)
+STOP_PHRASES = {
+    r"хочу (закончить|завершить|остановиться)": "other",
+    r"давай(те)? (закончим|завершим|остановимся|заканчивать)": "other",
+    r"на этом (всё|все|хватит)": "other",
+    r"(я )?устал(а)?\b": "tired",
+    r"больше не могу": "tired",
+    r"мне некогда": "no_time",
+    r"(мне )?(нужно|надо) (идти|бежать|уходить)": "no_time",
+    r"мне пора": "no_time",
+    r"до свидания": "other",
+    r"всего (доброго|хорошего)": "other",
+    r"(я )?сдаюсь": "too_difficult",
+    r"i'?m done": "other",
+    r"\b(good)?bye\b": "other",
+    r"у меня (дела|встреча|созвон)": "no_time",
+    r"давайте перенес[её]м": "not_ready",
+    r"не готов(а)? к (такому|этому) интервью": "not_ready",
+    r"(слишком|очень) сложн\w+ для меня": "too_difficult",
+    r"заверши(ть|те) интервью": "other",
+    r"(let'?s|i want to) (stop|finish|end)": "other",
+}
+
+# короткие слова-сигналы: считаются только в коротких репликах,
+# в развёрнутом техническом ответе "end" или "достаточно" ничего не значат
+STOP_WORDS = r"\b(стоп|хватит|достаточно|всё|все|stop|finish|end|завершить|закончить)\b"
+
+# то, что по промпту VibeMaster НЕ является желанием завершить
+CONTINUE_PHRASES = [
+    r"не знаю",
+    r"не работал",
+    r"дайте (подумать|вспомнить)",
+    r"сейчас вспомню",
+    r"попробую",
+    r"если я правильно (понимаю|понял)",
+    r"(можете|можно) повторить",
+    r"не расслышал",
+    r"что вы имеете в виду",
+    r"уточните",
+    r"какой (у вас )?стек",
+    r"а какие у вас",
+]
+
+STRESS_PHRASES = [r"\bой\b", r"сложно", r"не уверен", r"волнуюсь", r"растерял"]
+# шантаж ("если не ..., то я ухожу") по промпту не остановка, но и не очевидный случай
+THREAT_PATTERN = r"если .*(то )?(я )?(уйду|ухожу)"
+
+SHORT_MESSAGE_WORDS = 12
+LONG_MESSAGE_WORDS = 25
+
+_stop_phrases = [(re.compile(pattern), reason) for pattern, reason in STOP_PHRASES.items()]
+_stop_words = re.compile(STOP_WORDS)
+_continue_phrases = [re.compile(pattern) for pattern in CONTINUE_PHRASES]
+_stress_phrases = [re.compile(pattern) for pattern in STRESS_PHRASES]
+_threat = re.compile(THREAT_PATTERN)
+
+
+@dataclass(frozen=True)
+class IntentGuess:
+    wants_to_stop: bool
+    confidence: float  # 0-1
+    stop_reason: Optional[str] = None
+    emotional_state: str = "comfortable"
+    signals: tuple = ()  # сработавшие правила, для thinking и логов
+
+
+def classify_intent(message: str) -> IntentGuess:
+    """Оценивает, хочет ли кандидат закончить интервью, без вызова LLM."""
+    text = message.lower().strip()
+    words = len(text.split())
+    emotional_state = "stressed" if any(p.search(text) for p in _stress_phrases) else "comfortable"
+
+    if _threat.search(text):
+        return IntentGuess(False, 0.3, emotional_state=emotional_state, signals=("threat",))
+
+    reasons = [reason for pattern, reason in _stop_phrases if pattern.search(text)]
+    score = float(len(reasons))
+    if words <= SHORT_MESSAGE_WORDS:
+        score += 0.5 * len(_stop_words.findall(text))
+    continue_signals = sum(1 for p in _continue_phrases if p.search(text))
+
+    if score >= 2:
+        # "2+ прямых сигнала -> wants_to_stop = true"
+        reason = reasons[0] if reasons else "other"
+        if "tired" in reasons:
+            reason, emotional_state = "tired", "tired"
+        return IntentGuess(True, 0.9, stop_reason=reason, emotional_state=emotional_state, signals=tuple(reasons))
+
+    if score == 0:
+        # нет ни одного сигнала завершения. Локально решаем только развёрнутый ответ по делу
+        # или явное "не знаю" / просьбу уточнить; короткая реплика без сигналов может быть
+        # прощанием, которого нет в списках ("ну всё, пока"), — её решает LLM
+        if words >= LONG_MESSAGE_WORDS or continue_signals:
+            return IntentGuess(False, 0.97, emotional_state=emotional_state, signals=("no_stop_signals",))
+        return IntentGuess(False, 0.6, emotional_state=emotional_state, signals=("no_signals_short",))
+
+    # один сигнал: "на этом всё" после ответа может быть и концом мысли, и концом интервью
+    confidence = 0.6 if continue_signals else 0.5
+    return IntentGuess(False, confidence, emotional_state=emotional_state, signals=tuple(reasons) or ("stop_word",))
+
+
+@dataclass
+class FastPathStats:
+    local: int = 0  # решено локально
+    escalated: int = 0  # ушло в LLM
+    local_stops: int = 0
+    by_signal: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def escalation_rate(self) -> float:
+        total = self.local + self.escalated
+        return self.escalated / total if total else 0.0
+
+    def record(self, guess: IntentGuess, escalated: bool) -> None:
+        if escalated:
+            self.escalated += 1
+        else:
+            self.local += 1
+            self.local_stops += int(guess.wants_to_stop)
+        for signal in guess.signals:
+            self.by_signal[signal] = self.by_signal.get(signal, 0) + 1
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "local": self.local,
+            "escalated": self.escalated,
+            "local_stops": self.local_stops,
+            "escalation_rate": round(self.escalation_rate, 3),
+        }
+
@@ -0,0 +1,184 @@
+"""Восстановление structured output из сырого ответа LLM.
+
+extract_json за один проход находит первый сбалансированный JSON-объект в ответе
+(markdown-обёртка, текст до и после, второй объект — пропускаются) и по пути
+чинит типичные ошибки моделей. Какие починки понадобились, возвращается вместе
+с результатом: они попадают в метрики и трассу вызова.
+"""
+import re
+from typing import Any, Dict, List, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+from src.serialization import JSONDecodeError, loads
+from src.utils import clean_surrogate_characters
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+# названия починок (метка в метриках)
+REPAIR_EXTRACTED = "extracted"  # вокруг объекта был текст или markdown-обёртка
+REPAIR_TRAILING_COMMA = "trailing_comma"
+REPAIR_SINGLE_QUOTES = "single_quotes"
+REPAIR_CONTROL_CHARS = "control_chars"  # перевод строки или таб внутри строки без экранирования
+REPAIR_INVALID_ESCAPE = "invalid_escape"  # "\d", "\s" и т.п. из регулярок в тексте
+REPAIR_PYTHON_LITERALS = "python_literals"  # True / False / None
+REPAIR_TRUNCATED = "truncated"  # ответ оборван: закрываем строку и скобки
+REPAIR_THINKING_DICT = "thinking_dict"
+
+_CLOSERS = {"{": "}", "[": "]"}
+_JSON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_VALID_ESCAPES = frozenset('"\\/bfnrtu')
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+# вне строки интересны только структурные символы и питоновские литералы, остальное копируется как есть
+_STRUCTURAL = re.compile(r"""[{}\[\]"',]|\b(?:True|False|None)\b""")
+# внутри строки — её конец, экранирование и управляющие символы
+_STRING_SPECIAL = {
+    '"': re.compile(r'["\\\x00-\x1f]'),
+    "'": re.compile(r"""['"\\\x00-\x1f]"""),
+}
+
+
+def normalize_thinking(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """Конвертация thinking из dict в string если LLM вернул словарь."""
+    if isinstance(parsed.get("thinking"), dict):
+        thinking_dict = parsed["thinking"]
+        parsed["thinking"] = "\n".join([f"{k}: {v}" for k, v in thinking_dict.items()])
+    return parsed
+
+
+def _scan_string(text: str, pos: int, quote: str, out: List[str], repairs: Dict[str, None]) -> Tuple[int, bool]:
+    """Копирует строку, начиная после открывающей кавычки, в JSON-виде (в двойных кавычках).
+
+    Возвращает позицию после закрывающей кавычки и признак, что строка закрыта.
+    """
+    special = _STRING_SPECIAL[quote]
+    out.append('"')
+    while True:
+        match = special.search(text, pos)
+        if match is None:
+            out.append(text[pos:])
+            return len(text), False
+        start = match.start()
+        out.append(text[pos:start])
+        char = text[start]
+        pos = start + 1
+        if char == quote:
+            out.append('"')
+            return pos, True
+        if char == '"':  # двойная кавычка внутри строки в одинарных
+            out.append('\\"')
+        elif char == "\\":
+            if pos >= len(text):  # оборвалось на обратном слеше
+                return pos, False
+            escaped = text[pos]
+            pos += 1
+            if escaped == "'" and quote == "'":
+                out.append("'")
+            elif escaped in _VALID_ESCAPES:
+                out.append("\\" + escaped)
+            else:
+                repairs[REPAIR_INVALID_ESCAPE] = None
+                out.append("\\\\" + escaped)
+        else:
+            repairs[REPAIR_CONTROL_CHARS] = None
+            out.append(_CONTROL_ESCAPES.get(char) or f"\\u{ord(char):04x}")
+
+
+def extract_json(content: str) -> Tuple[Any, Tuple[str, ...]]:
+    """Первый сбалансированный JSON-объект из ответа LLM и список применённых починок.
+
+    Бросает JSONDecodeError, если объекта нет или его не удалось починить.
+    """
+    start = content.find("{")
+    if start < 0:
+        raise JSONDecodeError("JSON-объект не найден", content, 0)
+    repairs: Dict[str, None] = {}  # упорядоченное множество
+    if content[:start].strip():
+        repairs[REPAIR_EXTRACTED] = None
+
+    out: List[str] = []
+    stack: List[str] = []  # ожидаемые закрывающие скобки
+    cut_points: List[Tuple[int, Tuple[str, ...]]] = []  # конец последнего целого элемента на каждой запятой
+    pending_comma = False
+    open_string = False
+    pos = start
+    end = None
+    while end is None:
+        match = _STRUCTURAL.search(content, pos)
+        if match is None:
+            gap = content[pos:]
+            if pending_comma and gap.strip():
+                out.append(",")
+                pending_comma = False
+            out.append(gap)
+            break
+        gap = content[pos:match.start()]
+        token = match.group()
+        if pending_comma and (gap.strip() or token not in "}]"):
+            out.append(",")
+            pending_comma = False
+        out.append(gap)
+        pos = match.end()
+
+        if token in _CLOSERS:
+            stack.append(_CLOSERS[token])
+            out.append(token)
+        elif token in "}]":
+            if pending_comma:
+                repairs[REPAIR_TRAILING_COMMA] = None
+                pending_comma = False
+            if stack:
+                stack.pop()
+            out.append(token)
+            if not stack:
+                end = pos
+        elif token == ",":
+            cut_points.append((len(out), tuple(stack)))
+            pending_comma = True
+        elif token in "\"'":
+            if token == "'":
+                repairs[REPAIR_SINGLE_QUOTES] = None
+            pos, closed = _scan_string(content, pos, token, out, repairs)
+            if not closed:
+                open_string = True
+                break
+        else:
+            repairs[REPAIR_PYTHON_LITERALS] = None
+            out.append(_JSON_LITERALS[token])
+
+    if end is not None:
+        if content[end:].strip():
+            repairs[REPAIR_EXTRACTED] = None
+        return loads("".join(out)), tuple(repairs)
+
+    # ответ оборван: закрываем строку и скобки; если хвост не разобрать — отрезаем до последнего целого элемента
+    repairs[REPAIR_TRUNCATED] = None
+    repairs.pop(REPAIR_EXTRACTED, None)
+    text = "".join(out) + ('"' if open_string else "")
+    try:
+        return loads(text + "".join(reversed(stack))), tuple(repairs)
+    except JSONDecodeError:
+        if not cut_points:
+            raise
+    size, cut_stack = cut_points[-1]
+    return loads("".join(out[:size]) + "".join(reversed(cut_stack))), tuple(repairs)
+
+
+def parse_raw_response(schema: type[SchemaT], content: str) -> Tuple[SchemaT, Tuple[str, ...]]:
+    """Достаёт JSON из сырого ответа, чинит его и валидирует схемой.
+
+    Возвращает объект схемы и применённые починки (пусто, если ответ был чистым JSON).
+    Бросает json.JSONDecodeError / pydantic.ValidationError если ответ не спасти.
+    """
+    content = clean_surrogate_characters(content)
+    try:
+        parsed = loads(content)
+        repairs: Tuple[str, ...] = ()
+    except JSONDecodeError:
+        parsed, repairs = extract_json(content)
+    if not isinstance(parsed, dict):
+        raise JSONDecodeError("ответ LLM не JSON-объект", content, 0)
+    if isinstance(parsed.get("thinking"), dict):
+        repairs += (REPAIR_THINKING_DICT,)
+    return schema(**normalize_thinking(parsed)), repairs
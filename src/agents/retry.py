@@ -0,0 +1,69 @@
+"""Политика повторов для вызовов LLM.
+
+Ошибки провайдера делятся на временные (таймауты, обрывы соединения,
+429 и 5xx) — их повторяем с экспоненциальной задержкой и джиттером, —
+и постоянные (400, 401, 403, ...) — их сразу пробрасываем наверх.
+Ошибки парсинга обрабатываются отдельно: сначала чиним уже полученный
+ответ, и только если не вышло — делаем новую попытку.
+"""
+import asyncio
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+MAX_RETRIES = 3
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+
+class StructuredOutputError(Exception):
+    """Не удалось получить валидный structured output за все попытки."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = MAX_RETRIES
+    base_delay: float = 0.5  # секунды перед второй попыткой
+    max_delay: float = 8.0
+    jitter: float = 0.5  # доля задержки, которая выбирается случайно
+
+    def delay(self, attempt: int) -> float:
+        """Задержка после неудачной попытки attempt (с 1)."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
+
+    async def sleep(self, attempt: int) -> None:
+        await asyncio.sleep(self.delay(attempt))
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Временная ли ошибка провайдера (имеет смысл повторить запрос)."""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+
+    try:
+        import httpx
+    except ImportError:
+        httpx = None
+
+    if httpx is not None:
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in RETRYABLE_STATUS_CODES
+        if isinstance(error, (httpx.TimeoutException, httpx.TransportError)):
+            return True
+
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return False
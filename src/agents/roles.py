@@ -0,0 +1,85 @@
+"""Локальная проверка роли кандидата перед приветствием Interviewer'а.
+
+Промпт приветствия (src/promts/interviewer.py) просит LLM сначала решить,
+существует ли роль в IT (is_role_exists). Для частых ролей ответ известен
+заранее: "Python Developer" всегда IT, "бухгалтер" никогда. Такие роли
+решаются по спискам без LLM, спорные ("React Ninja") уходят в LLM как раньше.
+Списки расширяются через ROLE_ALLOWLIST / ROLE_DENYLIST.
+"""
+import re
+from typing import Optional
+
+from src.cache import normalize_text
+from src.config import ROLE_ALLOWLIST, ROLE_DENYLIST
+
+# основа IT-роли: технология или направление
+IT_ROLE_STEMS = [
+    "python", "java", "javascript", "typescript", "go", "golang", "c", "c++", "c#", ".net", "php", "ruby",
+    "rust", "kotlin", "swift", "scala", "1с", "frontend", "backend", "fullstack", "full stack", "mobile",
+    "ios", "android", "react", "vue", "angular", "node js", "nodejs", "django", "devops", "sre", "qa",
+    "ml", "machine learning", "dba", "database", "embedded", "unity", "software",
+    "infrastructure", "cloud", "bi", "etl", "llm", "ai",
+]
+# должность, которая с технологией почти всегда IT: "X Developer", "X Engineer"
+IT_ROLE_TITLES = [
+    "developer", "engineer", "programmer", "architect", "разработчик", "программист", "инженер", "архитектор",
+]
+# должность, которая бывает и вне IT ("Sales Analyst"): IT, только если всё, кроме неё, — технологии
+GENERIC_ROLE_TITLES = [
+    "analyst", "administrator", "admin", "tester", "scientist", "аналитик", "администратор", "тестировщик",
+]
+# роли, которые IT сами по себе, без технологии
+IT_ROLES_EXACT = [
+    "devops", "sre", "qa", "qa engineer", "data scientist", "data engineer", "data analyst", "ml engineer",
+    "team lead", "tech lead", "teamlead", "techlead", "cto", "тимлид", "техлид", "frontend", "backend",
+    "fullstack", "тестировщик", "программист", "разработчик", "системный администратор", "системный аналитик",
+    "web developer", "game developer", "security engineer", "network engineer", "system administrator",
+    "system analyst", "network administrator", "platform engineer",
+]
+NON_IT_ROLES = [
+    "врач", "доктор", "юрист", "адвокат", "бухгалтер", "продавец", "продавец консультант", "водитель",
+    "повар", "официант", "бармен", "курьер", "грузчик", "кассир", "парикмахер", "учитель", "медсестра",
+    "строитель", "сантехник", "электрик", "охранник", "уборщик", "стоматолог", "пилот",
+    "doctor", "lawyer", "accountant", "driver", "cook", "chef", "waiter", "cashier", "teacher", "nurse",
+]
+
+_allowlist = {normalize_text(role) for role in IT_ROLES_EXACT + ROLE_ALLOWLIST}
+_denylist = {normalize_text(role) for role in NON_IT_ROLES + ROLE_DENYLIST}
+_stems = {normalize_text(stem) for stem in IT_ROLE_STEMS}
+_titles = re.compile(r"\b(" + "|".join(IT_ROLE_TITLES) + r")\b")
+_generic_titles = re.compile(r"\b(" + "|".join(GENERIC_ROLE_TITLES) + r")\b")
+
+
+def _without(role: str, match: re.Match) -> str:
+    return " ".join((role[:match.start()] + " " + role[match.end():]).split())
+
+
+def classify_role(position: str) -> Optional[bool]:
+    """True — роль точно IT, False — точно не IT, None — решает LLM."""
+    role = normalize_text(position)
+    if role in _denylist:
+        return False
+    if role in _allowlist:
+        return True
+    # "Python Developer", "Разработчик Python": известная технология + должность
+    title = _titles.search(role)
+    if title is not None:
+        rest = _without(role, title)
+        if set(rest.split()) & _stems or rest in _stems:
+            return True
+    # "QA Tester", "BI Analyst"; "Sales Data Analyst" и "Data Entry Administrator" решает LLM
+    title = _generic_titles.search(role)
+    if title is not None:
+        rest = _without(role, title)
+        if rest and (rest in _stems or set(rest.split()) <= _stems):
+            return True
+    return None
+
+
+def rejection_message(position: str) -> str:
+    """Отказ для роли из denylist — то же, что по промпту вернула бы LLM."""
+    return (
+        f"Здравствуйте! К сожалению, позиция «{position}» не относится к IT-профессиям, "
+        "а я провожу только технические интервью. Если вы хотели пройти интервью на IT-позицию, "
+        "перезапустите сессию и укажите её, например: Python Developer, QA Engineer, DevOps Engineer."
+    )
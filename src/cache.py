@@ -0,0 +1,199 @@
+"""Персистентный кэш результатов агентов в SQLite: LRU + TTL.
+
+Кандидаты на одну позицию часто отвечают почти одинаково ("не знаю",
+определение из учебника), а результат разбора такого ответа от сессии
+к сессии не меняется. Кэш переживает перезапуск процесса и общий для всех
+сессий: обращения сериализуются блокировкой и идут в отдельном потоке,
+файл в режиме WAL можно открыть и из нескольких процессов.
+
+Записи живут не дольше ttl_seconds, при превышении max_entries вытесняются
+давно не читанные. Значения — JSON.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from src.config import AGENT_CACHE_DB, AGENT_CACHE_MAX_ENTRIES, AGENT_CACHE_TTL_SECONDS
+from src.metrics import get_metrics
+from src.serialization import dumps_str, loads
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS cache_lru ON cache (namespace, accessed_at);
+"""
+
+# при переполнении вытесняем с запасом, чтобы не чистить на каждой записи
+EVICTION_SLACK = 0.1
+
+_punctuation = re.compile(r"[^\w\s]")
+
+
+def normalize_text(text: str) -> str:
+    """Регистр, ё/е, пунктуация и пробелы не влияют на ключ."""
+    text = _punctuation.sub(" ", text.lower().replace("ё", "е"))
+    return " ".join(text.split())
+
+
+def make_key(*parts: Any) -> str:
+    # stdlib json, а не src.serialization: у orjson другие пробелы, ключи уже сохранённых записей сменились бы
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0  # найдено, но старше TTL (входит в misses)
+    rejected: int = 0  # найдено, но не подошло по контексту (входит в misses)
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {**vars(self), "hit_rate": round(self.hit_rate, 3)}
+
+
+class PersistentCache:
+    """Одно пространство ключей (namespace) в общем файле кэша."""
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        max_entries: int = AGENT_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = AGENT_CACHE_TTL_SECONDS,
+    ):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        dir_path = os.path.dirname(path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._size = self._count()
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)).fetchone()[0]
+
+    def _record(self, outcome: str) -> None:
+        get_metrics().cache_requests.inc(self.namespace, outcome)
+
+    def get(self, key: str, accept: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """Значение по ключу или None. accept может отклонить найденное значение (считается промахом)."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+                self._size -= 1
+                self.stats.expired += 1
+                row = None
+            elif row is not None:
+                self._conn.execute(
+                    "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?", (now, self.namespace, key)
+                )
+
+        # разбор и accept — вне блокировки, счётчики — под ней: get идёт из потоков aget
+        value = loads(row[0]) if row is not None else None
+        rejected = value is not None and accept is not None and not accept(value)
+        if rejected:
+            value = None
+        with self._lock:
+            if rejected:
+                self.stats.rejected += 1
+            if value is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+        self._record("miss" if value is None else "hit")
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        data = dumps_str(value)
+        with self._lock, self._conn:
+            updated = self._conn.execute(
+                "UPDATE cache SET value = ?, created_at = ?, accessed_at = ? WHERE namespace = ? AND key = ?",
+                (data, now, now, self.namespace, key),
+            ).rowcount
+            if not updated:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)", (self.namespace, key, data, now, now)
+                )
+                self._size += 1
+            if self._size > self.max_entries:
+                self._evict(now)
+            self.stats.writes += 1
+
+    def _evict(self, now: float) -> None:
+        """Сначала истёкшие записи, затем давно не читанные (вызывается под блокировкой)."""
+        self._conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND created_at < ?", (self.namespace, now - self.ttl_seconds)
+        )
+        size = self._count()  # файл мог менять и другой процесс
+        excess = size - int(self.max_entries * (1 - EVICTION_SLACK))
+        if excess > 0 and size > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key IN "
+                "(SELECT key FROM cache WHERE namespace = ? ORDER BY accessed_at LIMIT ?)",
+                (self.namespace, self.namespace, excess),
+            )
+        self._size = self._count()
+        self.stats.evictions += max(0, size - self._size)
+
+    async def aget(self, key: str, accept: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        return await asyncio.to_thread(self.get, key, accept)
+
+    async def aset(self, key: str, value: Any) -> None:
+        await asyncio.to_thread(self.set, key, value)
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+            self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"PersistentCache(namespace='{self.namespace}', size={self._size}, hit_rate={self.stats.hit_rate:.2f})"
+
+
+_caches: Dict[str, PersistentCache] = {}
+
+
+def get_agent_cache(namespace: str) -> Optional[PersistentCache]:
+    """Кэш агента в общем файле AGENT_CACHE_DB; None, если кэш выключен."""
+    if not AGENT_CACHE_DB:
+        return None
+    cache = _caches.get(namespace)
+    if cache is None:
+        cache = _caches[namespace] = PersistentCache(AGENT_CACHE_DB, namespace)
+    return cache
@@ -0,0 +1,417 @@
+"""Долговечные чекпоинты графа интервью в локальной SQLite.
+
+LangGraph сохраняет чекпоинт после каждого узла, ключ — thread_id, то есть
+session_id (см. make_config). Пишутся только изменившиеся каналы state
+(new_versions), а канал, чьё значение не поменялось с прошлой записи, хранится
+ссылкой на уже записанную версию, а не ещё одной копией. Все обращения к SQLite
+идут в отдельном потоке, event loop их не ждёт.
+
+Упавшее интервью продолжается с последнего завершённого узла
+(python main.py --resume <session_id>): завершённые вызовы LLM не повторяются.
+"""
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.config import CHECKPOINT_DB
+from src.structs.structs import Turn
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    created_at REAL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    blob BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+# классы из state, которые разрешено восстанавливать из чекпоинта
+STATE_TYPES = [("src.structs.structs", "Turn"), ("src.structs.structs", "QuestionResult")]
+
+def migrate_channel(channel: str, value: Any) -> Any:
+    """Приводит значение канала из чекпоинта промежуточной модели state к текущей.
+
+    Какое-то время Turn хранил мысли списком пар thoughts: сериализатор не может вызвать
+    с ним текущий конструктор и отдаёт поля словарём. topics_covered тогда был dict.
+    """
+    if channel == "turns" and isinstance(value, list):
+        return [turn if isinstance(turn, Turn) else _turn_from_fields(turn) for turn in value]
+    if channel == "topics_covered" and isinstance(value, dict):
+        return list(value)
+    return value
+
+
+def _turn_from_fields(fields: Dict[str, Any]) -> Turn:
+    fields = dict(fields)
+    thoughts = fields.pop("thoughts", None)
+    if thoughts is not None:
+        fields["internal_thoughts"] = "\n".join(f"[{agent}]: {thought}" for agent, thought in thoughts)
+    return Turn(**fields)
+
+
+# значение канала не изменилось: в blob лежит версия, где хранится само значение
+REF_TYPE = "ref"
+
+# для скольких последних тредов помним хеши каналов; у вытесненного треда следующая
+# запись просто уйдёт значением, а не ссылкой
+LAST_BLOBS_MAX_THREADS = 1024
+
+
+@dataclass
+class CheckpointStats:
+    puts: int = 0
+    writes: int = 0
+    seconds: float = 0.0  # время записи в SQLite (чекпоинты и pending writes)
+    bytes: int = 0
+    channels_written: int = 0  # каналы, записанные значением
+    channels_reused: int = 0  # каналы, записанные ссылкой на прошлую версию
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "puts": self.puts,
+            "writes": self.writes,
+            "seconds": round(self.seconds, 4),
+            "bytes": self.bytes,
+            "channels_written": self.channels_written,
+            "channels_reused": self.channels_reused,
+        }
+
+
+def _thread_keys(config: RunnableConfig) -> Tuple[str, str]:
+    configurable = config["configurable"]
+    return str(configurable["thread_id"]), configurable.get("checkpoint_ns", "")
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver[int]):
+    """Чекпоинты LangGraph в одном файле SQLite (WAL), общий на все сессии процесса."""
+
+    def __init__(self, path: str = CHECKPOINT_DB, *, serde=None):
+        super().__init__(serde=serde or JsonPlusSerializer(allowed_msgpack_modules=STATE_TYPES))
+        self.path = path
+        dir_path = os.path.dirname(path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        # (thread_id, ns) -> {channel: (версия со значением, хеш значения)}, LRU по тредам:
+        # брошенные и упавшие сессии не удаляют свой тред, и без предела словарь рос бы вечно
+        self._last_blobs: "OrderedDict[Tuple[str, str], Dict[str, Tuple[str, bytes]]]" = OrderedDict()
+        self._last_blobs_lock = threading.Lock()
+        self.stats = CheckpointStats()
+
+    # --- чтение ---
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id, checkpoint_ns = _thread_keys(config)
+        checkpoint_id = get_checkpoint_id(config)
+        with self._lock:
+            if checkpoint_id:
+                row = self._conn.execute(
+                    "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+                    "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+                    "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            return self._load_tuple(thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "type, checkpoint, metadata_type, metadata FROM checkpoints"
+        )
+        where: List[str] = []
+        params: List[Any] = []
+        if config is not None:
+            thread_id, checkpoint_ns = _thread_keys(config)
+            where += ["thread_id = ?", "checkpoint_ns = ?"]
+            params += [thread_id, checkpoint_ns]
+        if before is not None and get_checkpoint_id(before):
+            where.append("checkpoint_id < ?")
+            params.append(get_checkpoint_id(before))
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+            results = []
+            for thread_id, checkpoint_ns, *row in rows:
+                checkpoint_tuple = self._load_tuple(thread_id, checkpoint_ns, row)
+                if filter and any(checkpoint_tuple.metadata.get(k) != v for k, v in filter.items()):
+                    continue
+                results.append(checkpoint_tuple)
+                if limit is not None and len(results) >= limit:
+                    break
+        yield from results
+
+    def _load_tuple(self, thread_id: str, checkpoint_ns: str, row: Sequence[Any]) -> CheckpointTuple:
+        checkpoint_id, parent_id, type_, checkpoint_blob, metadata_type, metadata_blob = row
+        checkpoint: Checkpoint = self.serde.loads_typed((type_, checkpoint_blob))
+        writes = self._conn.execute(
+            "SELECT task_id, channel, type, blob FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={"configurable": {
+                "thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id,
+            }},
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_blobs(thread_id, checkpoint_ns, checkpoint["channel_versions"]),
+            },
+            metadata=self.serde.loads_typed((metadata_type, metadata_blob)),
+            parent_config={"configurable": {
+                "thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id,
+            }} if parent_id else None,
+            pending_writes=[
+                (task_id, channel, migrate_channel(channel, self.serde.loads_typed((type_, blob))))
+                for task_id, channel, type_, blob in writes
+            ],
+        )
+
+    def _load_blobs(self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        for channel, version in versions.items():
+            row = self._blob(thread_id, checkpoint_ns, channel, str(version))
+            if row is not None and row[0] == REF_TYPE:
+                row = self._blob(thread_id, checkpoint_ns, channel, row[1].decode())
+            if row is not None and row[0] != "empty":
+                values[channel] = migrate_channel(channel, self.serde.loads_typed(row))
+        return values
+
+    def _blob(self, thread_id: str, checkpoint_ns: str, channel: str, version: str) -> Optional[Tuple[str, bytes]]:
+        return self._conn.execute(
+            "SELECT type, blob FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+            (thread_id, checkpoint_ns, channel, version),
+        ).fetchone()
+
+    # --- запись ---
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        started = time.perf_counter()
+        thread_id, checkpoint_ns = _thread_keys(config)
+        parent_id = config["configurable"].get("checkpoint_id")
+        stored = checkpoint.copy()
+        values = stored.pop("channel_values")
+
+        blobs = []
+        reused = 0
+        last_blobs = self._thread_blobs(thread_id, checkpoint_ns)
+        for channel, version in new_versions.items():
+            version = str(version)
+            if channel not in values:
+                blobs.append((thread_id, checkpoint_ns, channel, version, "empty", None))
+                continue
+            type_, blob = self.serde.dumps_typed(values[channel])
+            digest = hashlib.blake2b(blob, digest_size=16).digest()
+            last = last_blobs.get(channel)
+            if last is not None and last[1] == digest:
+                # узел вернул канал целиком, но значение то же: пишем только ссылку
+                blobs.append((thread_id, checkpoint_ns, channel, version, REF_TYPE, last[0].encode()))
+                reused += 1
+            else:
+                blobs.append((thread_id, checkpoint_ns, channel, version, type_, blob))
+                last_blobs[channel] = (version, digest)
+
+        type_, checkpoint_blob = self.serde.dumps_typed(stored)
+        metadata_type, metadata_blob = self.serde.dumps_typed(metadata)
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)", blobs)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (thread_id, checkpoint_ns, checkpoint["id"], parent_id, type_, checkpoint_blob,
+                 metadata_type, metadata_blob, time.time()),
+            )
+            if parent_id:
+                # pending writes родителя уже вошли в этот чекпоинт
+                self._conn.execute(
+                    "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, parent_id),
+                )
+
+        self.stats.puts += 1
+        self.stats.seconds += time.perf_counter() - started
+        self.stats.bytes += len(checkpoint_blob) + sum(len(row[-1] or b"") for row in blobs)
+        self.stats.channels_written += len(blobs) - reused
+        self.stats.channels_reused += reused
+        return {"configurable": {
+            "thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"],
+        }}
+
+    def _thread_blobs(self, thread_id: str, checkpoint_ns: str) -> Dict[str, Tuple[str, bytes]]:
+        with self._last_blobs_lock:
+            key = (thread_id, checkpoint_ns)
+            last_blobs = self._last_blobs.get(key)
+            if last_blobs is None:
+                last_blobs = self._last_blobs[key] = {}
+                if len(self._last_blobs) > LAST_BLOBS_MAX_THREADS:
+                    self._last_blobs.popitem(last=False)
+            else:
+                self._last_blobs.move_to_end(key)
+            return last_blobs
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        started = time.perf_counter()
+        thread_id, checkpoint_ns = _thread_keys(config)
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = [
+            (thread_id, checkpoint_ns, checkpoint_id, task_id, WRITES_IDX_MAP.get(channel, idx), channel,
+             *self.serde.dumps_typed(value), task_path)
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        # специальные каналы (ошибка, interrupt) перезаписываются, обычные записи — только один раз
+        verb = "INSERT OR REPLACE" if all(channel in WRITES_IDX_MAP for channel, _ in writes) else "INSERT OR IGNORE"
+        with self._lock, self._conn:
+            self._conn.executemany(f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+        self.stats.writes += 1
+        self.stats.seconds += time.perf_counter() - started
+        self.stats.bytes += sum(len(row[7] or b"") for row in rows)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock, self._conn:
+            for table in ("checkpoints", "blobs", "writes"):
+                self._conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (str(thread_id),))
+        self.forget_thread(thread_id)
+
+    def forget_thread(self, thread_id: str) -> None:
+        """Забывает хеши каналов треда, не трогая сами чекпоинты (сессию можно продолжить через --resume)."""
+        with self._last_blobs_lock:
+            for key in [key for key in self._last_blobs if key[0] == str(thread_id)]:
+                del self._last_blobs[key]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # --- async: тот же код в отдельном потоке ---
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoints = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in checkpoints:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def __repr__(self) -> str:
+        return f"SqliteCheckpointSaver(path='{self.path}', puts={self.stats.puts})"
+
+
+_checkpointer: Optional[SqliteCheckpointSaver] = None
+
+
+def get_checkpointer() -> Optional[SqliteCheckpointSaver]:
+    """Общий чекпоинтер процесса; None, если CHECKPOINT_DB пустой."""
+    global _checkpointer
+    if _checkpointer is None and CHECKPOINT_DB:
+        _checkpointer = SqliteCheckpointSaver(CHECKPOINT_DB)
+    return _checkpointer
@@ -0,0 +1,182 @@
+"""Общий для процесса реестр LLM-клиентов.
+
+Все агенты и все сессии используют один ChatMistralAI на модель и один
+keep-alive пул HTTP-соединений на хост, поэтому параллельные вызовы
+Mentor + VibeMaster и соседние интервью переиспользуют тёплые TLS-соединения.
+Глобальный семафор ограничивает число запросов к провайдеру в полёте.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from src.config import (
+    FAKE_LLM_LATENCY,
+    LLM_BACKEND,
+    LLM_KEEPALIVE_EXPIRY,
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_CONNECTIONS_PER_HOST,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_TIMEOUT,
+    MISTRAL_TOKEN,
+)
+
+if TYPE_CHECKING:
+    # httpx и langchain импортируются при создании реестра и первого клиента, а не при импорте модуля
+    import httpx
+    from langchain_core.language_models import BaseChatModel
+
+MISTRAL_ENDPOINT = "https://api.mistral.ai/v1"
+
+
+@dataclass
+class PoolStats:
+    requests: int = 0  # HTTP-запросов ушло через общие пулы
+    responses: int = 0
+    errors: int = 0  # ответы со статусом >= 400
+    in_flight: int = 0  # вызовов LLM сейчас внутри семафора
+    peak_in_flight: int = 0
+    acquired: int = 0
+    waited: int = 0  # сколько вызовов ждали свободного слота
+    wait_seconds: float = 0.0
+
+
+class LLMClientRegistry:
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_connections_per_host: int = LLM_MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_connections: int = LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = LLM_KEEPALIVE_EXPIRY,
+        timeout: float = LLM_TIMEOUT,
+    ):
+        import httpx
+
+        self.max_concurrency = max_concurrency
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.stats = PoolStats()
+        self._models: Dict[str, "BaseChatModel"] = {}
+        self._http_clients: Dict[str, "httpx.AsyncClient"] = {}  # хост -> пул соединений
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get_llm(self, model: str) -> "BaseChatModel":
+        """Один экземпляр модели на процесс."""
+        llm = self._models.get(model)
+        if llm is None:
+            llm = self._build_llm(model)
+            self._models[model] = llm
+        return llm
+
+    def _build_llm(self, model: str) -> "BaseChatModel":
+        if LLM_BACKEND == "fake":
+            from src.fake_llm import ScriptedChatModel
+            return ScriptedChatModel(latency=FAKE_LLM_LATENCY)
+
+        from langchain_mistralai import ChatMistralAI
+        return ChatMistralAI(
+            model=model,
+            api_key=MISTRAL_TOKEN,
+            temperature=0,
+            endpoint=MISTRAL_ENDPOINT,
+            timeout=int(self.timeout),
+            async_client=self.http_client(MISTRAL_ENDPOINT, headers={
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+                "Authorization": f"Bearer {MISTRAL_TOKEN}",
+            }),
+        )
+
+    def http_client(self, base_url: str, headers: Optional[Dict[str, str]] = None) -> "httpx.AsyncClient":
+        """Общий keep-alive пул на хост."""
+        host = urlsplit(base_url).netloc
+        client = self._http_clients.get(host)
+        if client is None:
+            import httpx
+
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                headers=headers,
+                timeout=self.timeout,
+                limits=self.limits,
+                event_hooks={"request": [self._on_request], "response": [self._on_response]},
+            )
+            self._http_clients[host] = client
+        return client
+
+    async def _on_request(self, request: "httpx.Request") -> None:
+        self.stats.requests += 1
+
+    async def _on_response(self, response: "httpx.Response") -> None:
+        self.stats.responses += 1
+        if response.status_code >= 400:
+            self.stats.errors += 1
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # семафор привязывается к event loop, поэтому пересоздаём его при смене цикла
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    @asynccontextmanager
+    async def slot(self):
+        """Слот на один запрос к провайдеру в рамках глобального лимита."""
+        semaphore = self._get_semaphore()
+        if semaphore.locked():
+            self.stats.waited += 1
+            started = time.perf_counter()
+            await semaphore.acquire()
+            self.stats.wait_seconds += time.perf_counter() - started
+        else:
+            await semaphore.acquire()
+        self.stats.acquired += 1
+        self.stats.in_flight += 1
+        self.stats.peak_in_flight = max(self.stats.peak_in_flight, self.stats.in_flight)
+        try:
+            yield
+        finally:
+            self.stats.in_flight -= 1
+            semaphore.release()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Статистика семафора и пулов соединений."""
+        result: Dict[str, Any] = asdict(self.stats)
+        hosts = {}
+        for host, client in self._http_clients.items():
+            # httpcore не даёт публичного API на всём пути, поэтому аккуратно через getattr
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            connections = getattr(pool, "connections", []) or []
+            hosts[host] = {
+                "connections": len(connections),
+                "idle": sum(1 for connection in connections if connection.is_idle()),
+            }
+        result["hosts"] = hosts
+        return result
+
+    async def aclose(self) -> None:
+        for client in self._http_clients.values():
+            await client.aclose()
+        self._http_clients.clear()
+        self._models.clear()
+
+    def __repr__(self) -> str:
+        return f"LLMClientRegistry(models={list(self._models)}, max_concurrency={self.max_concurrency})"
+
+
+_registry: Optional[LLMClientRegistry] = None
+
+
+def get_client_registry() -> LLMClientRegistry:
+    global _registry
+    if _registry is None:
+        _registry = LLMClientRegistry()
+    return _registry
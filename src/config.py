@@ -4,3 +4,62 @@ from dotenv import load_dotenv
 load_dotenv() 
 
 MISTRAL_TOKEN: str = os.getenv("MISTRAL_KEY")
+
+# mistral | fake (офлайн ScriptedChatModel для бенчмарков и CI)
+LLM_BACKEND: str = os.getenv("LLM_BACKEND", "mistral")
+FAKE_LLM_LATENCY: float = float(os.getenv("FAKE_LLM_LATENCY", "0"))
+
+# общий пул клиентов LLM (src/clients.py)
+LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "64"))
+LLM_MAX_CONNECTIONS_PER_HOST: int = int(os.getenv("LLM_MAX_CONNECTIONS_PER_HOST", "32"))
+LLM_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "16"))
+LLM_KEEPALIVE_EXPIRY: float = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "120"))
+
+# спекулятивная генерация следующего вопроса Interviewer'а (src/speculation.py)
+SPECULATIVE_INTERVIEWER: bool = os.getenv("SPECULATIVE_INTERVIEWER", "0") == "1"
+
+# стриминг реплик Interviewer'а кандидату по мере генерации (src/streaming.py)
+STREAM_RESPONSES: bool = os.getenv("STREAM_RESPONSES", "1") == "1"
+
+# сжатая память интервью (src/memory.py): старые ходы сворачиваются в краткое содержание в фоне;
+# выключена по умолчанию — это дополнительные запросы Summarizer'а и другая история в промптах
+SUMMARY_MEMORY: bool = os.getenv("SUMMARY_MEMORY", "0") == "1"
+SUMMARY_RECENT_TURNS: int = int(os.getenv("SUMMARY_RECENT_TURNS", "3"))  # сколько последних ходов идут дословно
+SUMMARY_MAX_CHARS: int = int(os.getenv("SUMMARY_MAX_CHARS", "2000"))
+
+# локальный классификатор намерения перед VibeMaster (src/agents/intent.py):
+# случаи с уверенностью не ниже порога решаются без вызова LLM
+VIBE_FAST_PATH: bool = os.getenv("VIBE_FAST_PATH", "1") == "1"
+VIBE_FAST_PATH_THRESHOLD: float = float(os.getenv("VIBE_FAST_PATH_THRESHOLD", "0.85"))
+
+# один совмещённый запрос Mentor+VibeMaster на ответ кандидата вместо двух параллельных
+COMBINED_ANALYSIS: bool = os.getenv("COMBINED_ANALYSIS", "0") == "1"
+
+# метрики (src/metrics.py): цена за 1M токенов для оценки стоимости и файл для экспорта в Prometheus
+LLM_PRICE_INPUT_PER_1M: float = float(os.getenv("LLM_PRICE_INPUT_PER_1M", "2.0"))
+LLM_PRICE_OUTPUT_PER_1M: float = float(os.getenv("LLM_PRICE_OUTPUT_PER_1M", "6.0"))
+METRICS_FILE: str = os.getenv("METRICS_FILE", "")
+
+# трейсинг (src/tracing.py): каталог для трасс сессий (пусто — выключено) и формат chrome | jsonl
+TRACE_DIR: str = os.getenv("TRACE_DIR", "")
+TRACE_FORMAT: str = os.getenv("TRACE_FORMAT", "chrome")
+
+# чекпоинты графа в SQLite для возобновления упавших интервью (src/checkpoint.py); пусто — выключено
+CHECKPOINT_DB: str = os.getenv("CHECKPOINT_DB", "checkpoints/interviews.sqlite")
+
+# персистентный кэш результатов агентов (src/cache.py): файл SQLite (пусто — выключено), размер и время жизни записей
+AGENT_CACHE_DB: str = os.getenv("AGENT_CACHE_DB", "")
+AGENT_CACHE_MAX_ENTRIES: int = int(os.getenv("AGENT_CACHE_MAX_ENTRIES", "20000"))
+AGENT_CACHE_TTL_SECONDS: float = float(os.getenv("AGENT_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+# разбор Mentor кэшируется только для коротких ответов: длинные почти не повторяются
+MENTOR_CACHE_MAX_ANSWER_CHARS: int = int(os.getenv("MENTOR_CACHE_MAX_ANSWER_CHARS", "300"))
+# приветствия для известных ролей кэшируются по (позиция, грейд) в нескольких вариантах первого вопроса
+GREETING_CACHE_VARIANTS: int = int(os.getenv("GREETING_CACHE_VARIANTS", "3"))
+
+# дополнительные роли для локальной проверки (src/agents/roles.py), через запятую
+ROLE_ALLOWLIST: list = [role.strip() for role in os.getenv("ROLE_ALLOWLIST", "").split(",") if role.strip()]
+ROLE_DENYLIST: list = [role.strip() for role in os.getenv("ROLE_DENYLIST", "").split(",") if role.strip()]
+
+# банк вопросов Interviewer'а (src/question_bank.py): JSONL-файл (пусто — выключено)
+QUESTION_BANK_PATH: str = os.getenv("QUESTION_BANK_PATH", "")
@@ -0,0 +1,245 @@
+"""Детерминированная офлайн-замена Mistral для бенчмарков и прогонов без сети.
+
+ScriptedChatModel по тексту промпта понимает, какой агент его вызывает,
+и возвращает валидный JSON для соответствующей схемы из src/structs/schemas.py.
+Задержка на вызов и на токен ответа настраиваются, статистика вызовов
+(количество, размеры промптов и ответов) копится в stats.
+"""
+import asyncio
+import json
+import re
+import time
+from operator import itemgetter
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableMap, RunnablePassthrough
+from pydantic import Field
+
+# маркеры из форматов ответа в промптах -> тип запроса; порядок важен
+KIND_MARKERS = [
+    ('"vibe_thinking"', "combined"),
+    ('"is_role_exists"', "greeting"),
+    ('"hiring_recommendation"', "feedback"),
+    ('"wants_to_stop"', "vibe"),
+    ('"answer_type"', "mentor"),
+    ('"summary"', "summary"),
+    ('"response"', "interviewer"),
+]
+
+MENTOR_ANSWER_TYPES = ["correct", "partial", "correct", "incorrect"]
+# текущая сложность из запроса на анализ (src/promts/mentor.py): по ней Mentor калибрует следующую
+_CURRENT_DIFFICULTY = re.compile(r"Текущий уровень сложности: (\d)/5")
+
+
+def estimate_tokens(text: str) -> int:
+    """Грубая оценка числа токенов (~4 символа на токен)."""
+    return max(1, len(text) // 4)
+
+
+def detect_kind(messages: List[BaseMessage]) -> str:
+    text = "\n".join(str(message.content) for message in messages)
+    for marker, kind in KIND_MARKERS:
+        if marker in text:
+            return kind
+    return "unknown"
+
+
+class ScriptedChatModel(BaseChatModel):
+    """BaseChatModel без сети: сценарные или сгенерированные по умолчанию JSON-ответы."""
+
+    latency: float = 0.0  # секунды на вызов (время до первого токена)
+    token_latency: float = 0.0  # секунды на каждый токен ответа
+    prompt_token_latency: float = 0.0  # секунды на каждый токен промпта (prefill)
+    thinking_words: int = 20  # длина "thinking" в словах, управляет числом выходных токенов
+    # сценарий: тип запроса -> список payload'ов, выдаются по кругу; строка отдаётся как есть (сырой ответ)
+    script: Dict[str, List[Union[Dict[str, Any], str]]] = Field(default_factory=dict)
+    stats: Dict[str, Dict[str, float]] = Field(default_factory=dict)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _thinking(self, kind: str, n: int) -> str:
+        return f"[{kind} #{n}] " + " ".join(["рассуждение"] * self.thinking_words)
+
+    def _default_payload(self, kind: str, n: int, current_difficulty: Optional[int] = None) -> Dict[str, Any]:
+        if kind == "greeting":
+            return {
+                "thinking": self._thinking(kind, n),
+                "response": "Здравствуйте! Я технический интервьюер. Первый вопрос: что такое GIL?",
+                "is_role_exists": True,
+            }
+        if kind == "mentor":
+            answer_type = MENTOR_ANSWER_TYPES[n % len(MENTOR_ANSWER_TYPES)]
+            difficulty = 1 + n % 5
+            if current_difficulty is not None:
+                # правило калибровки из промпта Mentor: верно -> +1, иначе -1
+                step = 1 if answer_type == "correct" else -1
+                difficulty = min(5, max(1, current_difficulty + step))
+            return {
+                "thinking": self._thinking(kind, n),
+                "answer_type": answer_type,
+                "factual_errors": [] if answer_type == "correct" else [f"ошибка {n}"],
+                "correct_info": "" if answer_type == "correct" else f"правильный ответ {n}",
+                "confidence_score": 85,
+                "instruction_to_interviewer": "Задай следующий вопрос",
+                "difficulty_level": difficulty,
+                "topic_recommendation": f"тема {n}",
+                "should_give_hint": answer_type == "incorrect",
+            }
+        if kind == "combined":
+            vibe = self._default_payload("vibe", n)
+            return {
+                **self._default_payload("mentor", n, current_difficulty),
+                "vibe_thinking": vibe.pop("thinking"),
+                **vibe,
+            }
+        if kind == "vibe":
+            return {
+                "thinking": self._thinking(kind, n),
+                "wants_to_stop": False,
+                "stop_reason": None,
+                "emotional_state": "comfortable",
+                "confidence_level": 90,
+            }
+        if kind == "feedback":
+            return {
+                "thinking": self._thinking(kind, n),
+                "grade": "Middle",
+                "hiring_recommendation": "Hire",
+                "confidence_score": 80,
+                "confirmed_skills": ["Python", "SQL"],
+                "knowledge_gaps": [
+                    {"topic": "asyncio", "question": "Что такое event loop?", "correct_answer": "Цикл событий"}
+                ],
+                "clarity": "хорошо",
+                "honesty": "честный",
+                "engagement": "высокая",
+                "roadmap": ["asyncio", "профилирование"],
+            }
+        if kind == "summary":
+            return {
+                "thinking": self._thinking(kind, n),
+                "summary": f"Обсудили темы 1-{n + 1}: кандидат отвечал в основном верно, путался в деталях asyncio.",
+            }
+        if kind == "interviewer":
+            return {
+                "thinking": self._thinking(kind, n),
+                "response": f"Хорошо. Вопрос №{n + 1}: расскажите про тему {n + 1}?",
+            }
+        return {"thinking": self._thinking(kind, n), "response": "ok"}
+
+    def _next_content(self, messages: List[BaseMessage]) -> tuple[Dict[str, float], str]:
+        kind = detect_kind(messages)
+        kind_stats = self.stats.setdefault(
+            kind, {"calls": 0, "prompt_chars": 0, "output_chars": 0, "llm_seconds": 0.0}
+        )
+        n = int(kind_stats["calls"])
+        scripted = self.script.get(kind)
+        if scripted:
+            payload = scripted[n % len(scripted)]
+        else:
+            match = _CURRENT_DIFFICULTY.search(str(messages[-1].content)) if messages else None
+            payload = self._default_payload(kind, n, int(match.group(1)) if match else None)
+        content = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)
+
+        kind_stats["calls"] += 1
+        kind_stats["prompt_chars"] += sum(len(str(message.content)) for message in messages)
+        kind_stats["output_chars"] += len(content)
+        # счётчики типа, а не ключ: reset_stats() во время фонового вызова не должен его ронять
+        return kind_stats, content
+
+    def _make_result(self, messages: List[BaseMessage], content: str) -> ChatResult:
+        input_tokens = sum(estimate_tokens(str(message.content)) for message in messages)
+        output_tokens = estimate_tokens(content)
+        message = AIMessage(
+            content=content,
+            response_metadata={"model_name": self._llm_type},
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _prefill(self, messages: List[BaseMessage]) -> float:
+        prompt_tokens = sum(estimate_tokens(str(message.content)) for message in messages)
+        return self.latency + self.prompt_token_latency * prompt_tokens
+
+    def _delay(self, content: str, messages: List[BaseMessage]) -> float:
+        return self._prefill(messages) + self.token_latency * estimate_tokens(content)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        kind_stats, content = self._next_content(messages)
+        delay = self._delay(content, messages)
+        if delay:
+            time.sleep(delay)
+        kind_stats["llm_seconds"] += delay
+        return self._make_result(messages, content)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        kind_stats, content = self._next_content(messages)
+        delay = self._delay(content, messages)
+        if delay:
+            await asyncio.sleep(delay)
+        kind_stats["llm_seconds"] += delay
+        return self._make_result(messages, content)
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """Отдаёт ответ кусками по ~4 символа (один "токен") с token_latency между ними."""
+        kind_stats, content = self._next_content(messages)
+        prefill = self._prefill(messages)
+        if prefill:
+            await asyncio.sleep(prefill)
+        for start in range(0, len(content), 4):
+            if self.token_latency:
+                await asyncio.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=content[start:start + 4]))
+
+        usage = self._make_result(messages, content).generations[0].message.usage_metadata
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=usage))
+        kind_stats["llm_seconds"] += self._delay(content, messages)
+
+    def with_structured_output(self, schema, *, method: str = "json_mode", include_raw: bool = False, **kwargs):
+        """Повторяет поведение ChatMistralAI для method="json_mode"."""
+        llm = self.bind(response_format={"type": "json_object"})
+        parser = PydanticOutputParser(pydantic_object=schema)
+        if not include_raw:
+            return llm | parser
+
+        parser_assign = RunnablePassthrough.assign(
+            parsed=itemgetter("raw") | parser, parsing_error=lambda _: None
+        )
+        parser_none = RunnablePassthrough.assign(parsed=lambda _: None)
+        parser_with_fallback = parser_assign.with_fallbacks([parser_none], exception_key="parsing_error")
+        return RunnableMap(raw=llm) | parser_with_fallback
+
+    def reset_stats(self) -> None:
+        self.stats.clear()
+
+    def total_calls(self) -> int:
+        return int(sum(kind_stats["calls"] for kind_stats in self.stats.values()))
@@ -1,35 +1,101 @@
-from typing import Literal
+from typing import Dict, Literal, Optional, Tuple
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
-from src.graph.state import InterviewState
-from src.agents.agents import Mentor, Interviewer, Manager, VibeMaster
-from src.logs import InterviewLogger
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph.state import CompiledStateGraph
+from src.graph.state import InterviewState, apply_update
+from src.agents.agents import BaseAgent, Mentor, Interviewer, Manager, VibeMaster, Summarizer
+from src.session import get_session
+from src.metrics import finish_session, instrument_node
+from src.tracing import span
+from src.speculation import SpeculativeTurn
+from src.streaming import TranscriptStream
 from src.structs.structs import Turn, QuestionResult
-from dataclasses import asdict
+from dataclasses import asdict, dataclass, replace
 import logging 
 from src.structs.structs import MentorAnalysis, CalibrationResult
-from src.spinner import get_spinner
 import asyncio
 
 log = logging.getLogger(__name__)
 
-mentor = Mentor("Mentor")
-interviewer = Interviewer("Interviewer")
-vibe_dealer = VibeMaster("VibeMaster")
-manager = Manager("Manager")
-logger = InterviewLogger()
+# Условия завершения интервью
+MAX_QUESTIONS = 10
+MAX_HALLUCINATIONS = 5
 
 
-async def start_node(state: InterviewState) -> InterviewState:
-    """Начало интервью - приветствие от интервьюера с валидацией роли."""
+@dataclass
+class Agents:
+    """Агенты графа. Не хранят состояния и общие для всех сессий процесса,
+    логгер и канал ввода/вывода у каждой сессии свои (см. src/session.py)."""
+    mentor: Mentor
+    interviewer: Interviewer
+    vibe_dealer: VibeMaster
+    manager: Manager
+    summarizer: Summarizer
+
+    def all(self) -> Tuple[BaseAgent, ...]:
+        return (self.mentor, self.interviewer, self.vibe_dealer, self.manager, self.summarizer)
+
+
+_agents: Optional[Agents] = None
+_compiled_graphs: Dict[int, CompiledStateGraph] = {}
+
+
+def get_agents() -> Agents:
+    """Агенты создаются при первом обращении, а не при импорте модуля: клиенты LLM, кэши и банк вопросов
+    поднимаются только там, где граф действительно запускают."""
+    global _agents
+    if _agents is None:
+        _agents = Agents(
+            mentor=Mentor("Mentor"),
+            interviewer=Interviewer("Interviewer"),
+            vibe_dealer=VibeMaster("VibeMaster"),
+            manager=Manager("Manager"),
+            summarizer=Summarizer("Summarizer"),
+        )
+    return _agents
+
+
+@instrument_node("start")
+async def start_node(state: InterviewState, config: RunnableConfig) -> dict:
+    """Начало интервью - приветствие от интервьюера с валидацией роли.
+    
+    Узлы не меняют state на месте и возвращают только изменённые ключи:
+    LangGraph сливает их с текущим state (списки — через reducer'ы из state.py).
+    """
+    session = get_session(config)
+    agents = get_agents()
+    logger = session.logger
     logger.log_agent_action("Interviewer", "Генерация приветствия с валидацией роли", {
         "candidate": state['participant_name'],
         "position": state['position'],
         "grade": state['grade']
     })
     
+    # Известная роль: отказ или приветствие без проверки роли в LLM
+    already_shown = False
+    async with session.spinner():
+        known_call = await agents.interviewer.known_role_greeting(state)
+    greeting_result = known_call.result if known_call is not None else None
+    if known_call is not None:
+        logger.log_agent_action("Interviewer", "Роль проверена локально", {
+            "position": state['position'],
+            "is_it_role": greeting_result.is_role_exists,
+            "from_cache": known_call.cached
+        })
     # Генерируем приветствие (с внутренней валидацией роли)
-    async with get_spinner():
-        greeting_result = await interviewer.generate_greeting(state)
+    elif session.stream_responses:
+        async with TranscriptStream(session) as stream:
+            greeting_call = await agents.interviewer.stream_greeting(state, stream)
+        greeting_result = greeting_call.result
+        already_shown = greeting_call.streamed
+        logger.log_agent_action("Interviewer", "Приветствие застримлено", {
+            "ttft_ms": round(stream.first_token_seconds * 1000, 1) if stream.first_token_seconds is not None else None,
+            "streamed": already_shown
+        })
+    else:
+        async with session.spinner():
+            greeting_result = await agents.interviewer.generate_greeting(state)
     
     # Проверяем, существует ли роль в IT
     if not greeting_result.is_role_exists:
@@ -40,23 +106,26 @@ async def start_node(state: InterviewState) -> InterviewState:
         })
         
         # Вывод для пользователя
-        print(f"\n❌")
-        print(f"🤖 Interviewer: {greeting_result.response}\n")
+        await session.send(f"\n❌")
+        if not already_shown:
+            await session.send(f"🤖 Interviewer: {greeting_result.response}\n")
         
         # Останавливаем интервью
-        state["is_finished"] = True
-        state["stop_reason"] = "invalid_it_position"
-        state["final_feedback"] = {
-            "error": "Позиция не является IT профессией",
-            "interviewer_message": greeting_result.response,
-            "thinking": greeting_result.thinking
+        update = {
+            "is_finished": True,
+            "stop_reason": "invalid_it_position",
+            "final_feedback": {
+                "error": "Позиция не является IT профессией",
+                "interviewer_message": greeting_result.response,
+                "thinking": greeting_result.thinking
+            }
         }
         
         # Логируем отказ
-        logger.update_log_unit(state)
-        logger.save_session()
+        await finish_session(update["stop_reason"])
+        await logger.finish(apply_update(state, update))
         
-        return state
+        return update
     
     # Роль валидна - продолжаем интервью
     logger.log_agent_action("Interviewer", "Валидация пройдена", {
@@ -66,57 +135,81 @@ async def start_node(state: InterviewState) -> InterviewState:
     
 
     # Вывод для пользователя
-    print(f"🤖 Interviewer: {greeting_result.response}\n")
-    return state
+    if not already_shown:
+        await session.send(f"🤖 Interviewer: {greeting_result.response}\n")
+    return {}
 
 
-async def user_input_node(state: InterviewState) -> InterviewState:
+@instrument_node("user_input")
+async def user_input_node(state: InterviewState, config: RunnableConfig) -> dict:
+    session = get_session(config)
+    agents = get_agents()
+    logger = session.logger
     
     # Запрашиваем ответ от пользователя
-    user_answer = input("👤 Вы: ")
-    state["current_user_message"] = user_answer
+    user_answer = await session.receive("👤 Вы: ")
+    # пока кандидат думал, фоновое сжатие старых ходов могло закончиться
+    update = {"current_user_message": user_answer, **session.memory.state_update(state)}
     
-    # Добавляем ответ пользователя в последний turn
+    # Добавляем ответ пользователя в копию последнего turn: reducer заменит ход по turn_id
+    current_turn = None
     if state["turns"]:
-        state["turns"][-1].user_message = state["current_user_message"]
+        last_turn = state["turns"][-1]
+        current_turn = replace(last_turn, user_message=user_answer)
+        update["turns"] = [current_turn]
+    # агенты ниже видят state вместе с ответом
+    view = apply_update(state, update)
     
     logger.log_agent_action("User", "Ответ получен", {
-        "turn_id": state["turns"][-1].turn_id if state["turns"] else 0,
+        "turn_id": current_turn.turn_id if current_turn else 0,
         "message_length": len(user_answer)
     })
     
     # Формируем контекст для VibeMaster
     last_ai_message = ""
-    if state["turns"]:
-        last_question = state["turns"][-1].agent_visible_message
-        last_ai_message = last_question
+    if current_turn:
+        last_ai_message = current_turn.agent_visible_message
     
-    logger.log_agent_action("System", "Параллельный запуск VibeMaster и Mentor", {
-        "turn_id": state["turns"][-1].turn_id if state["turns"] else 0
+    mode = "Совмещённый" if session.combined_analysis else "Параллельный"
+    logger.log_agent_action("System", f"{mode} запуск VibeMaster и Mentor", {
+        "turn_id": current_turn.turn_id if current_turn else 0
     })
     
+    # Пока Mentor анализирует ответ, Interviewer заранее готовит ветки под вероятные исходы
+    if session.speculative:
+        session.speculation = SpeculativeTurn.launch(agents.interviewer, view, session.speculation_stats)
+    
     # Показываем анимацию во время параллельной обработки
-    async with get_spinner():
-        vibe_task = vibe_dealer.analyze_vibe(
-            user_message=state["current_user_message"],
-            conversation_context=last_ai_message
-        )
-        
-        mentor_task = mentor.analyze_and_calibrate(state)
-        
-        
-        vibe_analysis, (analysis, calibration, thinking) = await asyncio.gather(
-            vibe_task,
-            mentor_task
-        )
+    async with session.spinner():
+        if session.combined_analysis:
+            # один запрос на ход: если намерение очевидно, хватает обычного анализа Mentor
+            vibe_analysis = agents.vibe_dealer.fast_intent(user_answer, stats=session.intent_stats)
+            if vibe_analysis is None:
+                analysis, calibration, thinking, vibe_analysis = await agents.mentor.analyze_with_vibe(view)
+            else:
+                analysis, calibration, thinking = await agents.mentor.analyze_and_calibrate(view)
+        else:
+            vibe_task = agents.vibe_dealer.analyze_vibe(
+                user_message=user_answer,
+                conversation_context=last_ai_message,
+                stats=session.intent_stats
+            )
+            
+            mentor_task = agents.mentor.analyze_and_calibrate(view)
+            
+            
+            vibe_analysis, (analysis, calibration, thinking) = await asyncio.gather(
+                vibe_task,
+                mentor_task
+            )
     
     # Обрабатываем результат VibeMaster
-    if state["turns"]:
+    if current_turn:
         vibe_log = f"Намерение: {'хочет остановиться' if vibe_analysis.wants_to_stop else 'хочет продолжить'}\n"
         vibe_log += f"Состояние: {vibe_analysis.emotional_state}\n"
         vibe_log += f"Уверенность: {vibe_analysis.confidence_level}%\n"
         vibe_log += f"Анализ: {vibe_analysis.thinking}"
-        state["turns"][-1].add_thought(f'[{vibe_dealer.name}]', f"{vibe_log}\n")
+        current_turn.add_thought(agents.vibe_dealer.name, f"{vibe_log}\n")
     
     logger.log_agent_action("VibeMaster", "Анализ завершён", {
         "wants_to_stop": vibe_analysis.wants_to_stop,
@@ -125,41 +218,44 @@ async def user_input_node(state: InterviewState) -> InterviewState:
     })
     
 
-    if state["turns"]:
-        current_turn = state["turns"][-1]
-        current_turn.add_thought(f"[{mentor.name}]", f"{thinking}\n")
+    if current_turn:
+        current_turn.add_thought(agents.mentor.name, f"{thinking}\n")
+    
+    # Подходящая спекулятивная ветка уже задаёт вопрос по своей теме: она и идёт в topics_covered
+    if session.speculation is not None:
+        calibration = session.speculation.adopt_topic(analysis, calibration)
     
-    state["observer_analysis"] = asdict(analysis)
-    state["calibrator_recommendation"] = asdict(calibration)
-    state["current_difficulty"] = calibration.difficulty_level
+    update["observer_analysis"] = asdict(analysis)
+    update["calibrator_recommendation"] = asdict(calibration)
+    update["current_difficulty"] = calibration.difficulty_level
     
-    # Добавляем тему если рекомендована новая
+    # Добавляем тему если рекомендована новая (упорядоченное множество: повтор не меняет порядок)
     if calibration.topic_recommendation and calibration.topic_recommendation not in state["topics_covered"]:
-        state["topics_covered"].append(calibration.topic_recommendation)
+        update["topics_covered"] = [calibration.topic_recommendation]
     
     # Учитываем галлюцинации
-    if analysis.answer_type == "hallucination":
-        state["detected_hallucinations"].extend(analysis.factual_errors)
+    if analysis.answer_type == "hallucination" and analysis.factual_errors:
+        update["detected_hallucinations"] = list(analysis.factual_errors)
     
     # Учитываем off-topic
     if analysis.answer_type == "off_topic":
-        state["off_topic_attempts"] += 1
+        update["off_topic_attempts"] = state["off_topic_attempts"] + 1
     
     # Сохраняем результат вопроса
     if state["step_counter"] > 0:
         question_result = QuestionResult(
             topic=calibration.topic_recommendation or "общее",
-            question=state["turns"][-1].agent_visible_message,
-            user_answer=state["current_user_message"],
+            question=current_turn.agent_visible_message,
+            user_answer=user_answer,
             is_correct=(analysis.answer_type in ["correct", "partial"]),
             correct_answer=analysis.correct_info if analysis.factual_errors else None,
             confidence=analysis.confidence_score / 100.0
         )
-        state["question_results"].append(question_result)
+        update["question_results"] = [question_result]
     
     logger.log_agent_action("Mentor", "Анализ завершён", {
         "answer_type": analysis.answer_type,
-        "difficulty": state['current_difficulty'],
+        "difficulty": calibration.difficulty_level,
         "next_topic": calibration.topic_recommendation,
         "confidence": analysis.confidence_score
     })
@@ -171,13 +267,26 @@ async def user_input_node(state: InterviewState) -> InterviewState:
             "confidence": vibe_analysis.confidence_level
         })
         
-        state["is_finished"] = True
-        state["stop_reason"] = f"user_stopped: {vibe_analysis.stop_reason}"
+        update["is_finished"] = True
+        update["stop_reason"] = f"user_stopped: {vibe_analysis.stop_reason}"
+    
+    view = apply_update(state, update)
+    
+    # Ход закончен: ходы старше окна последних сворачиваем в краткое содержание, не дожидаясь
+    if session.summary_memory:
+        session.memory.schedule(agents.summarizer, view)
     
     # Логируем
-    logger.update_log_unit(state)
+    logger.update_log_unit(view)
     
-    return state
+    return update
+
+
+def route_after_start(state: InterviewState) -> Literal["user_input", "end"]:
+    """Роль не прошла валидацию — интервью уже завершено и залогировано в start_node."""
+    if state.get("is_finished", False):
+        return "end"
+    return "user_input"
 
 
 def route_after_user_input(state: InterviewState) -> Literal["interviewer", "manager"]:
@@ -187,8 +296,12 @@ def route_after_user_input(state: InterviewState) -> Literal["interviewer", "man
     return "interviewer"
 
 
-async def interviewer_node(state: InterviewState) -> InterviewState:
-    """Генерация ответа Interviewer'ом."""
+@instrument_node("interviewer")
+async def interviewer_node(state: InterviewState, config: RunnableConfig) -> dict:
+    """Генерация ответа Interviewer'ом и проверка условий завершения."""
+    session = get_session(config)
+    agents = get_agents()
+    logger = session.logger
     logger.log_agent_action("Interviewer", "Формулирование ответа на основе анализа Mentor", {
         "step": state.get("step_counter", 0),
         "questions_asked": state["questions_asked"]
@@ -200,72 +313,145 @@ async def interviewer_node(state: InterviewState) -> InterviewState:
     
     mentor_analysis = MentorAnalysis(**analysis) if isinstance(analysis, dict) else analysis
     calibration_result = CalibrationResult(**calibration) if isinstance(calibration, dict) else calibration
+    update = session.memory.state_update(state)
+    view = apply_update(state, update)
+    
+    # Коммитим подходящую спекулятивную ветку, иначе генерируем ответ как обычно
+    response_result = None
+    speculation = session.take_speculation()
+    if speculation is not None:
+        response_result = await speculation.commit(mentor_analysis, calibration_result)
+        logger.log_agent_action("Interviewer", "Спекулятивная ветка", {
+            "hit": response_result is not None,
+            **session.speculation_stats.as_dict()
+        })
     
-    # Генерируем ответ с анимацией
-    async with get_spinner():
-        response_result = await interviewer.generate_response(state, mentor_analysis, calibration_result)
+    # Тема и сложность от Mentor совпали с вопросом из банка: генерируем только реакцию
+    from_bank = False
+    if response_result is None:
+        bank_question = agents.interviewer.bank_question(view, mentor_analysis, calibration_result, session.bank_stats)
+        if bank_question is not None:
+            async with session.spinner():
+                response_result = await agents.interviewer.ask_bank_question(
+                    view, mentor_analysis, calibration_result, bank_question
+                )
+            from_bank = True
+            logger.log_agent_action("Interviewer", "Вопрос из банка", {
+                "topic": calibration_result.topic_recommendation,
+                "difficulty": calibration_result.difficulty_level,
+                "question": bank_question
+            })
+    
+    already_shown = False
+    if response_result is None and session.stream_responses:
+        # Реплика уходит кандидату по мере генерации, thinking парсится из того же потока
+        async with TranscriptStream(session) as stream:
+            response_call = await agents.interviewer.stream_response(view, mentor_analysis, calibration_result, stream)
+        response_result = response_call.result
+        already_shown = response_call.streamed
+        logger.log_agent_action("Interviewer", "Ответ застримлен", {
+            "ttft_ms": round(stream.first_token_seconds * 1000, 1) if stream.first_token_seconds is not None else None,
+            "streamed": already_shown
+        })
+    elif response_result is None:
+        # Генерируем ответ с анимацией
+        async with session.spinner():
+            response_result = await agents.interviewer.generate_response(view, mentor_analysis, calibration_result)
     
     # Создаём новый turn, он же и первый turn, так как мы не считаем инициализированный turn :/ 
-    state["step_counter"] += 1
     turn = Turn(
-        turn_id=state["step_counter"],
+        turn_id=view["step_counter"] + 1,
         agent_visible_message=response_result.response,
         user_message="",
-        internal_thoughts=f"[{interviewer.name}]: {response_result.thinking}\n"
+        internal_thoughts=f"[{agents.interviewer.name}]: {response_result.thinking}\n"
     )
-    
-    state["turns"].append(turn)
-    state["questions_asked"] += 1
+    update["step_counter"] = turn.turn_id
+    update["turns"] = [turn]
+    update["questions_asked"] = view["questions_asked"] + 1
     
     logger.log_agent_action("Interviewer", "Вопрос сгенерирован", {
         "turn_id": turn.turn_id,
-        "questions_total": state["questions_asked"]
+        "questions_total": update["questions_asked"]
     })
     
     # Вывод для пользователя
-    print(f"🤖 Interviewer: {response_result.response}\n")
+    if not already_shown:
+        await session.send(f"🤖 Interviewer: {response_result.response}\n")
+    
+    # Условия завершения проверяем здесь, а не в роутере: изменения state в роутере теряются
+    stop_reason = check_limits(apply_update(state, update), logger)
+    if stop_reason is not None:
+        update["is_finished"] = True
+        update["stop_reason"] = stop_reason
+    view = apply_update(state, update)
+    
+    # Сгенерированный целиком вопрос пополняет банк (у спекулятивной ветки calibration уже с её темой)
+    if not from_bank:
+        await agents.interviewer.remember_question(view, calibration_result, response_result.response, session.bank_stats)
     
     # Логируем
-    logger.update_log_unit(state)
+    logger.update_log_unit(view)
     
-    return state
+    return update
 
 
-def check_finish_node(state: InterviewState) -> Literal["continue", "finish"]:
-    """Проверяет условия завершения интервью."""
-    
-    # Условия завершения:
-    MAX_QUESTIONS = 10
-    
+def check_limits(state: InterviewState, logger) -> Optional[str]:
+    """Причина завершения по лимитам интервью или None."""
     # 1. Превышено количество вопросов
     if state["questions_asked"] >= MAX_QUESTIONS:
         logger.log_agent_action("System", "Достигнут лимит вопросов", {
             "questions_asked": state['questions_asked'],
             "max_questions": MAX_QUESTIONS
         })
-        state["is_finished"] = True
-        state["stop_reason"] = "questions_exhausted"
-        return "finish"
+        return "questions_exhausted"
     
     # 2. Слишком много галлюцинаций
-    if len(state["detected_hallucinations"]) >= 5:
+    if len(state["detected_hallucinations"]) >= MAX_HALLUCINATIONS:
         logger.log_agent_action("System", "Слишком много галлюцинаций", {
             "hallucinations_count": len(state['detected_hallucinations']),
-            "threshold": 5
+            "threshold": MAX_HALLUCINATIONS
         })
-        state["is_finished"] = True
-        state["stop_reason"] = "too_many_hallucinations"
-        return "finish"
+        return "too_many_hallucinations"
     
-    # 3. Проверка на завершение уже установлеа (из user_input_node)
+    return None
+
+
+def check_finish_node(state: InterviewState) -> Literal["continue", "finish"]:
+    """Маршрут после Interviewer: условия завершения уже проверены в interviewer_node."""
     if state.get("is_finished", False):
         return "finish"
-    
     return "continue"
 
 
-async def manager_node(state: InterviewState) -> InterviewState:
+@instrument_node("manager")
+async def manager_node(state: InterviewState, config: RunnableConfig) -> dict:
     """Генерация финального фидбэка."""
+    session = get_session(config)
+    agents = get_agents()
+    logger = session.logger
+    
+    # кандидат мог закончить интервью, пока ветки следующего вопроса ещё генерировались
+    speculation = session.take_speculation()
+    if speculation is not None:
+        speculation.discard()
+    if session.speculation_stats.turns:
+        logger.log_agent_action("System", "Статистика спекуляции", session.speculation_stats.as_dict())
+    if agents.vibe_dealer.fast_path:
+        logger.log_agent_action("VibeMaster", "Статистика локального классификатора", session.intent_stats.as_dict())
+    if agents.mentor.cache is not None:
+        logger.log_agent_action("Mentor", "Статистика кэша разборов", agents.mentor.cache.stats.as_dict())
+    if agents.interviewer.question_bank is not None:
+        logger.log_agent_action("Interviewer", "Статистика банка вопросов", session.bank_stats.as_dict())
+    
+    # Manager видит краткое содержание + ходы, которые в него ещё не вошли
+    update = {}
+    if session.summary_memory:
+        with span("memory.flush"):
+            await session.memory.flush()
+        update = session.memory.state_update(state)
+        logger.log_agent_action("Summarizer", "Статистика памяти", session.memory.as_dict())
+    view = apply_update(state, update)
+    
     logger.log_agent_action("Manager", "Генерация финального фидбэка", {
         "total_turns": len(state["turns"]),
         "questions_asked": state["questions_asked"],
@@ -273,11 +459,12 @@ async def manager_node(state: InterviewState) -> InterviewState:
     })
     
     # Генерируем фидбэк через Manager с анимацией
-    async with get_spinner():
-        feedback = await manager.generate_feedback(state)
+    async with session.spinner():
+        feedback = await agents.manager.generate_feedback(view)
     
     # Сохраняем в state
-    state["final_feedback"] = asdict(feedback)
+    update["final_feedback"] = asdict(feedback)
+    view = apply_update(state, update)
     
     logger.log_agent_action("Manager", "Фидбэк сгенерирован", {
         "grade": feedback.grade,
@@ -288,25 +475,35 @@ async def manager_node(state: InterviewState) -> InterviewState:
     })
     
     # Красиво выводим для пользователя
-    print(f"\n{'='*60}")
-    print(f"Фидбэк\n")
-    print(f"Вердикт: {feedback.grade} | {feedback.hiring_recommendation}")
-    print(f"Уверенность: {feedback.confidence_score}%\n")
-    print(f"Подтверждённые навыки: {', '.join(feedback.confirmed_skills)}")
-    print(f"Пробелы: {len(feedback.knowledge_gaps)} тем\n")
-    print(f"Soft Skills:")
-    print(f"Ясность: {feedback.clarity}")
-    print(f"Честность: {feedback.honesty}")
-    print(f"Вовлечённость: {feedback.engagement}\n")
-    print(f"Рекомендации к изучению:")
-    for item in feedback.roadmap:
-        print(f"   • {item}")
-    print(f"\n{'='*60}\n")
-    
-    # Финальное логирование
-    logger.finish(state)
-    
-    return state
+    roadmap = "\n".join(f"   • {item}" for item in feedback.roadmap)
+    await session.send(f"""
+{'='*60}
+Фидбэк
+
+Вердикт: {feedback.grade} | {feedback.hiring_recommendation}
+Уверенность: {feedback.confidence_score}%
+
+Подтверждённые навыки: {', '.join(feedback.confirmed_skills)}
+Пробелы: {len(feedback.knowledge_gaps)} тем
+
+Soft Skills:
+Ясность: {feedback.clarity}
+Честность: {feedback.honesty}
+Вовлечённость: {feedback.engagement}
+
+Рекомендации к изучению:
+{roadmap}
+
+{'='*60}
+""")
+    
+    # Финальное логирование: сводка токенов, латентности и стоимости по агентам и узлам
+    logger.log_agent_action("System", "Метрики сессии", session.metrics.as_dict())
+    await finish_session(view.get("stop_reason") or "completed")
+    with span("logs.finish"):
+        await logger.finish(view)
+    
+    return update
 
 def build_interview_graph() -> StateGraph:
     """Строит граф интервью с параллельным выполнением VibeMaster + Mentor."""
@@ -321,7 +518,14 @@ def build_interview_graph() -> StateGraph:
     workflow.add_node("manager", manager_node)
     
     workflow.set_entry_point("start")
-    workflow.add_edge("start", "user_input")
+    workflow.add_conditional_edges(
+        "start",
+        route_after_start,
+        {
+            "user_input": "user_input",
+            "end": END
+        }
+    )
     workflow.add_conditional_edges(
         "user_input",
         route_after_user_input,
@@ -347,6 +551,20 @@ def build_interview_graph() -> StateGraph:
     return workflow
 
 
+def get_compiled_graph(checkpointer: Optional[BaseCheckpointSaver] = None) -> CompiledStateGraph:
+    """Скомпилированный граф, один на процесс для каждого чекпоинтера.
+
+    Граф не зависит от сессии (она приходит через config), поэтому CLI, сервер и batch-прогон
+    компилируют его один раз и переиспользуют.
+    """
+    key = id(checkpointer)  # граф держит ссылку на чекпоинтер, поэтому id не переиспользуется
+    app = _compiled_graphs.get(key)
+    if app is None:
+        app = build_interview_graph().compile(checkpointer=checkpointer)
+        _compiled_graphs[key] = app
+    return app
+
+
 def create_initial_state(
     participant_name: str,
     position: str,
@@ -366,6 +584,8 @@ def create_initial_state(
         current_difficulty=1,  # Начинаем c легкой сложности
         questions_asked=0,
         topics_covered=[],
+        conversation_summary="",
+        summarized_turn_id=0,
         question_results=[],
         detected_hallucinations=[],
         off_topic_attempts=0,
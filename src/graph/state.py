@@ -1,31 +1,90 @@
-from typing import TypedDict, List, Optional
+import operator
+from typing import Annotated, Any, Iterable, Mapping, TypedDict, List, Optional, get_type_hints
 from src.structs.structs import Turn, QuestionResult
 
 
+def merge_turns(left: List[Turn], right: List[Turn]) -> List[Turn]:
+    """Ходы по turn_id: новый дописывается, ход с уже известным turn_id заменяется.
+
+    Узлы возвращают только изменённые ходы: interviewer_node — новый вопрос,
+    user_input_node — последний ход с ответом кандидата и мыслями агентов.
+    """
+    merged = list(left)
+    for turn in right:
+        # обновляется почти всегда последний ход, поэтому ищем с конца
+        for i in range(len(merged) - 1, -1, -1):
+            if merged[i].turn_id == turn.turn_id:
+                merged[i] = turn
+                break
+            if merged[i].turn_id < turn.turn_id:
+                merged.append(turn)
+                break
+        else:
+            merged.append(turn)
+    return merged
+
+
+def merge_topics(left: List[str], right: Iterable[str]) -> List[str]:
+    """Темы без повторов в порядке добавления: повтор темы не меняет порядок."""
+    seen = set(left)
+    merged = list(left)
+    for topic in right:
+        if topic not in seen:
+            seen.add(topic)
+            merged.append(topic)
+    return merged
+
+
 class InterviewState(TypedDict):
     participant_name: str
 
-    step_counter: int 
+    step_counter: int
     position: str
     grade: str # только изначальный грейд
     experience: str
-    
-    turns: List[Turn]
+
+    # каналы с reducer'ами: узлы возвращают только добавленное, LangGraph сливает с текущим значением
+    turns: Annotated[List[Turn], merge_turns]
     conversation_history: List[dict]
     current_user_message: str
-    
+
     current_difficulty: int
     questions_asked: int
-    topics_covered: List[str]
-    
-    question_results: List[QuestionResult]
-    detected_hallucinations: List[str]
+    topics_covered: Annotated[List[str], merge_topics]  # темы без повторов в порядке добавления
+
+    # краткое содержание ходов с turn_id <= summarized_turn_id (src/memory.py)
+    conversation_summary: str
+    summarized_turn_id: int
+
+    question_results: Annotated[List[QuestionResult], operator.add]
+    detected_hallucinations: Annotated[List[str], operator.add]
     off_topic_attempts: int
-    
+
     observer_analysis: str
     calibrator_recommendation: str
-    
+
     final_feedback: Optional[str]
-    
+
     is_finished: bool
-    stop_reason: str
\ No newline at end of file
+    stop_reason: str
+
+
+# reducer'ы каналов берутся из тех же Annotated, что читает LangGraph, чтобы не разойтись с графом
+REDUCERS = {
+    key: hint.__metadata__[-1]
+    for key, hint in get_type_hints(InterviewState, include_extras=True).items()
+    if hasattr(hint, "__metadata__")
+}
+
+
+def apply_update(state: InterviewState, update: Mapping[str, Any]) -> InterviewState:
+    """state после частичного обновления узла — так же, как его сольёт LangGraph.
+
+    Узел не меняет state на месте: агентам, логгеру и памяти внутри узла
+    нужен state вместе с ещё не возвращёнными изменениями.
+    """
+    merged = dict(state)
+    for key, value in update.items():
+        reducer = REDUCERS.get(key)
+        merged[key] = reducer(state[key], value) if reducer is not None and key in state else value
+    return merged
@@ -1,9 +1,9 @@
-import json
+import asyncio
 import os
-from dataclasses import asdict
 from datetime import datetime
-from typing import Dict, Any, TYPE_CHECKING
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 from src.structs.structs import LogUnit
+from src.serialization import JSONDecodeError, dumps, dumps_line, loads
 if TYPE_CHECKING:
     from src.graph.state import InterviewState
 import logging 
@@ -32,11 +32,76 @@ stderr_handler = SafeStreamHandler(sys.stderr)
 logger.addHandler(stderr_handler)
 logger.setLevel(logging.ERROR)
 
+class TurnJournal:
+    """Append-only журнал сессии: одна JSON-строка на ход или событие агента.
+
+    Записи копятся в буфере и сбрасываются на диск пачками в отдельном потоке,
+    поэтому стоимость логирования хода не зависит от длины интервью.
+    """
+
+    def __init__(self, path: str, batch_size: int = 32, resume: bool = False):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        # новый журнал перезаписываем, при возобновлении сессии дописываем в конец
+        self._truncate = not resume
+
+    def append(self, record: Dict[str, Any], urgent: bool = False) -> None:
+        """Добавляет запись. urgent=True сбрасывает буфер сразу (ходы должны пережить падение)."""
+        self._pending.append(record)
+        if urgent or len(self._pending) >= self.batch_size:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # вне event loop просто пишем синхронно
+            batch, self._pending = self._pending, []
+            self._write(batch)
+            return
+        # если сброс уже идёт, он заберёт новые записи в своём цикле
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self.flush())
+
+    async def flush(self) -> None:
+        async with self._lock:
+            while self._pending:
+                batch, self._pending = self._pending, []
+                await asyncio.to_thread(self._write, batch)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        mode = "wb" if self._truncate else "ab"
+        self._truncate = False
+        # сериализация идёт здесь, в потоке сброса, а не в log_agent_action на горячем пути хода
+        lines = b"".join(dumps_line(record) for record in batch)
+        with open(self.path, mode) as f:
+            f.write(lines)
+
+    def read(self) -> List[Dict[str, Any]]:
+        """Читает журнал с диска. Обрезанная последняя строка (падение при записи) пропускается."""
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    records.append(loads(line))
+                except JSONDecodeError:
+                    continue
+        return records
+
+    def __repr__(self) -> str:
+        return f"TurnJournal(path='{self.path}', pending={len(self._pending)})"
+
+
 # лог может быть постоянной памятью
 # нужно суммаризировать ответы пользователя 
 class InterviewLogger:
-    def __init__(self, output_path: str = "logs/interview_log.json"):
-        self.current_unit = None
+    def __init__(self, output_path: str = "logs/interview_log.json", resume: bool = False):
+        self.current_unit: Optional[LogUnit] = None
         self.output_path = output_path
         self.session_start = datetime.now().isoformat()
         self.session_end: str | None = None
@@ -44,28 +109,66 @@ class InterviewLogger:
         dir_path = os.path.dirname(output_path)
         if dir_path:
             os.makedirs(dir_path, exist_ok=True)
+        
+        self.journal = TurnJournal(os.path.splitext(output_path)[0] + ".jsonl", resume=resume)
+        self._session_recorded = resume
+        self._last_turn_record: Optional[Dict[str, Any]] = None
     
-    def log_agent_action(self, role: str, event: str, info: str):
-        logger.info(f"{json.dumps(info)}\n")
+    def log_agent_action(self, role: str, event: str, info: Dict[str, Any]):
+        logger.info("%s: %s", role, event)
+        self.journal.append({
+            "kind": "event",
+            "ts": datetime.now(),  # в строку ISO 8601 превращается при сбросе журнала
+            "role": role,
+            "event": event,
+            "info": info,
+        })
 
     def update_log_unit(self, state: "InterviewState"):
-        logger.info(f"created log unit checkpoint")
-
-        self.current_unit = LogUnit(
+        """Журналирует последний ход. Предыдущие ходы уже записаны и больше не меняются."""
+        if not self._session_recorded:
+            self._session_recorded = True
+            self.journal.append({
+                "kind": "session",
+                "ts": self.session_start,
+                "participant_name": state["participant_name"],
+                "position": state["position"],
+                "grade": state["grade"],
+            })
+        
+        if not state["turns"]:
+            return
+        
+        record = {"kind": "turn", **state["turns"][-1].as_dict()}
+        if record != self._last_turn_record:
+            self._last_turn_record = record
+            self.journal.append(record, urgent=True)
+    
+    def build_log_unit(self, state: "InterviewState") -> LogUnit:
+        """Собирает LogUnit из журнала: для каждого хода берётся последняя записанная версия."""
+        turns: Dict[int, Dict[str, Any]] = {}
+        for record in self.journal.read():
+            if record.get("kind") == "turn":
+                record.pop("kind")
+                turns[record["turn_id"]] = record
+        
+        return LogUnit(
             participant_name=state["participant_name"],
-            turns=[asdict(turn) for turn in state["turns"]],
+            turns=[turns[turn_id] for turn_id in sorted(turns)],
             final_feedback=state["final_feedback"]
         )
     
-    def save_session(self) -> None:
-        feedback = self.current_unit.final_feedback
-        
-        roadmap = ""
-        for item in feedback["roadmap"]:
-            roadmap += f"   • {item}\n"
+    def save_session(self, unit: LogUnit) -> None:
+        feedback = unit.final_feedback
         
-        # hotfix
-        string_feedback = f"""Фидбэк
+        # при отказе по невалидной роли фидбэка от Manager нет
+        if feedback and "roadmap" in feedback:
+            roadmap = ""
+            for item in feedback["roadmap"]:
+                roadmap += f"   • {item}\n"
+            
+            # hotfix
+            string_feedback = f"""Фидбэк
 Вердикт: {feedback['grade']} | {feedback['hiring_recommendation']}
 Уверенность: {feedback['confidence_score']}%
 
@@ -79,16 +182,20 @@ Soft Skills:
 
 Рекомендации к изучению:
 {roadmap}"""
+            
+            unit.final_feedback = string_feedback
         
-        self.current_unit.final_feedback = string_feedback
-        
-        with open(self.output_path, 'w', encoding='utf-8') as f:
-            json.dump(asdict(self.current_unit), f, ensure_ascii=False, indent=2)
+        with open(self.output_path, 'wb') as f:
+            f.write(dumps(unit, indent=True))
     
-    def finish(self, state: "InterviewState") -> None:
+    async def finish(self, state: "InterviewState") -> None:
         self.session_end = datetime.now().isoformat()
         self.update_log_unit(state)
-        self.save_session()
+        self.journal.append({"kind": "finish", "ts": self.session_end, "stop_reason": state["stop_reason"]})
+        await self.journal.flush()
+        
+        self.current_unit = await asyncio.to_thread(self.build_log_unit, state)
+        await asyncio.to_thread(self.save_session, self.current_unit)
     
     def __repr__(self) -> str:
         return f"InterviewLogger(output_path='{self.output_path}')"
@@ -0,0 +1,115 @@
+"""Сжатая память интервью.
+
+После каждого хода всё, что старше последних SUMMARY_RECENT_TURNS ходов,
+в фоне сворачивается Summarizer'ом в краткое содержание ограниченной длины.
+Mentor и Interviewer видят краткое содержание + последние ходы дословно,
+Manager — краткое содержание + ходы, которые ещё не вошли в него. Так размер
+промптов не растёт с длиной интервью.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from src.config import SUMMARY_MAX_CHARS, SUMMARY_RECENT_TURNS
+from src.structs.structs import Turn
+
+if TYPE_CHECKING:
+    from src.agents.agents import Summarizer
+    from src.graph.state import InterviewState
+
+log = logging.getLogger(__name__)
+
+
+def cap_summary(summary: str, max_chars: int = SUMMARY_MAX_CHARS) -> str:
+    """Жёсткий предел длины: модель может не уложиться в лимит из промпта."""
+    if len(summary) <= max_chars:
+        return summary
+    return "…" + summary[-(max_chars - 1):]
+
+
+def fallback_summary(summary: str, turns: List[Turn], max_chars: int = SUMMARY_MAX_CHARS) -> str:
+    """Дописывает ходы в сокращённом виде, если Summarizer не ответил."""
+    lines = [summary] if summary else []
+    for turn in turns:
+        lines.append(f"Вопрос {turn.turn_id}: {turn.agent_visible_message[:200]} | Ответ: {turn.user_message[:200]}")
+    return cap_summary("\n".join(lines), max_chars)
+
+
+@dataclass
+class SummaryMemory:
+    """Краткое содержание одной сессии; обновляется фоновыми задачами строго по порядку."""
+    summary: str = ""
+    summarized_turn_id: int = 0  # ходы с turn_id <= этого уже в summary
+    recent_turns: int = SUMMARY_RECENT_TURNS
+    max_chars: int = SUMMARY_MAX_CHARS
+    updates: int = 0
+    failures: int = 0
+    tokens: int = 0  # сколько токенов потратил Summarizer
+    _scheduled_turn_id: int = 0
+    _queue: List[Turn] = field(default_factory=list, repr=False)
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def pending_turns(self, state: "InterviewState") -> List[Turn]:
+        """Отвеченные ходы старше окна последних ходов, которые ещё не отправлены на сжатие."""
+        older = state["turns"][:-self.recent_turns] if self.recent_turns else state["turns"]
+        return [turn for turn in older if turn.turn_id > self._scheduled_turn_id and turn.user_message]
+
+    def schedule(self, summarizer: "Summarizer", state: "InterviewState") -> None:
+        """Запускает фоновое обновление; не ждёт его и не блокирует ход."""
+        turns = self.pending_turns(state)
+        if not turns:
+            return
+        self._scheduled_turn_id = turns[-1].turn_id
+        self._queue.extend(turns)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain(summarizer, state["position"], state["grade"]))
+
+    async def _drain(self, summarizer: "Summarizer", position: str, grade: str) -> None:
+        # пока идёт вызов, новые ходы копятся в очереди и уходят следующим запросом одной пачкой:
+        # медленный Summarizer не накапливает отставание по запросу на каждый ход
+        while self._queue:
+            turns, self._queue = self._queue, []
+            await self._update(summarizer, position, grade, turns)
+
+    async def _update(self, summarizer: "Summarizer", position: str, grade: str, turns: List[Turn]) -> None:
+        try:
+            call = await summarizer.update_summary(position, grade, self.summary, turns, self.max_chars)
+            self.summary = cap_summary(call.result.summary, self.max_chars)
+            self.tokens += call.total_tokens
+        except Exception as e:
+            # StructuredOutputError или ошибка провайдера: память не должна ронять интервью
+            log.warning(f"Summarizer: не удалось обновить краткое содержание: {e}")
+            self.summary = fallback_summary(self.summary, turns, self.max_chars)
+            self.failures += 1
+        self.summarized_turn_id = turns[-1].turn_id
+        self.updates += 1
+
+    async def flush(self) -> None:
+        """Дожидается всех запущенных обновлений (перед финальным фидбэком)."""
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def cancel(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def restore(self, state: "InterviewState") -> None:
+        """Поднимает краткое содержание из state (при возобновлении сессии из чекпоинта)."""
+        self.summary = state.get("conversation_summary", "")
+        self.summarized_turn_id = self._scheduled_turn_id = state.get("summarized_turn_id", 0)
+
+    def state_update(self, state: "InterviewState") -> Dict[str, Any]:
+        """Готовое краткое содержание как частичное обновление state (пусто, если не изменилось)."""
+        if state.get("summarized_turn_id") == self.summarized_turn_id:
+            return {}
+        return {"conversation_summary": self.summary, "summarized_turn_id": self.summarized_turn_id}
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "updates": self.updates,
+            "failures": self.failures,
+            "summarized_turn_id": self.summarized_turn_id,
+            "summary_chars": len(self.summary),
+            "tokens": self.tokens,
+        }
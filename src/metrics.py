@@ -0,0 +1,302 @@
+"""Метрики агентов и узлов графа в формате Prometheus.
+
+Счётчики и гистограммы на процесс: токены промпта и ответа, латентность,
+попытки, повторы, fallback-парсинг и оценка стоимости по агентам, время
+узлов графа. Отдаются текстом Prometheus (файл METRICS_FILE или HTTP
+эндпоинт серверного режима). Параллельно каждая сессия копит свою сводку
+(SessionMetrics), которая пишется в лог сессии в manager_node.
+
+Сессия узнаётся через contextvar: его выставляет обёртка узла, а задачи
+asyncio, созданные внутри узла (gather, фоновая память), наследуют его.
+"""
+import asyncio
+import functools
+import os
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.config import LLM_PRICE_INPUT_PER_1M, LLM_PRICE_OUTPUT_PER_1M, METRICS_FILE
+from src.tracing import bind_tracer, span
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values: Dict[LabelValues, float] = defaultdict(float)
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self.values[label_values] += amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # значения меток -> (счётчики по бакетам + бакет +Inf, сумма)
+        self.values: Dict[LabelValues, List[float]] = {}
+        self.sums: Dict[LabelValues, float] = defaultdict(float)
+
+    def observe(self, value: float, *label_values: str) -> None:
+        counts = self.values.get(label_values)
+        if counts is None:
+            counts = self.values[label_values] = [0] * (len(self.buckets) + 1)
+        counts[bisect_left(self.buckets, value)] += 1
+        self.sums[label_values] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, counts in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = _format_labels(self.labels, label_values, f'le="{bound:g}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            cumulative += counts[-1]
+            inf = _format_labels(self.labels, label_values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, label_values)} {self.sums[label_values]:g}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, label_values)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Все метрики процесса."""
+
+    def __init__(self):
+        self.llm_calls = Counter(
+            "interview_llm_calls_total", "Вызовы LLM агентами", ("agent", "operation", "outcome")
+        )
+        self.llm_attempts = Counter("interview_llm_attempts_total", "Запросы к провайдеру", ("agent",))
+        self.llm_retries = Counter("interview_llm_retries_total", "Повторные запросы после ошибки", ("agent",))
+        self.parse_fallbacks = Counter(
+            "interview_llm_parse_fallbacks_total", "Ответы, восстановленные ручным парсингом", ("agent",)
+        )
+        self.parse_repairs = Counter(
+            "interview_llm_parse_repairs_total", "Починки сырого JSON при ручном парсинге", ("agent", "repair")
+        )
+        self.prompt_tokens = Counter("interview_llm_prompt_tokens_total", "Токены промпта", ("agent",))
+        self.completion_tokens = Counter("interview_llm_completion_tokens_total", "Токены ответа", ("agent",))
+        self.cost = Counter("interview_llm_cost_usd_total", "Оценка стоимости вызовов, USD", ("agent",))
+        self.llm_latency = Histogram(
+            "interview_llm_latency_seconds", "Время вызова LLM агентом, включая повторы", ("agent",)
+        )
+        self.prompt_size = Histogram(
+            "interview_llm_prompt_tokens", "Размер промпта на вызов", ("agent",), buckets=TOKEN_BUCKETS
+        )
+        self.node_latency = Histogram("interview_node_latency_seconds", "Время узла графа", ("node",))
+        self.node_errors = Counter("interview_node_errors_total", "Исключения в узлах графа", ("node",))
+        self.sessions = Counter("interview_sessions_total", "Завершённые интервью", ("stop_reason",))
+        self.cache_requests = Counter(
+            "interview_cache_requests_total", "Обращения к кэшу результатов агентов", ("cache", "outcome")
+        )
+
+    def all(self) -> List[Any]:
+        return [value for value in vars(self).values() if isinstance(value, (Counter, Histogram))]
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.all():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path: str) -> None:
+        """Атомарно пишет метрики в файл (для node_exporter textfile collector)."""
+        dir_path = os.path.dirname(path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+@dataclass
+class AgentTotals:
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    parse_fallbacks: int = 0
+    parse_repairs: Dict[str, int] = field(default_factory=dict)  # починка -> сколько раз
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    seconds: float = 0.0
+
+
+@dataclass
+class SessionMetrics:
+    """Сводка одной сессии для лога."""
+    agents: Dict[str, AgentTotals] = field(default_factory=lambda: defaultdict(AgentTotals))
+    nodes: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    candidate_seconds: float = 0.0  # сколько ждали ответа кандидата; в время узлов не входит
+
+    def as_dict(self) -> Dict[str, Any]:
+        agents = {name: {key: round(value, 6) if isinstance(value, float) else value
+                         for key, value in vars(totals).items()}
+                  for name, totals in self.agents.items()}
+        nodes = {
+            node: {"runs": len(values), "seconds": round(sum(values), 3), "max_seconds": round(max(values), 3)}
+            for node, values in self.nodes.items()
+        }
+        total_cost = sum(totals.cost_usd for totals in self.agents.values())
+        total_tokens = sum(totals.prompt_tokens + totals.completion_tokens for totals in self.agents.values())
+        return {
+            "agents": agents,
+            "nodes": nodes,
+            "candidate_seconds": round(self.candidate_seconds, 3),
+            "total_tokens": total_tokens,
+            "total_cost_usd": round(total_cost, 6),
+        }
+
+
+_metrics = MetricsRegistry()
+_session_metrics: ContextVar[Optional[SessionMetrics]] = ContextVar("session_metrics", default=None)
+
+
+def get_metrics() -> MetricsRegistry:
+    return _metrics
+
+
+def estimate_cost(prompt_tokens: int, completion_tokens: int) -> float:
+    return (prompt_tokens * LLM_PRICE_INPUT_PER_1M + completion_tokens * LLM_PRICE_OUTPUT_PER_1M) / 1_000_000
+
+
+def record_llm_call(
+    agent: str,
+    operation: str,
+    seconds: float,
+    attempts: int,
+    usage: Optional[Dict[str, Any]] = None,
+    recovered: bool = False,
+    outcome: str = "ok",
+    repairs: Tuple[str, ...] = (),
+) -> None:
+    """Учитывает один structured-вызов агента (со всеми его повторами)."""
+    usage = usage or {}
+    prompt_tokens = int(usage.get("input_tokens", 0))
+    completion_tokens = int(usage.get("output_tokens", 0))
+    cost = estimate_cost(prompt_tokens, completion_tokens)
+    retries = max(0, attempts - 1)
+
+    metrics = _metrics
+    metrics.llm_calls.inc(agent, operation, outcome)
+    metrics.llm_attempts.inc(agent, amount=attempts)
+    metrics.llm_latency.observe(seconds, agent)
+    if retries:
+        metrics.llm_retries.inc(agent, amount=retries)
+    if recovered:
+        metrics.parse_fallbacks.inc(agent)
+    for repair in repairs:
+        metrics.parse_repairs.inc(agent, repair)
+    if usage:
+        metrics.prompt_tokens.inc(agent, amount=prompt_tokens)
+        metrics.completion_tokens.inc(agent, amount=completion_tokens)
+        metrics.cost.inc(agent, amount=cost)
+        metrics.prompt_size.observe(prompt_tokens, agent)
+
+    session_metrics = _session_metrics.get()
+    if session_metrics is not None:
+        totals = session_metrics.agents[agent]
+        totals.calls += 1
+        totals.attempts += attempts
+        totals.retries += retries
+        totals.parse_fallbacks += int(recovered)
+        for repair in repairs:
+            totals.parse_repairs[repair] = totals.parse_repairs.get(repair, 0) + 1
+        totals.errors += int(outcome == "error")
+        totals.prompt_tokens += prompt_tokens
+        totals.completion_tokens += completion_tokens
+        totals.cost_usd += cost
+        totals.seconds += seconds
+
+
+async def finish_session(stop_reason: str, path: str = METRICS_FILE) -> None:
+    """Учитывает завершённое интервью и, если задан METRICS_FILE, обновляет файл метрик."""
+    _metrics.sessions.inc(stop_reason.split(":")[0] or "unknown")
+    if path:
+        await asyncio.to_thread(_metrics.write_file, path)
+
+
+def instrument_node(name: str):
+    """Декоратор узла графа: время узла, span узла и привязка метрик и трейсера к сессии.
+
+    Ожидание ответа кандидата (session.receive) из времени узла вычитается.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(state, config):
+            from src.session import get_session
+
+            session = get_session(config)
+            session_metrics = session.metrics
+            token = _session_metrics.set(session_metrics)
+            waited_before = session_metrics.candidate_seconds
+            started = time.perf_counter()
+            try:
+                with bind_tracer(session.tracer), span(f"node.{name}", turn_id=state.get("step_counter")):
+                    return await func(state, config)
+            except Exception:
+                _metrics.node_errors.inc(name)
+                raise
+            finally:
+                seconds = time.perf_counter() - started - (session_metrics.candidate_seconds - waited_before)
+                _metrics.node_latency.observe(seconds, name)
+                session_metrics.nodes[name].append(seconds)
+                _session_metrics.reset(token)
+        return wrapper
+    return decorator
+
+
+async def serve_metrics(host: str, port: int) -> asyncio.AbstractServer:
+    """Минимальный HTTP-эндпоинт /metrics на asyncio без зависимостей."""
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            path = request_line.split()[1].decode() if len(request_line.split()) > 1 else "/"
+            if path.split("?")[0] == "/metrics":
+                body = _metrics.render().encode("utf-8")
+                status = "200 OK"
+            else:
+                body, status = b"not found\n", "404 Not Found"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
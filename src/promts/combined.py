@@ -0,0 +1,28 @@
+"""Промпт совмещённого вызова Mentor + VibeMaster: один запрос на ответ кандидата."""
+from src.promts.mentor import ANALYZE_FIELDS, ANALYZE_INSTRUCTIONS, get_mentor_persona
+from src.promts.prefix import static_prefix
+from src.promts.vibemaster import VIBE_ANALYSIS_INSTRUCTIONS, VIBE_FIELDS
+
+
+@static_prefix
+def get_combined_system_prompt(position: str, grade: str) -> str:
+    """Статический префикс: персона Mentor, обе инструкции и общий формат ответа."""
+    return f"""{get_mentor_persona(position, grade)}
+Кроме анализа ответа ты определяешь намерение кандидата: хочет ли он продолжать интервью.
+
+# ЧАСТЬ 1. АНАЛИЗ ОТВЕТА И КАЛИБРОВКА
+
+{ANALYZE_INSTRUCTIONS}
+
+# ЧАСТЬ 2. НАМЕРЕНИЕ И СОСТОЯНИЕ КАНДИДАТА
+Рассуждения по этой части пиши в поле "vibe_thinking", а не в "thinking".
+
+{VIBE_ANALYSIS_INSTRUCTIONS}
+
+# ФОРМАТ ОТВЕТА
+ВЕРНИ ТОЛЬКО ВАЛИДНЫЙ JSON В СЛЕДУЮЩЕМ ФОРМАТЕ (БЕЗ MARKDOWN, БЕЗ ```json):
+{{
+{ANALYZE_FIELDS},
+  "vibe_thinking": "Подробный анализ намерения по пунктам части 2",
+{VIBE_FIELDS}
+}}"""
@@ -1,6 +1,8 @@
 """Промпты для Manager агента."""
+from src.promts.prefix import static_prefix
 
 
+@static_prefix
 def get_manager_persona(position: str, grade: str) -> str:
     """Описание персоны Manager - кто он и какая его роль."""
     return f"""Ты — HR Manager и технический эксперт по {position}.
@@ -22,9 +24,8 @@ def get_manager_persona(position: str, grade: str) -> str:
 Будь объективен, конструктивен и честен."""
 
 
-def get_feedback_prompt() -> str:
-    """Промпт для генерации финального фидбэка."""
-    return """Проанализируй всё интервью и дай финальный фидбэк кандидату.
+FEEDBACK_INSTRUCTIONS = """## ФИНАЛЬНЫЙ ФИДБЭК
+Когда интервью закончится, тебя попросят дать финальный фидбэк кандидату.
 
 ## CHAIN OF THOUGHTS (обязательно в поле "thinking"):
 Проведи пошаговый анализ:
@@ -81,4 +82,15 @@ def get_feedback_prompt() -> str:
   "honesty": "любой текст (например: честный, уклончивый, нечестный)",
   "engagement": "любой текст (например: высокая, средняя, низкая, очень низкая)",
   "roadmap": ["тема1 для изучения", "тема2 для изучения", ...]
-}"""
\ No newline at end of file
+}"""
+
+
+@static_prefix
+def get_manager_system_prompt(position: str, grade: str) -> str:
+    """Статический префикс Manager: персона + инструкции фидбэка."""
+    return f"{get_manager_persona(position, grade)}\n\n{FEEDBACK_INSTRUCTIONS}"
+
+
+def get_feedback_prompt() -> str:
+    """Финальный запрос после истории интервью."""
+    return "Проанализируй всё интервью и дай финальный фидбэк кандидату. Ответь строго в JSON-формате из инструкции."
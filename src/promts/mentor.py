@@ -1,3 +1,9 @@
+from typing import Iterable
+
+from src.promts.prefix import static_prefix
+
+
+@static_prefix
 def get_mentor_persona(position: str, grade: str) -> str:
     """Описание персоны Mentor - кто он и какая его роль."""
     return f"""Ты — Ментор - аналитик технического интервью.
@@ -16,31 +22,26 @@ def get_mentor_persona(position: str, grade: str) -> str:
 Анализировать каждый ответ кандидата и помогать интервьюеру вести диалог эффективно."""
 
 
-
-# потом скажем ему юзать инструменты
-def get_analyze_prompt(current_difficulty: int, topics_covered: list) -> str:
-    """Запрос на анализ конкретного ответа с CoT."""
-    topics_str = ", ".join(topics_covered) if topics_covered else "пока не затрагивали никаких тем"
-    
-    return f"""## ПРОАНАЛИЗИРУЙ ОТВЕТ КАНДИДАТА
+# статическая часть запроса на анализ: одинакова на всех ходах
+ANALYZE_INSTRUCTIONS = """## КАК АНАЛИЗИРОВАТЬ ОТВЕТ КАНДИДАТА
 
 ### CHAIN OF THOUGHTS (обязательно в поле "thinking"):
 Проведи пошаговый анализ:
 
-1. **Что сказал кандидат?** 
+1. **Что сказал кандидат?**
    - Перескажи суть ответа своими словами
-   
+
 2. **Проверка на бред и галлюцинации**
    - Правильно ли это технически?
    - Существуют ли упомянутые технологии/концепции?
    - Не придумывает ли кандидат несуществующие факты?
-   - Примеры бреда: "Python 4.0 уберёт циклы", "JavaScript на блокчейне работает быстрее" 
-   
+   - Примеры бреда: "Python 4.0 уберёт циклы", "JavaScript на блокчейне работает быстрее"
+
 3. **Оценка качества**
    - Насколько полный ответ?
    - Соответствует ли заявленному уровню?
    - Является ли фактически правильным?
-   
+
 4. **Определение типа ответа**
    - correct: технически верно и полно
    - partial: верно, но неполно или поверхностно
@@ -50,7 +51,7 @@ def get_analyze_prompt(current_difficulty: int, topics_covered: list) -> str:
    - counter_question: задал встречный вопрос о компании/задачах
 
 5. **Калибровка сложности**
-   - Текущий уровень: {current_difficulty}/5
+   - Текущий уровень указан в запросе на анализ
    - Если справился отлично (correct + confidence >= 80): повысить на 1
    - Если ответил плохо (partial/incorrect): понизить на 1
    - Если галлюцинация: остаться на той же теме для уточнения
@@ -58,15 +59,11 @@ def get_analyze_prompt(current_difficulty: int, topics_covered: list) -> str:
    - Диапазон: 1-5
 
 ### ВАЖНО:
-**НЕ РЕКОМЕНДУЙ УЖЕ ЗАТРОНУТЫЕ ТЕМЫ!**
-Уже обсуждали: {topics_str}
+**НЕ РЕКОМЕНДУЙ УЖЕ ЗАТРОНУТЫЕ ТЕМЫ!** Список уже обсуждённых тем указан в запросе на анализ.
+Выбери НОВУЮ тему для следующего вопроса."""
 
-Выбери НОВУЮ тему для следующего вопроса.
-
-### ФОРМАТ ОТВЕТА:
-ВЕРНИ ТОЛЬКО ВАЛИДНЫЙ JSON В СЛЕДУЮЩЕМ ФОРМАТЕ (БЕЗ MARKDOWN, БЕЗ ```json):
-{{
-  "thinking": "Подробный анализ по 5 пунктам выше",
+# поля анализа в формате ответа, общие для Mentor и совмещённого вызова Mentor+VibeMaster
+ANALYZE_FIELDS = """  "thinking": "Подробный анализ по 5 пунктам выше",
   "answer_type": "correct|partial|incorrect|hallucination|off_topic|counter_question",
   "factual_errors": ["ошибка1", "ошибка2"],
   "correct_info": "правильная информация если были ошибки",
@@ -74,5 +71,28 @@ def get_analyze_prompt(current_difficulty: int, topics_covered: list) -> str:
   "instruction_to_interviewer": "что делать дальше",
   "difficulty_level": 1-5,
   "topic_recommendation": "новая тема для следующего вопроса",
-  "should_give_hint": true/false
+  "should_give_hint": true/false"""
+
+ANALYZE_FORMAT = f"""### ФОРМАТ ОТВЕТА:
+ВЕРНИ ТОЛЬКО ВАЛИДНЫЙ JSON В СЛЕДУЮЩЕМ ФОРМАТЕ (БЕЗ MARKDOWN, БЕЗ ```json):
+{{
+{ANALYZE_FIELDS}
 }}"""
+
+
+@static_prefix
+def get_mentor_system_prompt(position: str, grade: str) -> str:
+    """Статический префикс Mentor: персона + инструкции анализа."""
+    return f"{get_mentor_persona(position, grade)}\n\n{ANALYZE_INSTRUCTIONS}\n\n{ANALYZE_FORMAT}"
+
+
+# потом скажем ему юзать инструменты
+def get_analyze_prompt(current_difficulty: int, topics_covered: Iterable[str]) -> str:
+    """Переменная часть запроса на анализ конкретного ответа (идёт последней)."""
+    topics_str = ", ".join(topics_covered) if topics_covered else "пока не затрагивали никаких тем"
+
+    return f"""## ПРОАНАЛИЗИРУЙ ОТВЕТ КАНДИДАТА
+Текущий уровень сложности: {current_difficulty}/5
+Уже обсуждали: {topics_str}
+
+Ответь строго в JSON-формате из инструкции."""
@@ -0,0 +1,77 @@
+"""Мемоизация статических префиксов промптов и учёт размера промптов.
+
+Всё, что зависит только от (position, grade), собирается один раз и
+ставится в начало сообщений без изменений — так провайдерский prompt/KV
+кэш видит одинаковый префикс на каждом ходу. Переменные части (темы,
+сложность, инструкции Mentor) идут в конце.
+"""
+import os
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, TypeVar
+
+F = TypeVar("F", bound=Callable[..., str])
+
+_prefixes: Dict[str, Any] = {}
+_prompt_stats: Dict[str, Dict[str, int]] = defaultdict(
+    lambda: {"calls": 0, "prompt_bytes": 0, "prefix_bytes": 0, "reused_bytes": 0}
+)
+# последний промпт каждого агента: с ним сравниваем следующий, как это делает кэш провайдера
+_last_prompt: Dict[str, str] = {}
+
+
+def static_prefix(func: F) -> F:
+    """lru_cache для функции, собирающей статический префикс промпта."""
+    cached = lru_cache(maxsize=256)(func)
+    _prefixes[func.__qualname__] = cached
+    return cached  # type: ignore[return-value]
+
+
+def prefix_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Сколько раз префиксы переиспользовались (hits) и сколько раз собирались (misses)."""
+    stats = {}
+    for name, cached in _prefixes.items():
+        info = cached.cache_info()
+        stats[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+    return stats
+
+
+def record_prompt(agent: str, messages: List[Any]) -> None:
+    """Учитывает размер промпта агента; первое сообщение — статический префикс.
+
+    reused_bytes — длина общего начала с предыдущим промптом того же агента,
+    то есть сколько байт мог бы взять из кэша провайдер.
+    """
+    contents = [str(message.content) for message in messages]
+    sizes = [len(content.encode("utf-8", errors="ignore")) for content in contents]
+    prompt = "\n".join(contents)
+    common = os.path.commonprefix([_last_prompt.get(agent, ""), prompt])
+    _last_prompt[agent] = prompt
+
+    agent_stats = _prompt_stats[agent]
+    agent_stats["calls"] += 1
+    agent_stats["prompt_bytes"] += sum(sizes)
+    agent_stats["prefix_bytes"] += sizes[0] if sizes else 0
+    agent_stats["reused_bytes"] += len(common.encode("utf-8", errors="ignore"))
+
+
+def prompt_stats() -> Dict[str, Dict[str, float]]:
+    """Средний размер промпта на вызов, доля статического префикса и доля переиспользованного начала."""
+    stats = {}
+    for agent, agent_stats in _prompt_stats.items():
+        calls = max(1, agent_stats["calls"])
+        stats[agent] = {
+            "calls": agent_stats["calls"],
+            "avg_prompt_bytes": agent_stats["prompt_bytes"] / calls,
+            "avg_prefix_bytes": agent_stats["prefix_bytes"] / calls,
+            "prefix_share": agent_stats["prefix_bytes"] / max(1, agent_stats["prompt_bytes"]),
+            "reuse_share": agent_stats["reused_bytes"] / max(1, agent_stats["prompt_bytes"]),
+        }
+    return stats
+
+
+def reset_prompt_stats() -> None:
+    _prompt_stats.clear()
+    _last_prompt.clear()
+    for cached in _prefixes.values():
+        cached.cache_clear()
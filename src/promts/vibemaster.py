@@ -1,6 +1,8 @@
 """Промпты для VibeMaster агента - анализатор настроения и намерений."""
+from src.promts.prefix import static_prefix
 
 
+@static_prefix
 def get_vibemaster_persona() -> str:
     """Описание персоны VibeMaster - кто он и какая его роль."""
     return """Ты — VibeMaster, эксперт по определению эмоционального состояния и намерений кандидата.
@@ -17,9 +19,8 @@ def get_vibemaster_persona() -> str:
 - Никогда не прекращай интервью сам, если этого только прямо не скажет пользователь"""
 
 
-def get_vibe_analysis_prompt() -> str:
-    """Промпт для анализа настроения и намерений кандидата."""
-    return """Проанализируй ответ кандидата на техническом интервью и определи его намерение.
+VIBE_ANALYSIS_INSTRUCTIONS = """## АНАЛИЗ ОТВЕТА
+Анализируй ответ кандидата на техническом интервью (он будет в последнем сообщении) и определи его намерение.
 
 ## CHAIN OF THOUGHTS (обязательно в поле "thinking"):
 Проведи пошаговый анализ:
@@ -73,14 +74,28 @@ def get_vibe_analysis_prompt() -> str:
 ## ВАЖНО:
 - Будь эмпатичным - стресс на интервью это нормально
 - НЕ останавливай интервью преждевременно из-за одного "не знаю"
-- Если сомневаешься - дай кандидату шанс продолжить
+- Если сомневаешься - дай кандидату шанс продолжить"""
 
-## ФОРМАТ ОТВЕТА:
+# поля намерения без thinking: в совмещённом вызове Mentor+VibeMaster у них своё поле рассуждений
+VIBE_FIELDS = """  "wants_to_stop": true или false,
+  "stop_reason": "причина завершения (если wants_to_stop=true): tired/not_ready/too_difficult/no_time/technical_issues/other",
+  "emotional_state": "комфортное состояние: comfortable/stressed/overwhelmed/confused/tired",
+  "confidence_level": "уверенность в определении намерения: 0-100\""""
+
+VIBE_FORMAT = f"""## ФОРМАТ ОТВЕТА:
 ВЕРНИ ТОЛЬКО ВАЛИДНЫЙ JSON В СЛЕДУЮЩЕМ ФОРМАТЕ (БЕЗ MARKDOWN, БЕЗ ```json):
 {{
   "thinking": "Подробный анализ по 6 пунктам выше",
-  "wants_to_stop": true или false,
-  "stop_reason": "причина завершения (если wants_to_stop=true): tired/not_ready/too_difficult/no_time/technical_issues/other",
-  "emotional_state": "комфортное состояние: comfortable/stressed/overwhelmed/confused/tired",
-  "confidence_level": "уверенность в определении намерения: 0-100"
+{VIBE_FIELDS}
 }}"""
+
+
+@static_prefix
+def get_vibemaster_system_prompt() -> str:
+    """Статический префикс VibeMaster: одинаков для всех сессий."""
+    return f"{get_vibemaster_persona()}\n\n{VIBE_ANALYSIS_INSTRUCTIONS}\n\n{VIBE_FORMAT}"
+
+
+def get_vibe_analysis_prompt(user_message: str) -> str:
+    """Переменная часть: сам ответ кандидата."""
+    return f"Ответ кандидата: \"{user_message}\"\n\nОтветь строго в JSON-формате из инструкции."
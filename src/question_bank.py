@@ -0,0 +1,219 @@
+"""Банк вопросов Interviewer'а из прошлых интервью.
+
+Вопросы для "Python Developer / Middle / сложность 3 / GIL" от сессии к сессии
+почти одинаковые. Банк хранит их в append-only JSONL (одна строка — вопрос с
+позицией, грейдом, темой и сложностью), а в памяти держит только индекс
+(позиция, грейд, тема, сложность) -> смещения строк в файле. Поиск — один
+lookup в dict, сами вопросы читаются из файла через mmap, поэтому банк на
+сотни тысяч вопросов не раздувает память процесса.
+
+Банк пополняется двумя путями:
+- вопросы, которые Interviewer сгенерировал в живых сессиях (тема и сложность —
+  из калибровки Mentor, по которой вопрос и генерировался);
+- журналы прошлых сессий logs/*.jsonl (import_journal): тема и сложность берутся
+  из события Mentor "Анализ завершён", предшествующего ходу. QuestionResult.topic
+  для этого не годится: там тема, рекомендованная уже после ответа.
+"""
+import asyncio
+import mmap
+import os
+import random
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.cache import normalize_text
+from src.config import QUESTION_BANK_PATH
+from src.serialization import JSONDecodeError, dumps_line, loads
+
+BankKey = Tuple[str, str, str, int]
+
+# из реплики Interviewer'а в банк идёт только сам вопрос, без реакции на прошлый ответ
+_sentences = re.compile(r"(?<=[.!?])\s+")
+MIN_QUESTION_CHARS = 15
+
+
+def extract_question(message: str) -> Optional[str]:
+    """Последнее вопросительное предложение реплики или None, если вопроса нет."""
+    questions = [s.strip() for s in _sentences.split(message.strip()) if s.strip().endswith("?")]
+    if not questions or len(questions[-1]) < MIN_QUESTION_CHARS:
+        return None
+    return questions[-1]
+
+
+def bank_key(position: str, grade: str, topic: str, difficulty: int) -> BankKey:
+    return normalize_text(position), normalize_text(grade), normalize_text(topic), int(difficulty)
+
+
+@dataclass
+class QuestionBankStats:
+    lookups: int = 0  # сколько раз Interviewer искал вопрос в банке
+    hits: int = 0  # вопрос взят из банка, полная генерация не понадобилась
+    generated: int = 0  # вопрос сгенерирован целиком
+    added: int = 0  # новые вопросы, записанные в банк
+
+    @property
+    def avoided_rate(self) -> float:
+        total = self.hits + self.generated
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {**vars(self), "avoided_rate": round(self.avoided_rate, 3)}
+
+
+class QuestionBank:
+    def __init__(self, path: str = QUESTION_BANK_PATH):
+        self.path = path
+        self.stats = QuestionBankStats()
+        self._index: Dict[BankKey, List[Tuple[int, int]]] = {}
+        self._seen: set = set()  # (ключ, нормализованный вопрос) — чтобы не писать дубли
+        self._size = 0  # длина файла, покрытая индексом
+        self._mmap: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+        dir_path = os.path.dirname(path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        """Строит индекс одним проходом по файлу; сами вопросы в памяти не держит."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    record = loads(line)
+                    key = bank_key(record["position"], record["grade"], record["topic"], record["difficulty"])
+                    self._remember(key, record["question"], offset, len(line))
+                except (JSONDecodeError, KeyError, TypeError, ValueError):
+                    pass  # обрезанная строка после падения
+                offset += len(line)
+            self._size = offset
+
+    def _remember(self, key: BankKey, question: str, offset: int, length: int) -> None:
+        self._index.setdefault(key, []).append((offset, length))
+        self._seen.add((key, normalize_text(question)))
+
+    def _read(self, offset: int, length: int) -> dict:
+        if self._mmap is None or len(self._mmap) < offset + length:
+            # файл дописан после отображения: отображаем заново
+            if self._mmap is not None:
+                self._mmap.close()
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return loads(self._mmap[offset:offset + length])
+
+    def lookup(self, position: str, grade: str, topic: str, difficulty: int) -> List[str]:
+        """Все вопросы банка по ключу."""
+        with self._lock:
+            return [self._read(offset, length)["question"]
+                    for offset, length in self._index.get(bank_key(position, grade, topic, difficulty), ())]
+
+    def topics(self, position: str, grade: str, difficulty: int) -> List[str]:
+        """Темы, по которым в банке есть вопросы для позиции, грейда и сложности (в нормализованном виде)."""
+        position, grade = normalize_text(position), normalize_text(grade)
+        with self._lock:
+            return [key[2] for key in self._index if key[:2] == (position, grade) and key[3] == difficulty]
+
+    def pick(
+        self,
+        position: str,
+        grade: str,
+        topic: str,
+        difficulty: int,
+        asked: Iterable[str] = (),
+    ) -> Optional[str]:
+        """Случайный вопрос по ключу, которого ещё не было в репликах asked.
+        
+        Кандидаты читаются из файла в случайном порядке до первого подходящего,
+        а не все сразу: на ключ могут приходиться сотни вопросов.
+        """
+        with self._lock:
+            offsets = list(self._index.get(bank_key(position, grade, topic, difficulty), ()))
+        if not offsets:
+            return None
+        random.shuffle(offsets)
+        asked_text = [normalize_text(message) for message in asked]
+        for offset, length in offsets:
+            with self._lock:
+                question = self._read(offset, length)["question"]
+            normalized = normalize_text(question)
+            if not any(normalized in message for message in asked_text):
+                return question
+        return None
+
+    def add(self, position: str, grade: str, topic: str, difficulty: int, question: str, source: str = "live") -> bool:
+        """Дописывает вопрос, если такого по этому ключу ещё нет."""
+        key = bank_key(position, grade, topic, difficulty)
+        if not key[2] or (key, normalize_text(question)) in self._seen:
+            return False
+        record = {
+            "position": position,
+            "grade": grade,
+            "topic": topic,
+            "difficulty": int(difficulty),
+            "question": question,
+            "source": source,
+            "ts": datetime.now().isoformat(),
+        }
+        line = dumps_line(record)
+        with self._lock:
+            if (key, normalize_text(question)) in self._seen:
+                return False
+            with open(self.path, "ab") as f:
+                f.write(line)
+            self._remember(key, question, self._size, len(line))
+            self._size += len(line)
+        self.stats.added += 1
+        return True
+
+    async def aadd(self, position: str, grade: str, topic: str, difficulty: int, question: str) -> bool:
+        return await asyncio.to_thread(self.add, position, grade, topic, difficulty, question)
+
+    def import_journal(self, path: str) -> int:
+        """Добавляет вопросы из журнала сессии (logs/<session_id>.jsonl), возвращает сколько добавлено."""
+        position = grade = None
+        pending: Optional[Tuple[str, int]] = None  # тема и сложность, рекомендованные Mentor для следующего вопроса
+        last_turn_id = 0
+        added = 0
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = loads(line)
+                except JSONDecodeError:
+                    continue
+                kind = record.get("kind")
+                if kind == "session":
+                    position, grade = record["position"], record["grade"]
+                elif kind == "event" and record.get("role") == "Mentor" and record.get("event") == "Анализ завершён":
+                    info = record.get("info", {})
+                    if info.get("next_topic"):
+                        pending = (info["next_topic"], info.get("difficulty", 1))
+                elif kind == "turn" and record["turn_id"] > last_turn_id:
+                    # первая запись хода — новый вопрос, заданный по последней рекомендации Mentor
+                    last_turn_id = record["turn_id"]
+                    question = extract_question(record.get("agent_visible_message", ""))
+                    if position and pending and question:
+                        added += self.add(position, grade, pending[0], pending[1], question, source="journal")
+                    pending = None
+        return added
+
+    def __len__(self) -> int:
+        return sum(len(offsets) for offsets in self._index.values())
+
+    def __repr__(self) -> str:
+        return f"QuestionBank(path='{self.path}', questions={len(self)}, keys={len(self._index)})"
+
+
+_bank: Optional[QuestionBank] = None
+
+
+def get_question_bank() -> Optional[QuestionBank]:
+    """Общий банк процесса; None, если QUESTION_BANK_PATH пустой."""
+    global _bank
+    if _bank is None and QUESTION_BANK_PATH:
+        _bank = QuestionBank(QUESTION_BANK_PATH)
+    return _bank
@@ -0,0 +1,165 @@
+"""Batch-прогон записанных интервью для регрессии промптов и моделей.
+
+Читает JSONL: одна строка — профиль кандидата и его ответы по порядку:
+
+    {"id": "py-middle-1", "participant_name": "Иван", "position": "Python Developer",
+     "grade": "Middle", "experience": "3 года", "answers": ["GIL — это ...", "Не знаю", ...]}
+
+Все интервью идут через один скомпилированный граф конкурентно, не больше
+concurrency одновременно. По каждой сессии в выходной JSONL пишется строка
+с question_results, final_feedback, причиной остановки и таймингами (время
+узлов без ожидания ответа, токены и стоимость из SessionMetrics). Строки
+пишутся по мере завершения сессий, поэтому частичный результат не теряется.
+Если ответы кончились раньше, чем интервью, сессия получает статус
+answers_exhausted и то, что успела накопить.
+"""
+import asyncio
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.graph.graph import create_initial_state, get_compiled_graph
+from src.graph.state import InterviewState
+from src.logs import InterviewLogger
+from src.serialization import dumps_line, loads
+from src.session import InterviewSession, make_config
+from src.transport import QueueTransport
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 20
+PROFILE_FIELDS = ("participant_name", "position", "grade", "experience")
+
+
+@dataclass
+class Transcript:
+    transcript_id: str
+    profile: Dict[str, str]
+    answers: List[str] = field(default_factory=list)
+
+
+def load_transcripts(path: str) -> List[Transcript]:
+    """Читает сценарии; строка без профиля или ответов — ошибка с номером строки."""
+    transcripts = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = loads(line)
+            missing = [name for name in (*PROFILE_FIELDS, "answers") if name not in record]
+            if missing:
+                raise ValueError(f"{path}:{line_no}: нет полей {', '.join(missing)}")
+            transcripts.append(Transcript(
+                transcript_id=str(record.get("id", line_no)),
+                profile={name: str(record[name]) for name in PROFILE_FIELDS},
+                answers=[str(answer) for answer in record["answers"]],
+            ))
+    return transcripts
+
+
+def session_result(
+    transcript: Transcript,
+    session: InterviewSession,
+    state: Optional[InterviewState],
+    status: str,
+    wall_seconds: float,
+    error: Optional[str] = None,
+) -> Dict[str, Any]:
+    state = state or {}
+    return {
+        "id": transcript.transcript_id,
+        "session_id": session.session_id,
+        "status": status,
+        "error": error,
+        "stop_reason": state.get("stop_reason"),
+        "questions_asked": state.get("questions_asked", 0),
+        "question_results": [asdict(result) for result in state.get("question_results", [])],
+        "final_feedback": state.get("final_feedback"),
+        "timings": {"wall_seconds": round(wall_seconds, 3), **session.metrics.as_dict()},
+    }
+
+
+class ReplayRunner:
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, logs_dir: str = "logs/replay"):
+        self.concurrency = concurrency
+        self.logs_dir = logs_dir
+        self.app = get_compiled_graph()
+        self._slots = asyncio.Semaphore(concurrency)
+
+    async def run_one(self, transcript: Transcript) -> Dict[str, Any]:
+        """Прогоняет один сценарий; ошибки сессии попадают в результат, а не наружу."""
+        async with self._slots:
+            session_id = f"replay-{transcript.transcript_id}"
+            transport = QueueTransport(transcript.answers)
+            transport.feed(None)  # ответы кончились — кандидат "ушёл"
+            session = InterviewSession(
+                session_id=session_id,
+                logger=InterviewLogger(output_path=f"{self.logs_dir}/{session_id}.json"),
+                transport=transport,
+            )
+            state: Optional[InterviewState] = None
+            status, error = "completed", None
+            started = time.perf_counter()
+            try:
+                # stream_mode="values" отдаёт полный state после каждого шага, последний снимок — итог сессии
+                async for state in self.app.astream(
+                    create_initial_state(**transcript.profile),
+                    config=make_config(session),
+                    stream_mode="values",
+                ):
+                    pass
+            except EOFError:
+                status = "answers_exhausted"
+            except Exception as e:
+                log.exception(f"Сценарий {transcript.transcript_id} завершился с ошибкой")
+                status, error = "error", f"{type(e).__name__}: {e}"
+            finally:
+                session.cancel_background()
+                await session.export_trace()
+            return session_result(transcript, session, state, status, time.perf_counter() - started, error)
+
+    async def run(self, transcripts: List[Transcript], output_path: str) -> List[Dict[str, Any]]:
+        """Прогоняет все сценарии и пишет результаты в output_path по мере завершения."""
+        dir_path = os.path.dirname(output_path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        results = []
+        with open(output_path, "wb") as f:
+            for next_result in asyncio.as_completed([self.run_one(t) for t in transcripts]):
+                result = await next_result
+                results.append(result)
+                line = dumps_line(result)
+                await asyncio.to_thread(f.write, line)
+                log.info(f"[{len(results)}/{len(transcripts)}] {result['id']}: {result['status']}")
+        return results
+
+
+def replay_summary(results: List[Dict[str, Any]], wall_seconds: float) -> Dict[str, Any]:
+    by_status: Dict[str, int] = {}
+    for result in results:
+        by_status[result["status"]] = by_status.get(result["status"], 0) + 1
+    session_seconds = sorted(result["timings"]["wall_seconds"] for result in results)
+    return {
+        "sessions": len(results),
+        "by_status": by_status,
+        "wall_seconds": round(wall_seconds, 2),
+        "session_p50_seconds": session_seconds[len(session_seconds) // 2] if session_seconds else 0.0,
+        "session_max_seconds": session_seconds[-1] if session_seconds else 0.0,
+        "total_tokens": sum(result["timings"]["total_tokens"] for result in results),
+        "total_cost_usd": round(sum(result["timings"]["total_cost_usd"] for result in results), 4),
+    }
+
+
+async def replay(
+    input_path: str,
+    output_path: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    logs_dir: str = "logs/replay",
+) -> Dict[str, Any]:
+    transcripts = load_transcripts(input_path)
+    runner = ReplayRunner(concurrency=concurrency, logs_dir=logs_dir)
+    started = time.perf_counter()
+    results = await runner.run(transcripts, output_path)
+    return replay_summary(results, time.perf_counter() - started)
@@ -0,0 +1,71 @@
+"""JSON для логов, журналов, кэшей и разбора ответов LLM.
+
+Если установлен orjson, используется он: в разы быстрее stdlib json
+и сам сериализует dataclass'ы (LogUnit, QuestionResult), datetime и
+упорядоченные dict'ы. Без orjson всё работает на stdlib json.
+
+Формат совпадает со stdlib (UTF-8 без \\u-экранирования). Отличия только
+в пробелах между элементами. Суррогатные символы, которые иногда приходят
+от LLM, выбрасываются, как и раньше при записи файлов с errors="ignore".
+"""
+import dataclasses
+import json
+from datetime import date, datetime
+from typing import Any, Union
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - orjson есть в requirements.txt
+    _orjson = None
+
+# orjson.JSONDecodeError — подкласс json.JSONDecodeError, ловить можно одно и то же
+JSONDecodeError = json.JSONDecodeError
+
+
+def backend() -> str:
+    return "orjson" if _orjson is not None else "json"
+
+
+def _default(obj: Any) -> Any:
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+def _stdlib_dumps(obj: Any, indent: bool) -> bytes:
+    text = json.dumps(obj, ensure_ascii=False, default=_default, indent=2 if indent else None)
+    return text.encode("utf-8", errors="ignore")
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """UTF-8 JSON. indent=True — с отступом в 2 пробела (файлы для чтения человеком)."""
+    if _orjson is None:
+        return _stdlib_dumps(obj, indent)
+    option = _orjson.OPT_NON_STR_KEYS | (_orjson.OPT_INDENT_2 if indent else 0)
+    try:
+        return _orjson.dumps(obj, default=_default, option=option)
+    except TypeError:
+        # orjson.JSONEncodeError: суррогаты в строках, int больше 64 бит, слишком глубокая вложенность
+        return _stdlib_dumps(obj, indent)
+
+
+def dumps_line(obj: Any) -> bytes:
+    """Одна строка JSONL вместе с переводом строки."""
+    return dumps(obj) + b"\n"
+
+
+def dumps_str(obj: Any, indent: bool = False) -> str:
+    return dumps(obj, indent).decode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Разбирает JSON; при ошибке бросает JSONDecodeError (json.JSONDecodeError)."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    return json.loads(data)
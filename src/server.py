@@ -0,0 +1,98 @@
+"""Серверный режим: много интервью одновременно в одном процессе.
+
+Граф компилируется один раз, агенты общие, а на каждое TCP-соединение
+создаётся своя InterviewSession со своим состоянием, логгером и каналом.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from src.checkpoint import get_checkpointer
+from src.clients import get_client_registry
+from src.metrics import serve_metrics
+from src.graph.graph import create_initial_state, get_compiled_graph
+from src.graph.state import InterviewState
+from src.session import InterviewSession, ask_candidate_profile, make_config
+from src.transport import SocketTransport
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_SESSIONS = 500
+
+
+class InterviewServer:
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 8765,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        logs_dir: str = "logs",
+        metrics_port: Optional[int] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.metrics_port = metrics_port
+        self.logs_dir = logs_dir
+        self.max_sessions = max_sessions
+        # упавшую сессию можно продолжить из CLI: python main.py --resume <session_id>
+        self.checkpointer = get_checkpointer()
+        self.app = get_compiled_graph(self.checkpointer)
+        self.active_sessions = 0
+        self.finished_sessions = 0
+        self._slots = asyncio.Semaphore(max_sessions)
+
+    async def run_session(self, session: InterviewSession, initial_state: InterviewState) -> InterviewState:
+        """Прогоняет одно интервью через общий скомпилированный граф."""
+        self.active_sessions += 1
+        try:
+            final_state = await self.app.ainvoke(initial_state, config=make_config(session))
+            if self.checkpointer is not None:
+                await self.checkpointer.adelete_thread(session.session_id)
+            return final_state
+        finally:
+            self.active_sessions -= 1
+            self.finished_sessions += 1
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        transport = SocketTransport(reader, writer)
+        if self._slots.locked():
+            # соединение не закрываем: кандидат ждёт в очереди на семафоре
+            await transport.send("Все интервьюеры заняты, вы в очереди — интервью начнётся, как только освободится место")
+        async with self._slots:
+            session = InterviewSession.create(transport, logs_dir=self.logs_dir)
+            log.info(f"Сессия {session.session_id} началась, активных: {self.active_sessions + 1}")
+            try:
+                await session.send("Interview Multi-Agent System\n")
+                profile = await ask_candidate_profile(session)
+                await self.run_session(session, create_initial_state(**profile))
+            except (ConnectionError, EOFError):
+                log.info(f"Сессия {session.session_id}: кандидат отключился")
+            except Exception:
+                log.exception(f"Сессия {session.session_id} завершилась с ошибкой")
+            finally:
+                # при обрыве связи фоновые задачи сессии не должны жить дольше соединения
+                session.cancel_background()
+                if self.checkpointer is not None:
+                    # чекпоинт оборванной сессии остаётся для --resume, а кэш хешей каналов больше не нужен
+                    self.checkpointer.forget_thread(session.session_id)
+                await session.export_trace()
+                await transport.close()
+                log.debug(f"Пул LLM: {get_client_registry().pool_stats()}")
+
+    async def serve_forever(self) -> None:
+        server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        log.info(f"Сервер интервью слушает {self.host}:{self.port} (до {self.max_sessions} сессий)")
+        metrics_server = None
+        if self.metrics_port is not None:
+            metrics_server = await serve_metrics(self.host, self.metrics_port)
+            log.info(f"Метрики Prometheus: http://{self.host}:{self.metrics_port}/metrics")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if metrics_server is not None:
+                metrics_server.close()
+            await get_client_registry().aclose()
+
+    def __repr__(self) -> str:
+        return f"InterviewServer(host='{self.host}', port={self.port}, active={self.active_sessions})"
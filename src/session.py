@@ -0,0 +1,128 @@
+"""Контекст отдельной сессии интервью.
+
+Агенты общие для всего процесса и не хранят состояния, а всё, что относится
+к конкретному кандидату (логгер, транспорт ввода/вывода), живёт в InterviewSession
+и передаётся в узлы графа через config["configurable"]["session"].
+"""
+import time
+import uuid
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+from src.config import COMBINED_ANALYSIS, SPECULATIVE_INTERVIEWER, STREAM_RESPONSES, SUMMARY_MEMORY
+from src.agents.intent import FastPathStats
+from src.logs import InterviewLogger
+from src.memory import SummaryMemory
+from src.metrics import SessionMetrics
+from src.question_bank import QuestionBankStats
+from src.tracing import Tracer, make_tracer
+from src.speculation import SpeculationStats, SpeculativeTurn
+from src.spinner import get_spinner
+from src.transport import BaseTransport, StdioTransport
+
+if TYPE_CHECKING:
+    # langchain_core тянет за собой langsmith (~1 с): CLI показывает первый вопрос, не дожидаясь его
+    from langchain_core.runnables import RunnableConfig
+
+
+@dataclass
+class InterviewSession:
+    session_id: str
+    logger: InterviewLogger
+    transport: BaseTransport = field(default_factory=StdioTransport)
+    # реплики Interviewer'а уходят кандидату по мере генерации (см. src/streaming.py)
+    stream_responses: bool = STREAM_RESPONSES
+    # спекулятивная генерация следующего вопроса (см. src/speculation.py)
+    speculative: bool = SPECULATIVE_INTERVIEWER
+    speculation: Optional[SpeculativeTurn] = None
+    speculation_stats: SpeculationStats = field(default_factory=SpeculationStats)
+    # фоновое сжатие старых ходов в краткое содержание (см. src/memory.py)
+    summary_memory: bool = SUMMARY_MEMORY
+    memory: SummaryMemory = field(default_factory=SummaryMemory)
+    # сколько ответов VibeMaster решил локально, а сколько отправил в LLM (см. src/agents/intent.py)
+    intent_stats: FastPathStats = field(default_factory=FastPathStats)
+    # сколько вопросов взято из банка, а сколько сгенерировано целиком (см. src/question_bank.py)
+    bank_stats: QuestionBankStats = field(default_factory=QuestionBankStats)
+    # анализ Mentor и намерение VibeMaster одним запросом (Mentor.analyze_with_vibe)
+    combined_analysis: bool = COMBINED_ANALYSIS
+    # токены, латентность и стоимость вызовов этой сессии (см. src/metrics.py)
+    metrics: SessionMetrics = field(default_factory=SessionMetrics)
+    # span'ы узлов и вызовов LLM, если задан TRACE_DIR (см. src/tracing.py)
+    tracer: Optional[Tracer] = None
+
+    def __post_init__(self):
+        if self.tracer is None:
+            self.tracer = make_tracer(self.session_id)
+
+    @classmethod
+    def create(
+        cls,
+        transport: BaseTransport,
+        logs_dir: str = "logs",
+        session_id: Optional[str] = None,
+        resume: bool = False,
+    ) -> "InterviewSession":
+        session_id = session_id or uuid.uuid4().hex[:12]
+        return cls(
+            session_id=session_id,
+            # при возобновлении из чекпоинта журнал сессии дописывается, а не перезаписывается
+            logger=InterviewLogger(output_path=f"{logs_dir}/{session_id}.json", resume=resume),
+            transport=transport,
+        )
+
+    def take_speculation(self) -> Optional[SpeculativeTurn]:
+        speculation, self.speculation = self.speculation, None
+        return speculation
+
+    def cancel_background(self) -> None:
+        """Отменяет фоновые задачи сессии: спекулятивные ветки и сжатие памяти."""
+        speculation = self.take_speculation()
+        if speculation is not None:
+            speculation.discard()
+        self.memory.cancel()
+
+    async def export_trace(self) -> Optional[str]:
+        """Пишет трассу сессии в файл; None, если трейсинг выключен."""
+        return await self.tracer.export() if self.tracer is not None else None
+
+    def spinner(self):
+        # спиннер рисуем только в терминале: сотни сетевых сессий не должны писать в один stderr
+        return get_spinner() if self.transport.interactive else nullcontext()
+
+    async def send(self, text: str) -> None:
+        await self.transport.send(text)
+
+    async def receive(self, prompt: str = "") -> str:
+        started = time.perf_counter()
+        try:
+            return await self.transport.receive(prompt)
+        finally:
+            self.metrics.candidate_seconds += time.perf_counter() - started
+
+    def __repr__(self) -> str:
+        return f"InterviewSession(session_id='{self.session_id}')"
+
+
+def get_session(config: "RunnableConfig") -> InterviewSession:
+    """Достаёт сессию из config узла графа."""
+    return config["configurable"]["session"]
+
+
+def make_config(session: InterviewSession) -> "RunnableConfig":
+    return {"configurable": {"session": session, "thread_id": session.session_id}}
+
+
+async def ask_candidate_profile(session: InterviewSession) -> dict:
+    """Запрашивает у кандидата данные для create_initial_state."""
+    await session.send("Введите данные кандидата:")
+    participant_name = (await session.receive("Имя: ")).strip()
+    position = (await session.receive("Позиция (например: Python Developer): ")).strip()
+    grade = (await session.receive("Грейд (Junior/Middle/Senior): ")).strip()
+    experience = (await session.receive("Опыт работы: ")).strip()
+    return {
+        "participant_name": participant_name,
+        "position": position,
+        "grade": grade,
+        "experience": experience,
+    }
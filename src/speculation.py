@@ -0,0 +1,201 @@
+"""Спекулятивная генерация следующей реплики Interviewer'а.
+
+Как только приходит ответ кандидата, вместе с Mentor и VibeMaster запускаются
+ветки Interviewer'а для наиболее вероятных исходов анализа: "ответил верно"
+(сложность +1) и "ответил неверно/частично" (сложность -1) — те же правила
+калибровки, что в промпте Mentor. Когда Mentor вернул результат, подходящая
+ветка коммитится, остальные отменяются; если ни одна не подошла, узел
+interviewer генерирует ответ как обычно.
+
+У каждой ветки своя конкретная тема: "верно" — следующая ещё не пройденная тема
+(из банка вопросов по позиции и грейду, иначе из FALLBACK_TOPICS), "неверно" —
+текущая тема. Mentor тему всегда рекомендует сам, поэтому при совпадении типа
+ответа и сложности принимается тема ветки (adopt_topic): она и попадает в
+topics_covered. Ветка не подходит, если Mentor попросил подсказку или
+исправление фактических ошибок — их ветка не знала.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional
+
+from src.structs.structs import CalibrationResult, MentorAnalysis
+
+if TYPE_CHECKING:
+    from src.structs.schemas import InterviewerResponseSchema
+    from src.agents.agents import Interviewer, StructuredCall
+    from src.graph.state import InterviewState
+    from src.question_bank import QuestionBank
+
+log = logging.getLogger(__name__)
+
+# темы ветки "верно", если в банке вопросов для позиции и грейда не нашлось непройденных
+FALLBACK_TOPICS = [
+    "основы языка",
+    "структуры данных",
+    "алгоритмы и сложность",
+    "базы данных",
+    "конкурентность и асинхронность",
+    "тестирование",
+    "сети и HTTP",
+    "архитектура и паттерны",
+    "инструменты и CI/CD",
+]
+
+
+@dataclass(frozen=True)
+class Branch:
+    name: str
+    answer_types: FrozenSet[str]  # какие answer_type от Mentor покрывает ветка
+    difficulty: int
+    instruction: str
+    topic: str = ""  # пусто — все темы пройдены, тему выбирает Interviewer
+
+
+@dataclass
+class SpeculationStats:
+    turns: int = 0  # ходов, на которых запускалась спекуляция
+    branches: int = 0  # всего запущено веток
+    hits: int = 0
+    misses: int = 0
+    wasted_tokens: int = 0  # токены завершённых, но выброшенных веток
+    cancelled_branches: int = 0  # ветки, отменённые до ответа провайдера (их токены не известны)
+
+    @property
+    def hit_rate(self) -> float:
+        decided = self.hits + self.misses
+        return self.hits / decided if decided else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "turns": self.turns,
+            "branches": self.branches,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+            "wasted_tokens": self.wasted_tokens,
+            "cancelled_branches": self.cancelled_branches,
+        }
+
+
+def next_topic(state: "InterviewState", difficulty: int, bank: Optional["QuestionBank"] = None) -> str:
+    """Первая ещё не пройденная тема: сначала из банка вопросов, потом из FALLBACK_TOPICS."""
+    covered = {topic.lower() for topic in state["topics_covered"]}
+    bank_topics = bank.topics(state["position"], state["grade"], difficulty) if bank is not None else []
+    for topic in [*bank_topics, *FALLBACK_TOPICS]:
+        if topic.lower() not in covered:
+            return topic
+    return ""
+
+
+def plan_branches(state: "InterviewState", bank: Optional["QuestionBank"] = None) -> List[Branch]:
+    current_difficulty = state["current_difficulty"]
+    correct_difficulty = min(5, current_difficulty + 1)
+    current_topic = next(reversed(state["topics_covered"]), "")
+    return [
+        Branch(
+            name="correct",
+            answer_types=frozenset({"correct"}),
+            difficulty=correct_difficulty,
+            instruction="Кратко похвали ответ и задай вопрос по новой теме, чуть сложнее",
+            topic=next_topic(state, correct_difficulty, bank),
+        ),
+        Branch(
+            name="incorrect",
+            answer_types=frozenset({"partial", "incorrect"}),
+            difficulty=max(1, current_difficulty - 1),
+            instruction="Мягко отметь, что ответ неполный, и задай вопрос попроще по той же теме",
+            topic=current_topic,
+        ),
+    ]
+
+
+def _hypothetical_guidance(branch: Branch) -> tuple[MentorAnalysis, CalibrationResult]:
+    analysis = MentorAnalysis(
+        answer_type=branch.name,
+        instruction_to_interviewer=branch.instruction,
+    )
+    calibration = CalibrationResult(
+        difficulty_level=branch.difficulty,
+        topic_recommendation=branch.topic or "новая тема на твой выбор",
+    )
+    return analysis, calibration
+
+
+class SpeculativeTurn:
+    """Запущенные ветки одного хода."""
+
+    def __init__(self, tasks: Dict[Branch, "asyncio.Task[StructuredCall]"], stats: SpeculationStats):
+        self.tasks = tasks
+        self.stats = stats
+
+    @classmethod
+    def launch(cls, interviewer: "Interviewer", state: "InterviewState", stats: SpeculationStats) -> "SpeculativeTurn":
+        tasks = {}
+        for branch in plan_branches(state, interviewer.question_bank):
+            analysis, calibration = _hypothetical_guidance(branch)
+            # сообщения собираем сразу: узел дальше будет менять state
+            messages = interviewer.build_response_messages(state, analysis, calibration)
+            tasks[branch] = asyncio.create_task(interviewer.generate_response_call(messages))
+        stats.turns += 1
+        stats.branches += len(tasks)
+        return cls(tasks, stats)
+
+    def _match(self, analysis: MentorAnalysis, calibration: CalibrationResult, any_topic: bool = False) -> Optional[Branch]:
+        # ветки строились без подсказки и без правильного ответа от Mentor: их реплика это не покроет
+        if calibration.should_give_hint or analysis.factual_errors or analysis.correct_info:
+            return None
+        for branch in self.tasks:
+            if (
+                analysis.answer_type in branch.answer_types
+                and calibration.difficulty_level == branch.difficulty
+                and (any_topic or calibration.topic_recommendation == branch.topic)
+            ):
+                return branch
+        return None
+
+    def adopt_topic(self, analysis: MentorAnalysis, calibration: CalibrationResult) -> CalibrationResult:
+        """Калибровка с темой подходящей ветки вместо темы Mentor; без подходящей ветки — как есть.
+
+        Вызывается сразу после анализа, до записи темы в topics_covered: тема, по которой
+        задан вопрос ветки, и тема в state должны совпадать.
+        """
+        branch = self._match(analysis, calibration, any_topic=True)
+        if branch is None or not branch.topic:
+            return calibration
+        return replace(calibration, topic_recommendation=branch.topic)
+
+    async def commit(
+        self, analysis: MentorAnalysis, calibration: CalibrationResult
+    ) -> Optional["InterviewerResponseSchema"]:
+        """Возвращает ответ подходящей ветки или None, если нужна обычная генерация."""
+        branch = self._match(analysis, calibration)
+        self._discard(keep=branch)
+
+        if branch is None:
+            self.stats.misses += 1
+            return None
+
+        try:
+            call = await self.tasks[branch]
+        except Exception as e:
+            log.warning(f"Спекулятивная ветка {branch.name} упала: {e}")
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        return call.result
+
+    def discard(self) -> None:
+        """Отменяет все ветки (например, кандидат решил закончить интервью)."""
+        self._discard(keep=None)
+
+    def _discard(self, keep: Optional[Branch]) -> None:
+        for branch, task in self.tasks.items():
+            if branch == keep:
+                continue
+            if not task.done():
+                task.cancel()
+                self.stats.cancelled_branches += 1
+            elif not task.cancelled() and task.exception() is None:
+                self.stats.wasted_tokens += task.result().total_tokens
@@ -0,0 +1,121 @@
+"""Стриминг реплик Interviewer'а кандидату по мере генерации.
+
+ResponseFieldStreamer инкрементально вытаскивает значение строкового поля
+(по умолчанию "response") из потока токенов JSON-ответа, не дожидаясь
+конца генерации. TranscriptStream выводит эти куски в транспорт сессии.
+"""
+import json
+import re
+import time
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from src.session import InterviewSession
+
+# дописывается к частично выведенной реплике, если ответ пришлось получить заново без стриминга:
+# следом узел выводит реплику целиком, и кандидат видит, почему она повторяется
+STREAM_INTERRUPTED = " …(ответ прервался, повторяю целиком)"
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class ResponseFieldStreamer:
+    """Инкрементальный парсер одного строкового поля JSON-объекта."""
+
+    def __init__(self, field: str = "response"):
+        # кавычка внутри строкового значения всегда экранирована, поэтому
+        # неэкранированное "field": может быть только ключом
+        self._key = re.compile(r'(?<!\\)"' + re.escape(field) + r'"\s*:\s*"')
+        self._buffer = ""
+        self._pos = 0
+        self._in_value = False
+        self.done = False
+        self.text = ""
+
+    def feed(self, chunk: str) -> str:
+        """Принимает очередной кусок сырого ответа, возвращает новый текст поля."""
+        if self.done:
+            return ""
+        self._buffer += chunk
+
+        if not self._in_value:
+            match = self._key.search(self._buffer, max(0, self._pos - 32))
+            if match is None:
+                self._pos = len(self._buffer)
+                return ""
+            self._in_value = True
+            self._pos = match.end()
+
+        decoded = []
+        buffer, pos = self._buffer, self._pos
+        while pos < len(buffer):
+            char = buffer[pos]
+            if char == '"':
+                self.done = True
+                pos += 1
+                break
+            if char != "\\":
+                decoded.append(char)
+                pos += 1
+                continue
+            # escape-последовательность может быть разрезана между чанками
+            if pos + 1 >= len(buffer):
+                break
+            kind = buffer[pos + 1]
+            if kind != "u":
+                decoded.append(_ESCAPES.get(kind, kind))
+                pos += 2
+                continue
+            length = 6
+            if pos + 6 <= len(buffer) and buffer[pos + 2:pos + 4].lower() in ("d8", "d9", "da", "db"):
+                length = 12  # суррогатная пара 😀
+            if pos + length > len(buffer):
+                break
+            try:
+                decoded.append(json.loads(f'"{buffer[pos:pos + length]}"'))
+            except json.JSONDecodeError:
+                decoded.append(buffer[pos:pos + length])
+            pos += length
+
+        self._pos = pos
+        delta = "".join(decoded)
+        self.text += delta
+        return delta
+
+
+class TranscriptStream:
+    """Выводит реплику кандидату кусками; спиннер крутится до первого видимого токена."""
+
+    def __init__(self, session: "InterviewSession", prefix: str = "🤖 Interviewer: "):
+        self.session = session
+        self.prefix = prefix
+        self.started = False
+        self.started_at = time.perf_counter()
+        self.first_token_seconds: Optional[float] = None
+        self._spinner = None
+
+    async def __aenter__(self) -> "TranscriptStream":
+        self._spinner = self.session.spinner()
+        await self._spinner.__aenter__()
+        return self
+
+    async def __call__(self, delta: str) -> None:
+        if not delta:
+            return
+        if not self.started:
+            self.started = True
+            self.first_token_seconds = time.perf_counter() - self.started_at
+            await self._stop_spinner()
+            await self.session.transport.send_partial(self.prefix)
+        await self.session.transport.send_partial(delta)
+
+    async def _stop_spinner(self) -> None:
+        if self._spinner is not None:
+            spinner, self._spinner = self._spinner, None
+            await spinner.__aexit__(None, None, None)
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._stop_spinner()
+        if self.started:
+            await self.session.transport.end_partial("\n")
+        return False
@@ -61,6 +61,40 @@ class MentorAnalysisSchema(BaseModel):
         description="Нужна ли подсказка кандидату"
     )
 
+class MentorVibeSchema(MentorAnalysisSchema):
+    """Совмещённый ответ Mentor + VibeMaster: поля анализа и намерения в одном JSON."""
+    vibe_thinking: str = Field(
+        default="",
+        description="Рассуждения о намерении и эмоциональном состоянии кандидата"
+    )
+    wants_to_stop: bool = Field(
+        default=False,
+        description="Хочет ли пользователь завершить интервью (true/false)"
+    )
+    stop_reason: Optional[str] = Field(
+        default=None,
+        description="Причина завершения: tired/not_ready/too_difficult/no_time/technical_issues/other"
+    )
+    emotional_state: str = Field(
+        default="comfortable",
+        description="Эмоциональное состояние: comfortable/stressed/overwhelmed/confused/tired"
+    )
+    confidence_level: int = Field(
+        default=80,
+        ge=0, le=100,
+        description="Уверенность в определении намерения (0-100%)"
+    )
+
+    def to_intent(self) -> UserIntentSchema:
+        return UserIntentSchema(
+            thinking=self.vibe_thinking,
+            wants_to_stop=self.wants_to_stop,
+            stop_reason=self.stop_reason,
+            emotional_state=self.emotional_state,
+            confidence_level=self.confidence_level
+        )
+
+
 class InterviewerGreetingSchema(BaseModel):
     """Схема для приветствия с валидацией роли."""
     thinking: str = Field(
@@ -134,4 +168,13 @@ class FeedbackFromInterviewer(BaseModel):
     )
     answer_to_cadidate: str = Field( 
         description="Какой вопрос задается пользователю"
-    )
\ No newline at end of file
+    )
+
+class ConversationSummarySchema(BaseModel):
+    """Схема для сжатой памяти интервью (Summarizer)."""
+    thinking: str = Field(
+        description="Что нового добавили ходы: темы, качество ответов, ошибки, поведение кандидата"
+    )
+    summary: str = Field(
+        description="Обновлённое краткое содержание всего интервью до текущего момента"
+    )
@@ -3,24 +3,33 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 
 # формируют стейт
-@dataclass
+@dataclass(slots=True)
 class Turn:
     turn_id: int
     agent_visible_message: str  # Сообщение агента пользователю
     user_message: str = ""  # Ответ пользователя (заполняется после)
-    internal_thoughts: str = ""  # Скрытая рефлексия агентов
+    internal_thoughts: str = ""  # Скрытая рефлексия агентов: "[агент]: мысль" через перевод строки
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
     
     def add_thought(self, agent_name: str, thought: str) -> None:
-        # здесь будем добавлять мысли 
-        # возиожно лучше сделать так чтобы класс не изменял сам себя и вообще заморозить этот класс
-        # нет времени на это
+        # одна строка, а не список пар (агент, мысль): за ход мыслей три, и каждая
+        # отдельная строка с кортежем стоит больше, чем однократное копирование при склейке
         if self.internal_thoughts:
             self.internal_thoughts += f"\n[{agent_name}]: {thought}"
         else:
             self.internal_thoughts = f"[{agent_name}]: {thought}"
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Ход в формате лога."""
+        return {
+            "turn_id": self.turn_id,
+            "agent_visible_message": self.agent_visible_message,
+            "user_message": self.user_message,
+            "internal_thoughts": self.internal_thoughts,
+            "timestamp": self.timestamp,
+        }
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class QuestionResult:
     topic: str
     question: str
@@ -31,7 +40,7 @@ class QuestionResult:
 
 
 # единица лога
-@dataclass 
+@dataclass(slots=True)
 class LogUnit:
     participant_name: str
     # session_start: str = field(default_factory=lambda: datetime.now().isoformat())
@@ -39,12 +48,12 @@ class LogUnit:
     turns: List[Turn] = field(default_factory=list)
     final_feedback: Optional[Dict[str, Any]] = None
 
-@dataclass 
-class InterviewerAnalysis: 
+@dataclass(frozen=True, slots=True)
+class InterviewerAnalysis:
     want_to_stop: str
     
 # структуры для коммуникации между агентами
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MentorAnalysis:
     """Результат анализа ответа кандидата от Mentor."""
     answer_type: str  # correct / incorrect / partial / hallucination / off_topic / counter_question
@@ -53,14 +62,14 @@ class MentorAnalysis:
     confidence_score: int = 0  # 0-100, уверенность в оценке
     instruction_to_interviewer: str = ""  # инструкция что делать дальше
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CalibrationResult:
     """Результат калибровки сложности от Mentor."""
     difficulty_level: int = 3  # 1-5
     topic_recommendation: str = ""  # рекомендуемая тема следующего вопроса
     should_give_hint: bool = False  # нужна ли подсказка
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FinalFeedback:
     """Финальный фидбэк от Manager. Manager на самом деле не совсем manager, он также проверяет и уровень на основе ответов"""
     # Вердикт
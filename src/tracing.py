@@ -0,0 +1,187 @@
+"""Span-трейсинг интервью с выгрузкой в локальный файл.
+
+Span'ы покрывают узлы графа, методы агентов, каждую попытку запроса к
+провайдеру и fallback-парсинг. Родитель берётся из contextvar, поэтому
+вложенность сохраняется и в задачах asyncio.gather, и в фоновых задачах.
+В конце сессии трасса пишется в TRACE_DIR:
+
+- chrome: {session_id}.trace.json, открывается в chrome://tracing или ui.perfetto.dev
+  как flame chart (параллельные ветки — на разных дорожках);
+- jsonl: {session_id}.spans.jsonl, одна строка на span.
+
+Без TRACE_DIR трейсер не создаётся и span() ничего не делает.
+"""
+import asyncio
+import functools
+import itertools
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.config import TRACE_DIR, TRACE_FORMAT
+from src.serialization import dumps, dumps_line
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: int
+    parent_id: Optional[int]
+    session_id: str
+    turn_id: Optional[int]
+    start_ns: int
+    end_ns: int = 0
+    lane: int = 0  # дорожка в Chrome trace: своя у каждой задачи asyncio
+    status: str = "ok"
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    """Span'ы одной сессии."""
+
+    def __init__(self, session_id: str, trace_dir: str = TRACE_DIR, fmt: str = TRACE_FORMAT):
+        self.session_id = session_id
+        self.trace_dir = trace_dir
+        self.fmt = fmt
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+        self._lanes: Dict[int, int] = {}
+
+    def _lane(self) -> int:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = id(task) if task is not None else 0
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = len(self._lanes)
+        return lane
+
+    def start(self, name: str, parent: Optional[Span], attrs: Dict[str, Any]) -> Span:
+        turn_id = attrs.pop("turn_id", None)
+        if turn_id is None and parent is not None:
+            turn_id = parent.turn_id
+        return Span(
+            name=name,
+            span_id=next(self._ids),
+            parent_id=parent.span_id if parent is not None else None,
+            session_id=self.session_id,
+            turn_id=turn_id,
+            start_ns=time.perf_counter_ns(),
+            lane=self._lane(),
+            attrs=attrs,
+        )
+
+    def finish(self, span: Span) -> None:
+        span.end_ns = time.perf_counter_ns()
+        self.spans.append(span)
+
+    @property
+    def path(self) -> str:
+        suffix = "trace.json" if self.fmt == "chrome" else "spans.jsonl"
+        return os.path.join(self.trace_dir, f"{self.session_id}.{suffix}")
+
+    def to_chrome(self) -> Dict[str, Any]:
+        origin = min((span.start_ns for span in self.spans), default=0)
+        events = [
+            {
+                "name": span.name,
+                "cat": span.name.split(".")[0],
+                "ph": "X",
+                "ts": (span.start_ns - origin) / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": 1,
+                "tid": span.lane,
+                "args": {
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "session_id": span.session_id,
+                    "turn_id": span.turn_id,
+                    "status": span.status,
+                    **span.attrs,
+                },
+            }
+            for span in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"session_id": self.session_id}}
+
+    def _write(self) -> None:
+        os.makedirs(self.trace_dir, exist_ok=True)
+        with open(self.path, "wb") as f:
+            if self.fmt == "chrome":
+                f.write(dumps(self.to_chrome()))
+            else:
+                f.write(b"".join(dumps_line(span) for span in self.spans))
+
+    async def export(self) -> Optional[str]:
+        """Пишет трассу вне event loop; возвращает путь к файлу."""
+        if not self.spans:
+            return None
+        await asyncio.to_thread(self._write)
+        return self.path
+
+    def __repr__(self) -> str:
+        return f"Tracer(session_id='{self.session_id}', spans={len(self.spans)})"
+
+
+_current_tracer: ContextVar[Optional[Tracer]] = ContextVar("tracer", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("span", default=None)
+
+
+def make_tracer(session_id: str) -> Optional[Tracer]:
+    return Tracer(session_id) if TRACE_DIR else None
+
+
+@contextmanager
+def bind_tracer(tracer: Optional[Tracer]) -> Iterator[None]:
+    """Делает трейсер сессии текущим для кода внутри (и задач, созданных внутри)."""
+    token = _current_tracer.set(tracer)
+    try:
+        yield
+    finally:
+        _current_tracer.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Optional[Span]]:
+    """Span с родителем из контекста; без трейсера — пустая обёртка."""
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield None
+        return
+    current = tracer.start(name, _current_span.get(), attrs)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except asyncio.CancelledError:
+        current.status = "cancelled"
+        raise
+    except BaseException as e:
+        current.status = "error"
+        current.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        tracer.finish(current)
+
+
+def traced(name: str):
+    """Декоратор async-метода: весь вызов — один span."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
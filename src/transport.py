@@ -0,0 +1,142 @@
+"""Транспорты для общения с кандидатом.
+
+Узлы графа не знают, откуда приходит ответ кандидата: из терминала,
+из очереди (тесты, бенчмарки, batch-прогоны) или из сокета. Ожидание
+ответа — это await, который не блокирует event loop и остальные сессии.
+"""
+import asyncio
+import sys
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from src.utils import clean_surrogate_characters
+
+
+class BaseTransport(ABC):
+    """Двусторонний канал между графом и кандидатом."""
+
+    # показывать ли спиннер во время вызовов LLM (имеет смысл только в терминале)
+    interactive: bool = False
+
+    @abstractmethod
+    async def send(self, text: str) -> None:
+        """Отправляет кандидату сообщение целиком."""
+
+    @abstractmethod
+    async def receive(self, prompt: str = "") -> str:
+        """Ждёт очередной ответ кандидата. EOFError/ConnectionError если кандидат ушёл."""
+
+    async def send_partial(self, text: str) -> None:
+        """Кусок сообщения при стриминге. По умолчанию копится до end_partial."""
+        self._partial = getattr(self, "_partial", "") + text
+
+    async def end_partial(self, text: str = "") -> None:
+        """Завершает стримящееся сообщение (как send для последнего куска)."""
+        message, self._partial = getattr(self, "_partial", "") + text, ""
+        await self.send(message)
+
+    async def close(self) -> None:
+        pass
+
+
+class StdioTransport(BaseTransport):
+    """Терминал. Чтение stdin вынесено в отдельный поток, event loop свободен пока человек печатает."""
+
+    interactive = True
+
+    def __init__(self):
+        # один выделенный поток, чтобы не занимать дефолтный пул to_thread
+        self._reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stdin")
+
+    async def send(self, text: str) -> None:
+        sys.stdout.write(f"{text}\n")
+        sys.stdout.flush()
+
+    async def send_partial(self, text: str) -> None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    async def end_partial(self, text: str = "") -> None:
+        await self.send(text)
+
+    async def receive(self, prompt: str = "") -> str:
+        if prompt:
+            sys.stdout.write(prompt)
+            sys.stdout.flush()
+        loop = asyncio.get_running_loop()
+        line = await loop.run_in_executor(self._reader, sys.stdin.readline)
+        if not line:
+            raise EOFError("stdin закрыт")
+        return clean_surrogate_characters(line.rstrip("\r\n"))
+
+    async def close(self) -> None:
+        self._reader.shutdown(wait=False)
+
+
+class QueueTransport(BaseTransport):
+    """Транспорт в памяти: ответы кладутся в очередь, сообщения агента копятся в outbox."""
+
+    def __init__(self, answers: Optional[list[str]] = None):
+        self.inbox: asyncio.Queue[Optional[str]] = asyncio.Queue()
+        self.outbox: asyncio.Queue[str] = asyncio.Queue()
+        for answer in answers or []:
+            self.inbox.put_nowait(answer)
+
+    def feed(self, answer: Optional[str]) -> None:
+        """Кладёт ответ кандидата. None означает, что кандидат отключился."""
+        self.inbox.put_nowait(answer)
+
+    async def send(self, text: str) -> None:
+        self.outbox.put_nowait(text)
+
+    async def receive(self, prompt: str = "") -> str:
+        answer = await self.inbox.get()
+        if answer is None:
+            raise EOFError("Очередь ответов закрыта")
+        return answer
+
+    async def close(self) -> None:
+        self.inbox.put_nowait(None)
+
+    def sent_messages(self) -> list[str]:
+        """Забирает всё, что успели отправить кандидату."""
+        messages = []
+        while not self.outbox.empty():
+            messages.append(self.outbox.get_nowait())
+        return messages
+
+
+class SocketTransport(BaseTransport):
+    """Транспорт поверх asyncio-стримов (TCP соединение серверного режима)."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, text: str) -> None:
+        self.writer.write(f"{text}\n".encode("utf-8", errors="ignore"))
+        await self.writer.drain()
+
+    async def send_partial(self, text: str) -> None:
+        self.writer.write(text.encode("utf-8", errors="ignore"))
+        await self.writer.drain()
+
+    async def end_partial(self, text: str = "") -> None:
+        await self.send(text)
+
+    async def receive(self, prompt: str = "") -> str:
+        if prompt:
+            self.writer.write(prompt.encode("utf-8", errors="ignore"))
+            await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionResetError("Кандидат отключился")
+        return line.decode("utf-8", errors="ignore").rstrip("\r\n")
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
@@ -1,15 +1,9 @@
-from langchain_mistralai import ChatMistralAI
-from src.config import MISTRAL_TOKEN
-
-
 MISTRAL_MODEL = "mistral-large-latest"
 
 def get_openrouter_llm(model=MISTRAL_MODEL):
-    return ChatMistralAI(
-        model=model,
-        api_key=MISTRAL_TOKEN,
-        temperature=0
-    )
+    """Общий для всех агентов клиент модели (см. src/clients.py)."""
+    from src.clients import get_client_registry
+    return get_client_registry().get_llm(model)
 
 
 def clean_surrogate_characters(text: str) -> str: